@@ -1,22 +1,30 @@
+from __future__ import annotations
+
 import asyncio
 import logging
+import time
 from asyncio import Queue, Task
-from typing import Any, TypedDict
+from collections.abc import AsyncGenerator, Iterable
+from typing import TYPE_CHECKING, Any, TypedDict
 from uuid import UUID, uuid4
 
-from langchain_core.language_models.chat_models import BaseChatModel
 from liman_core.errors import LimanError
 from liman_core.node_actor.actor import NodeActor
+from liman_core.nodes.llm_node.cache import LLMCache
 from liman_core.nodes.llm_node.node import LLMNode
 from liman_core.nodes.supported_types import get_node_cls
 from liman_core.registry import Registry
 
+from liman.batch import BatchItem, BatchResult, create_batch_stats
 from liman.conf import settings
 from liman.executor.base import Executor
-from liman.executor.schemas import ExecutorInput, ExecutorOutput
+from liman.executor.schemas import ExecutorEvent, ExecutorInput, ExecutorOutput
 from liman.loader import load_specs_from_directory
 from liman.state import InMemoryStateStorage, StateStorage
 
+if TYPE_CHECKING:
+    from langchain_core.language_models.chat_models import BaseChatModel
+
 logger = logging.getLogger(__name__)
 
 if settings.DEBUG:
@@ -53,14 +61,22 @@ class Agent:
         *,
         name: str = "Agent",
         llm: BaseChatModel,
+        memory_llm: BaseChatModel | None = None,
+        llm_cache: LLMCache | None = None,
         registry: Registry | None = None,
         state_storage: StateStorage | None = None,
         max_iterations: int = 50,
+        eager_tool_calls: bool = False,
+        dedupe_tool_calls: bool = False,
     ):
         self.id = uuid4()
         self.specs_dir = specs_dir
         self.name = name
         self.llm = llm
+        # separate model summarizing conversation memory of LLM nodes
+        self.memory_llm = memory_llm
+        # responses of identical LLM requests are served from the cache
+        self.llm_cache = llm_cache
         self.start_node = start_node
 
         self.registry = registry or Registry()
@@ -68,9 +84,14 @@ class Agent:
 
         self.iteration_count = 0
         self.max_iterations = max_iterations
+        # start tools while the LLM response is still streamed
+        self.eager_tool_calls = eager_tool_calls
+        # run identical tool calls of an LLM response once
+        self.dedupe_tool_calls = dedupe_tool_calls
 
         self._input_queue: Queue[ExecutorInput] = Queue()
         self._output_queue: Queue[ExecutorOutput] = Queue()
+        self._stream_queue: Queue[ExecutorEvent] = Queue()
 
         self.logger = logging.LoggerAdapter(
             logger, {"agent_id": str(self.id), "agent_name": self.name}
@@ -83,7 +104,195 @@ class Agent:
         load_specs_from_directory(self.specs_dir, self.registry)
 
     async def step(
+        self,
+        input_: str | ExecutorInput,
+        context: dict[str, Any] | None = None,
+        *,
+        timeout: float | None = None,
+    ) -> ExecutorOutput:
+        """
+        Execute a step of the agent.
+
+        Args:
+            input_: User input or input addressed to a node actor
+            context: Additional execution context
+            timeout: Deadline of the step in seconds, when it's exceeded
+                the execution is cancelled and the output has the error set
+        """
+        if timeout is None:
+            return await self._step(input_, context)
+
+        step_task = asyncio.create_task(self._step(input_, context))
+        try:
+            done, _ = await asyncio.wait({step_task}, timeout=timeout)
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
+
+        if not done:
+            self.logger.warning(f"Agent step timed out after {timeout} seconds")
+            self.cancel(f"Agent step timed out after {timeout} seconds")
+        return await step_task
+
+    def cancel(self, reason: str = "Agent step is cancelled") -> None:
+        """
+        Cancel in-flight LLM and tool executions of the current step,
+        the pending step returns an output with the error set
+
+        Args:
+            reason: Error message of the cancelled output
+        """
+        if self._executor:
+            self._executor.cancel(reason)
+
+    async def abatch(
+        self,
+        inputs: Iterable[str],
+        context: dict[str, Any] | None = None,
+        *,
+        concurrency: int = 10,
+        timeout: float | None = None,
+    ) -> BatchResult:
+        """
+        Execute many independent inputs concurrently.
+
+        Every input starts its own execution tree from the start node, sharing
+        only the registry and the state storage, so the inputs don't see each
+        other's conversation and the agent's own conversation isn't affected.
+        A failed input doesn't stop the batch, its output has the error set.
+
+        Args:
+            inputs: User inputs
+            context: Additional execution context of every input
+            concurrency: Maximum number of inputs executed at once
+            timeout: Deadline of every input in seconds, when it's exceeded
+                its execution is cancelled and the output has the error set
+
+        Returns:
+            BatchResult with the items in the order of the inputs
+        """
+        if concurrency < 1:
+            raise ValueError(f"Batch concurrency must be positive: {concurrency}")
+
+        inputs = list(inputs)
+        items: list[BatchItem | None] = [None] * len(inputs)
+        pending = iter(enumerate(inputs))
+
+        async def worker() -> None:
+            for index, input_ in pending:
+                items[index] = await self._run_batch_item(input_, context, timeout)
+
+        start = time.perf_counter()
+        workers = [
+            asyncio.create_task(worker()) for _ in range(min(concurrency, len(inputs)))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for worker_task in workers:
+                worker_task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+
+        done_items = [item for item in items if item is not None]
+        self.logger.debug(
+            f"Agent '{self.name}' completed batch of {len(done_items)} inputs"
+        )
+        return BatchResult(
+            done_items, create_batch_stats(done_items, time.perf_counter() - start)
+        )
+
+    async def _run_batch_item(
+        self, input_: str, context: dict[str, Any] | None, timeout: float | None
+    ) -> BatchItem:
+        start = time.perf_counter()
+        try:
+            executor_input = self._create_start_input(input_, context)
+            # chunks aren't streamed, the batch doesn't share the stream queue
+            executor = await self._create_executor(
+                executor_input, root_output_queue=Queue()
+            )
+        except Exception as e:
+            # e.g. the state storage fails, the other items still run
+            self.logger.exception("Batch item failed to start")
+            output = ExecutorOutput(
+                execution_id=uuid4(),
+                node_actor_id=uuid4(),
+                node_full_name=self.start_node,
+                exit_=True,
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+            return BatchItem(input_, output, time.perf_counter() - start)
+        executor_input.node_actor_id = executor.node_actor.id
+
+        step_task = asyncio.create_task(executor.step(executor_input))
+        try:
+            done, _ = await asyncio.wait({step_task}, timeout=timeout)
+        except asyncio.CancelledError:
+            executor.cancel("Batch is cancelled")
+            step_task.cancel()
+            raise
+
+        if not done:
+            self.logger.warning(f"Batch item timed out after {timeout} seconds")
+            executor.cancel(f"Batch item timed out after {timeout} seconds")
+        output = await step_task
+        return BatchItem(input_, output, time.perf_counter() - start)
+
+    async def astream(
         self, input_: str | ExecutorInput, context: dict[str, Any] | None = None
+    ) -> AsyncGenerator[ExecutorEvent, None]:
+        """
+        Execute a step streaming LLM response chunks as they are generated.
+
+        Yields ExecutorChunk events while the graph is executing and finishes
+        with the same ExecutorOutput that step() returns for the input.
+        """
+        # chunks left by a previous stream which consumer stopped early
+        self._drain_stream_queue()
+        step_task = asyncio.create_task(self._step(input_, context, stream=True))
+        get_task: Task[ExecutorEvent] | None = None
+
+        try:
+            while True:
+                get_task = asyncio.create_task(self._stream_queue.get())
+                done, _ = await asyncio.wait(
+                    {step_task, get_task}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if get_task in done:
+                    yield get_task.result()
+                    continue
+                break
+
+            get_task.cancel()
+            while not self._stream_queue.empty():
+                yield self._stream_queue.get_nowait()
+            yield await step_task
+        finally:
+            if get_task:
+                get_task.cancel()
+            if not step_task.done():
+                # the abandoned turn is cancelled and its output is consumed
+                # here, so the next step doesn't return it
+                self.cancel("Agent stream is closed")
+                try:
+                    await step_task
+                except asyncio.CancelledError:
+                    step_task.cancel()
+                    raise
+            self._drain_stream_queue()
+
+    def _drain_stream_queue(self) -> None:
+        while not self._stream_queue.empty():
+            self._stream_queue.get_nowait()
+
+    async def _step(
+        self,
+        input_: str | ExecutorInput,
+        context: dict[str, Any] | None = None,
+        *,
+        stream: bool = False,
     ) -> ExecutorOutput:
         self.logger.debug(f"Agent '{self.name}' received input: {repr(input_)}")
 
@@ -101,9 +310,11 @@ class Agent:
                 input_.context = (
                     {**input_.context, **context} if input_.context else context
                 )
+            input_.stream = input_.stream or stream
             await self._input_queue.put(input_)
         else:
             input_ = self._create_executor_input(input_, context)
+            input_.stream = stream
             await self._input_queue.put(input_)
 
         if not self._processing_task:
@@ -165,32 +376,28 @@ class Agent:
         node_cls, node_name = input_.node_full_name.split("/")
         node = self.registry.lookup(get_node_cls(node_cls), node_name)
 
-        node_actor = await NodeActor.create_or_restore(node, llm=self.llm, state=None)
+        node_actor = await NodeActor.create_or_restore(
+            node,
+            llm=self.llm,
+            memory_llm=self.memory_llm,
+            llm_cache=self.llm_cache,
+            state=None,
+        )
         actor_state = node_actor.serialize_state()
         await self.state_storage.asave_actor_state(
             execution_id, node_actor.id, actor_state
         )
         return node_actor
 
-    async def _create_executor(self, input_: str | ExecutorInput) -> Executor:
-        if isinstance(input_, ExecutorInput):
-            execution_id = input_.execution_id
-        else:
-            if len(self.start_node.split("/")) == 2:
-                node_cls, node_name = self.start_node.split("/")
-                node = self.registry.lookup(get_node_cls(node_cls), node_name)
-            else:
-                # If start_node is just a node name, lookup by LLMNode
-                node = self.registry.lookup(LLMNode, self.start_node)
-
-            execution_id = uuid4()
-            node_actor_id = uuid4()
-            input_ = ExecutorInput(
-                execution_id=execution_id,
-                node_actor_id=node_actor_id,
-                node_input=input_,
-                node_full_name=node.full_name,
-            )
+    async def _create_executor(
+        self,
+        input_: str | ExecutorInput,
+        *,
+        root_output_queue: Queue[ExecutorEvent] | None = None,
+    ) -> Executor:
+        if not isinstance(input_, ExecutorInput):
+            input_ = self._create_start_input(input_)
+        execution_id = input_.execution_id
 
         node_actor = await self._create_initial_node_actor(input_, execution_id)
         return Executor(
@@ -198,8 +405,31 @@ class Agent:
             state_storage=self.state_storage,
             node_actor=node_actor,
             llm=self.llm,
+            memory_llm=self.memory_llm,
+            llm_cache=self.llm_cache,
             execution_id=execution_id,
             max_iterations=self.max_iterations,
+            eager_tool_calls=self.eager_tool_calls,
+            dedupe_tool_calls=self.dedupe_tool_calls,
+            root_output_queue=root_output_queue or self._stream_queue,
+        )
+
+    def _create_start_input(
+        self, input_: str, context: dict[str, Any] | None = None
+    ) -> ExecutorInput:
+        if len(self.start_node.split("/")) == 2:
+            node_cls, node_name = self.start_node.split("/")
+            node = self.registry.lookup(get_node_cls(node_cls), node_name)
+        else:
+            # If start_node is just a node name, lookup by LLMNode
+            node = self.registry.lookup(LLMNode, self.start_node)
+
+        return ExecutorInput(
+            execution_id=uuid4(),
+            node_actor_id=uuid4(),
+            node_input=input_,
+            node_full_name=node.full_name,
+            context=context,
         )
 
     def _create_executor_input(
@@ -0,0 +1,62 @@
+from typing import Any, NamedTuple
+
+from liman.executor.schemas import ExecutorOutput
+
+
+class BatchItem(NamedTuple):
+    """
+    Result of a single input of Agent.abatch()
+    """
+
+    input_: Any
+    output: ExecutorOutput
+    # seconds
+    duration: float
+
+    @property
+    def ok(self) -> bool:
+        return self.output.error is None
+
+    @property
+    def error(self) -> str | None:
+        return self.output.error
+
+
+class BatchStats(NamedTuple):
+    """
+    Aggregate stats of Agent.abatch().
+
+    Token counts and cost are None unless the agent is instrumented
+    with liman_finops.
+    """
+
+    items: int
+    succeeded: int
+    failed: int
+    # seconds, wall time of the whole batch
+    duration: float
+    items_per_second: float
+    input_tokens: int | None = None
+    output_tokens: int | None = None
+    cost: float | None = None
+
+
+class BatchResult(NamedTuple):
+    # in the order of the inputs
+    items: list[BatchItem]
+    stats: BatchStats
+
+    @property
+    def outputs(self) -> list[ExecutorOutput]:
+        return [item.output for item in self.items]
+
+
+def create_batch_stats(items: list[BatchItem], duration: float) -> BatchStats:
+    succeeded = sum(1 for item in items if item.ok)
+    return BatchStats(
+        items=len(items),
+        succeeded=succeeded,
+        failed=len(items) - succeeded,
+        duration=duration,
+        items_per_second=len(items) / duration if duration > 0 else 0.0,
+    )
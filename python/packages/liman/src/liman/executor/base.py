@@ -1,23 +1,49 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 from asyncio import Queue, Task
-from typing import Any, TypeVar
+from typing import TYPE_CHECKING, Any, TypeVar, cast
 from uuid import UUID, uuid4
 
-from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessageChunk,
+    BaseMessage,
+    HumanMessage,
+    ToolMessage,
+)
 from liman_core.base.schemas import S
-from liman_core.node_actor.actor import NodeActor
+from liman_core.errors import ComponentNotFoundError, LimanError
+from liman_core.node_actor.actor import ChunkHandler, NodeActor
 from liman_core.node_actor.schemas import NextNode
 from liman_core.nodes.base.node import BaseNode
 from liman_core.nodes.base.schemas import NS
+from liman_core.nodes.llm_node.cache import LLMCache
+from liman_core.nodes.llm_node.node import LLMNode
+from liman_core.nodes.llm_node.streaming import ToolCallChunkAccumulator
+from liman_core.nodes.tool_node.node import ToolNode
 from liman_core.registry import Registry
 
 from liman.conf import settings
-from liman.executor.schemas import ExecutorInput, ExecutorOutput, ExecutorStatus
+from liman.executor.dedupe import (
+    ToolCallGroups,
+    fan_out_output,
+    get_tool_call_key,
+    group_tool_calls,
+)
+from liman.executor.schemas import (
+    ExecutorChunk,
+    ExecutorEvent,
+    ExecutorInput,
+    ExecutorOutput,
+    ExecutorStatus,
+)
 from liman.state import StateStorage
 
+if TYPE_CHECKING:
+    from langchain_core.language_models.chat_models import BaseChatModel
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=BaseNode[Any, Any])
@@ -44,23 +70,36 @@ class Executor:
         node_actor: NodeActor[T],
         llm: BaseChatModel,
         *,
+        memory_llm: BaseChatModel | None = None,
+        llm_cache: LLMCache | None = None,
         execution_id: UUID | None = None,
         max_iterations: int = 10,
+        eager_tool_calls: bool = False,
+        dedupe_tool_calls: bool = False,
         # executors
         parent_executor: Executor | None = None,
-        root_output_queue: Queue[ExecutorOutput] | None = None,
+        root_output_queue: Queue[ExecutorEvent] | None = None,
     ) -> None:
         self.id = uuid4()
         self.execution_id = execution_id or uuid4()
         self.max_iterations = max_iterations
+        self.eager_tool_calls = eager_tool_calls
+        self.dedupe_tool_calls = dedupe_tool_calls
+        # count of identical tool calls which weren't executed again
+        self.deduplicated_tool_calls = 0
 
         self.registry = registry
         self.state_storage = state_storage
         self.llm = llm
+        self.memory_llm = memory_llm
+        self.llm_cache = llm_cache
         self.node_actor = node_actor
 
         self.status = ExecutorStatus.IDLE
         self.iteration_count = 0
+        self._current_input: ExecutorInput | None = None
+        # count of step() calls waiting for an output
+        self._step_waiters = 0
 
         # Parent-child relationship
         self.parent_executor = parent_executor
@@ -71,8 +110,12 @@ class Executor:
         # Queues for input and output management
         self._input_queue: Queue[ExecutorInput] = Queue()
         self._output_queue: Queue[ExecutorOutput] = Queue()
-        self._root_output_queue: Queue[ExecutorOutput] = root_output_queue or Queue()
+        self._root_output_queue: Queue[ExecutorEvent] = root_output_queue or Queue()
         self._processing_task: Task[None] | None = None
+        # ToolNode executions started while the LLM response is streamed,
+        # keyed by tool call id
+        self._eager_tasks: dict[str, Task[ExecutorOutput]] = {}
+        self._eager_executors: dict[str, Executor] = {}
 
         self.logger = logging.LoggerAdapter(
             logger, {"execution_id": str(self.execution_id)}
@@ -87,6 +130,15 @@ class Executor:
         """
         return self.parent_executor is not None
 
+    @property
+    def root_execution_id(self) -> UUID:
+        """
+        Execution ID of the root executor of the execution tree
+        """
+        if self.parent_executor is None:
+            return self.execution_id
+        return self.parent_executor.root_execution_id
+
     async def step(self, input_: ExecutorInput) -> ExecutorOutput:
         """
         Execute a single step in the executor
@@ -105,9 +157,33 @@ class Executor:
             self._processing_task = asyncio.create_task(self._process_input_loop())
             self._processing_task.add_done_callback(self._on_exit_input_loop)
 
-        res = await self._output_queue.get()
+        self._step_waiters += 1
+        try:
+            res = await self._output_queue.get()
+        finally:
+            self._step_waiters -= 1
         return res
 
+    def cancel(self, reason: str = "Execution is cancelled") -> None:
+        """
+        Cancel in-flight LLM and tool executions of the executor
+        and all its child executors.
+
+        Pending step() calls return an output with the error set. A cancelled
+        ToolNode execution outputs an error ToolMessage, so the LLM node waiting
+        for it can continue the turn.
+
+        Args:
+            reason: Error message of the cancelled output
+        """
+        self.logger.debug(f"Executor is cancelled: {reason}")
+        self._cancel_processing()
+        self._processing_task = None
+        self.child_executors.clear()
+        self.status = ExecutorStatus.CANCELLED
+        for _ in range(self._step_waiters):
+            self._output_queue.put_nowait(self._create_cancelled_output(reason))
+
     async def _process_input_loop(self) -> None:
         try:
             while self.status != ExecutorStatus.COMPLETED:
@@ -135,6 +211,7 @@ class Executor:
                 result = await self._execute_node(input_)
 
                 if not result.next_nodes:
+                    self._cancel_eager_tasks()
                     output = ExecutorOutput(
                         execution_id=self.execution_id,
                         node_actor_id=self.node_actor.id,
@@ -160,6 +237,8 @@ class Executor:
                 node_actor_id=self.node_actor.id,
                 node_output=None,
                 exit_=True,
+                error=str(e),
+                error_type=type(e).__name__,
             )
             await self._output_queue.put(error_output)
             raise
@@ -175,7 +254,9 @@ class Executor:
             raise
         finally:
             self.logger.debug("Executor stopped processing input loop")
-            self._processing_task = None
+            # a cancelled loop may already be replaced by a new one
+            if self._processing_task is task:
+                self._processing_task = None
 
     async def _execute_node(self, input_: ExecutorInput) -> Any:
         """
@@ -186,12 +267,34 @@ class Executor:
         """
 
         self.status = ExecutorStatus.RUNNING
-        # Get node actor
+        self._current_input = input_
 
         node_input = input_.node_input
-        result = await self.node_actor.execute(
-            node_input, execution_id=self.execution_id, context=input_.context
-        )
+        on_chunk: ChunkHandler | None = None
+        if self.eager_tool_calls and isinstance(self.node_actor.node, LLMNode):
+            on_chunk = self._create_eager_chunk_handler(input_)
+        elif input_.stream:
+            on_chunk = self._put_chunk
+
+        context = {
+            **(input_.context or {}),
+            "root_execution_id": self.root_execution_id,
+        }
+        try:
+            if on_chunk:
+                result = await self.node_actor.execute(
+                    node_input,
+                    execution_id=self.execution_id,
+                    context=context,
+                    on_chunk=on_chunk,
+                )
+            else:
+                result = await self.node_actor.execute(
+                    node_input, execution_id=self.execution_id, context=context
+                )
+        except BaseException:
+            self._cancel_eager_tasks()
+            raise
 
         # Save state after execution
         actor_state = self.node_actor.serialize_state()
@@ -201,6 +304,111 @@ class Executor:
 
         return result
 
+    async def _put_chunk(self, chunk: Any) -> None:
+        """
+        Forward a streamed chunk of the node output to the root output queue
+        """
+        await self._root_output_queue.put(
+            ExecutorChunk(
+                execution_id=self.execution_id,
+                node_actor_id=self.node_actor.id,
+                node_full_name=self.node_actor.node.full_name,
+                chunk=chunk,
+            )
+        )
+
+    def _create_eager_chunk_handler(self, input_: ExecutorInput) -> ChunkHandler:
+        """
+        Create a chunk handler starting ToolNode executions as soon as
+        a streamed tool call has complete arguments
+        """
+        accumulator = ToolCallChunkAccumulator()
+        # identical calls are started once if deduplication is enabled,
+        # the output is fanned out to the others with the parallel execution
+        started_keys: set[tuple[str, str]] = set()
+
+        async def on_chunk(chunk: AIMessageChunk) -> None:
+            if input_.stream:
+                await self._put_chunk(chunk)
+
+            for tool_call in accumulator.add(chunk):
+                try:
+                    tool = self.registry.lookup(ToolNode, tool_call["name"])
+                except ComponentNotFoundError:
+                    # leave it to the regular flow to report the unknown tool
+                    continue
+
+                if self.dedupe_tool_calls and (
+                    key := get_tool_call_key(tool.full_name, tool_call)
+                ):
+                    if key in started_keys:
+                        continue
+                    started_keys.add(key)
+
+                self.logger.debug(f"Executor eagerly starts tool call {tool_call}")
+                tool_call_id = cast(str, tool_call["id"])
+                child_executor = await self._fork_executor(tool)
+                child_input = self._create_child_input(
+                    child_executor,
+                    tool,
+                    tool_call,
+                    input_.context,
+                    stream=input_.stream,
+                )
+                self._eager_executors[tool_call_id] = child_executor
+                self._eager_tasks[tool_call_id] = asyncio.create_task(
+                    child_executor.step(child_input)
+                )
+
+        return on_chunk
+
+    def _cancel_eager_tasks(self) -> None:
+        """
+        Cancel eagerly started ToolNode executions which are not joined
+        """
+        for task in self._eager_tasks.values():
+            task.cancel()
+        for child_executor in self._eager_executors.values():
+            child_executor._cancel_processing()
+            self.child_executors.pop(child_executor.execution_id, None)
+        self._eager_tasks.clear()
+        self._eager_executors.clear()
+
+    def _create_cancelled_output(self, reason: str) -> ExecutorOutput:
+        node_output = None
+        tool_call = self._current_input.node_input if self._current_input else None
+        if (
+            isinstance(self.node_actor.node, ToolNode)
+            and isinstance(tool_call, dict)
+            and tool_call.get("id")
+        ):
+            node_output = ToolMessage(
+                content=reason,
+                tool_call_id=tool_call["id"],
+                name=self.node_actor.node.name,
+                status="error",
+            )
+
+        return ExecutorOutput(
+            execution_id=self.execution_id,
+            node_actor_id=self.node_actor.id,
+            node_full_name=self.node_actor.node.full_name,
+            node_output=node_output,
+            exit_=True,
+            error=reason,
+            error_type="CancelledError",
+        )
+
+    def _cancel_processing(self) -> None:
+        """
+        Cancel the input processing of the executor and its child executors
+        """
+        self._cancel_eager_tasks()
+        for child_executor in self.child_executors.values():
+            child_executor._cancel_processing()
+        if self._processing_task:
+            self._processing_task.cancel()
+
     async def _handle_next_nodes(self, input_: ExecutorInput, result: Any) -> None:
         """
         Handle the next nodes based on the execution result
@@ -211,15 +419,30 @@ class Executor:
         """
         next_nodes = result.next_nodes
 
-        if len(next_nodes) == 1:
-            await self._handle_sequential_execution(
-                next_nodes[0], context=input_.context
-            )
-        else:
-            await self._handle_parallel_execution(next_nodes, context=input_.context)
+        try:
+            if any(
+                next_node.edge and next_node.edge.depends for next_node in next_nodes
+            ):
+                await self._handle_dag_execution(
+                    next_nodes, context=input_.context, stream=input_.stream
+                )
+            elif len(next_nodes) == 1:
+                await self._handle_sequential_execution(
+                    next_nodes[0], context=input_.context, stream=input_.stream
+                )
+            else:
+                await self._handle_parallel_execution(
+                    next_nodes, context=input_.context, stream=input_.stream
+                )
+        finally:
+            self._cancel_eager_tasks()
 
     async def _handle_sequential_execution(
-        self, next_node_tuple: NextNode, context: dict[str, Any] | None = None
+        self,
+        next_node_tuple: NextNode,
+        context: dict[str, Any] | None = None,
+        *,
+        stream: bool = False,
     ) -> None:
         """
         Handle sequential execution of the next node
@@ -227,26 +450,17 @@ class Executor:
         self.logger.debug(
             "Sequential execution with next node tuple: %s", next_node_tuple
         )
-        next_node, node_input = next_node_tuple
-        child_executor = await self._fork_executor(next_node)
-
-        child_input = ExecutorInput(
-            execution_id=child_executor.execution_id,
-            node_actor_id=child_executor.node_actor.id,
-            node_input=node_input,
-            node_full_name=next_node.full_name,
-            context=context,
+        child_output = await self._step_next_node(
+            next_node_tuple, context, stream=stream
         )
 
-        # Execute child and get result
-        child_output = await child_executor.step(child_input)
-
         continue_input = ExecutorInput(
             execution_id=self.execution_id,
             node_actor_id=self.node_actor.id,
             node_input=child_output.node_output,
             node_full_name=self.node_actor.node.full_name,
             context=context,
+            stream=stream,
         )
 
         await self._input_queue.put(continue_input)
@@ -255,56 +469,210 @@ class Executor:
         self,
         next_nodes: list[NextNode],
         context: dict[str, Any] | None = None,
+        *,
+        stream: bool = False,
+    ) -> None:
+        """
+        Handle parallel execution of multiple nodes,
+        identical tool calls are executed once if deduplication is enabled
+        """
+        self.status = ExecutorStatus.SUSPENDED
+
+        groups = self._dedupe_next_nodes(next_nodes) if self.dedupe_tool_calls else None
+        unique_outputs = await asyncio.gather(
+            *[
+                self._step_next_node(next_node, context, stream=stream)
+                for next_node in (groups.unique if groups else next_nodes)
+            ],
+            return_exceptions=True,
+        )
+        child_outputs = (
+            [
+                fan_out_output(unique_outputs[index], next_node)
+                for index, next_node in zip(groups.indexes, next_nodes, strict=True)
+            ]
+            if groups
+            else unique_outputs
+        )
+
+        self.status = ExecutorStatus.RUNNING
+        if child_outputs:
+            await self._put_combined_input(child_outputs, context, stream=stream)
+
+    def _dedupe_next_nodes(self, next_nodes: list[NextNode]) -> ToolCallGroups:
+        """
+        Collapse next nodes calling the same tool with identical arguments
+        """
+        groups = group_tool_calls(next_nodes)
+        if groups.duplicates:
+            self.deduplicated_tool_calls += groups.duplicates
+            self.logger.debug(
+                f"Executor skips {groups.duplicates} duplicated tool calls"
+            )
+        return groups
+
+    async def _handle_dag_execution(
+        self,
+        next_nodes: list[NextNode],
+        context: dict[str, Any] | None = None,
+        *,
+        stream: bool = False,
     ) -> None:
         """
-        Handle parallel execution of multiple nodes
+        Handle execution of next nodes linked by `depends` edges.
+
+        Independent nodes start concurrently, a node with `depends` waits
+        until the nodes of the listed edges finish and receives their outputs
+        as input: the output itself for a single dependency, a list of outputs
+        in `depends` order otherwise. An LLMNode receives the outputs as a single
+        HumanMessage. If a dependency fails the node is skipped and its output
+        is the error.
         """
         self.status = ExecutorStatus.SUSPENDED
 
-        async def _handle_next_node(next_node_tuple: NextNode) -> ExecutorOutput:
-            next_node, node_input = next_node_tuple
-            child_executor = await self._fork_executor(next_node)
-            child_input = ExecutorInput(
-                execution_id=child_executor.execution_id,
-                node_actor_id=child_executor.node_actor.id,
-                node_input=node_input,
-                node_full_name=next_node.full_name,
-                context=context,
+        indexes_by_edge_id = {
+            next_node.edge.id_: i
+            for i, next_node in enumerate(next_nodes)
+            if next_node.edge and next_node.edge.id_
+        }
+        tasks: dict[int, Task[ExecutorOutput]] = {}
+
+        async def _run(
+            next_node: NextNode, dependencies: list[Task[ExecutorOutput]]
+        ) -> ExecutorOutput:
+            node_input = next_node.input_
+            if dependencies:
+                dependency_outputs = await asyncio.gather(
+                    *dependencies, return_exceptions=True
+                )
+                outputs = []
+                for output in dependency_outputs:
+                    # a failed child executor outputs the error instead of raising
+                    if isinstance(output, BaseException) or output.error is not None:
+                        raise LimanError(
+                            f"Join node {next_node.node.full_name} is skipped, "
+                            f"its dependency failed: {_get_node_output(output)}"
+                        )
+                    outputs.append(output.node_output)
+                node_input = _get_join_input(next_node.node, outputs)
+
+            return await self._step_child(
+                next_node.node, node_input, context, stream=stream
             )
-            return await child_executor.step(child_input)
 
-        def _get_node_output(output: ExecutorOutput | BaseException) -> Any:
-            if isinstance(output, BaseException):
-                return str(output)
-            return output.node_output
+        def _schedule(index: int) -> Task[ExecutorOutput]:
+            if index not in tasks:
+                next_node = next_nodes[index]
+                depends = (next_node.edge.depends or []) if next_node.edge else []
+                dependencies = [_schedule(indexes_by_edge_id[dep]) for dep in depends]
+                tasks[index] = asyncio.create_task(_run(next_node, dependencies))
+            return tasks[index]
 
         child_outputs = await asyncio.gather(
-            *[_handle_next_node(next_node) for next_node in next_nodes],
+            *[_schedule(index) for index in range(len(next_nodes))],
             return_exceptions=True,
         )
 
         self.status = ExecutorStatus.RUNNING
         if child_outputs:
-            combined_input = ExecutorInput(
-                execution_id=self.execution_id,
-                node_actor_id=self.node_actor.id,
-                node_input=[_get_node_output(output) for output in child_outputs],
-                node_full_name=self.node_actor.node.full_name,
-                context=context,
-            )
-            await self._input_queue.put(combined_input)
+            await self._put_combined_input(child_outputs, context, stream=stream)
+
+    async def _step_next_node(
+        self,
+        next_node: NextNode,
+        context: dict[str, Any] | None = None,
+        *,
+        stream: bool = False,
+    ) -> ExecutorOutput:
+        """
+        Execute the next node, joining the eagerly started execution if any
+        """
+        tool_call_id = (
+            next_node.input_.get("id") if isinstance(next_node.input_, dict) else None
+        )
+        if tool_call_id and (task := self._eager_tasks.pop(tool_call_id, None)):
+            self._eager_executors.pop(tool_call_id, None)
+            return await task
+
+        return await self._step_child(
+            next_node.node, next_node.input_, context, stream=stream
+        )
+
+    async def _step_child(
+        self,
+        node: BaseNode[S, NS],
+        node_input: Any,
+        context: dict[str, Any] | None = None,
+        *,
+        stream: bool = False,
+    ) -> ExecutorOutput:
+        """
+        Fork a child executor for the node and execute it with the given input
+        """
+        child_executor = await self._fork_executor(node)
+        child_input = self._create_child_input(
+            child_executor, node, node_input, context, stream=stream
+        )
+        return await child_executor.step(child_input)
+
+    def _create_child_input(
+        self,
+        child_executor: Executor,
+        node: BaseNode[S, NS],
+        node_input: Any,
+        context: dict[str, Any] | None = None,
+        *,
+        stream: bool = False,
+    ) -> ExecutorInput:
+        return ExecutorInput(
+            execution_id=child_executor.execution_id,
+            node_actor_id=child_executor.node_actor.id,
+            node_input=node_input,
+            node_full_name=node.full_name,
+            context=context,
+            stream=stream,
+        )
+
+    async def _put_combined_input(
+        self,
+        child_outputs: list[ExecutorOutput | BaseException],
+        context: dict[str, Any] | None = None,
+        *,
+        stream: bool = False,
+    ) -> None:
+        """
+        Feed outputs of the child executors back to the current node
+        """
+        combined_input = ExecutorInput(
+            execution_id=self.execution_id,
+            node_actor_id=self.node_actor.id,
+            node_input=[_get_node_output(output) for output in child_outputs],
+            node_full_name=self.node_actor.node.full_name,
+            context=context,
+            stream=stream,
+        )
+        await self._input_queue.put(combined_input)
 
     async def _fork_executor(self, node: BaseNode[S, NS]) -> Executor:
         """
         Create child executor for the given node
         """
-        child_node_actor = NodeActor.create(node, llm=self.llm)
+        child_node_actor = NodeActor.create(
+            node,
+            llm=self.llm,
+            memory_llm=self.memory_llm,
+            llm_cache=self.llm_cache,
+        )
 
         child_executor = Executor(
             registry=self.registry,
             state_storage=self.state_storage,
             node_actor=child_node_actor,
             llm=self.llm,
+            memory_llm=self.memory_llm,
+            llm_cache=self.llm_cache,
+            eager_tool_calls=self.eager_tool_calls,
+            dedupe_tool_calls=self.dedupe_tool_calls,
             parent_executor=self,
             root_output_queue=self._root_output_queue,
         )
@@ -314,3 +682,30 @@ class Executor:
 
         self.child_executors[child_executor.execution_id] = child_executor
         return child_executor
+
+
+def _get_join_input(node: BaseNode[Any, Any], outputs: list[Any]) -> Any:
+    """
+    Build the input of a DAG join node from the outputs of its dependencies
+    """
+    if isinstance(node, LLMNode):
+        return HumanMessage(
+            content="\n\n".join(_get_output_text(output) for output in outputs)
+        )
+    return outputs[0] if len(outputs) == 1 else outputs
+
+
+def _get_output_text(output: Any) -> str:
+    if isinstance(output, BaseMessage):
+        return output.text()
+    if isinstance(output, str):
+        return output
+    return json.dumps(output, default=str)
+
+
+def _get_node_output(output: ExecutorOutput | BaseException) -> Any:
+    if isinstance(output, BaseException):
+        return str(output)
+    if output.node_output is None and output.error is not None:
+        return output.error
+    return output.node_output
@@ -0,0 +1,101 @@
+import json
+from typing import Any, NamedTuple
+
+from langchain_core.messages import ToolMessage
+from liman_core.node_actor.schemas import NextNode
+
+from liman.executor.schemas import ExecutorOutput
+
+
+class ToolCallGroups(NamedTuple):
+    """
+    Next nodes with identical tool calls collapsed
+    """
+
+    unique: list[NextNode]
+    # index in `unique` for every original next node
+    indexes: list[int]
+
+    @property
+    def duplicates(self) -> int:
+        return len(self.indexes) - len(self.unique)
+
+
+def group_tool_calls(next_nodes: list[NextNode]) -> ToolCallGroups:
+    """
+    Group next nodes calling the same tool with identical arguments.
+
+    Arguments are compared by their canonical JSON, so the key order doesn't
+    matter. Next nodes which are not tool calls are never grouped.
+
+    Args:
+        next_nodes: Next nodes of an LLM node output
+
+    Returns:
+        ToolCallGroups with the first next node of every group, in order
+    """
+    unique: list[NextNode] = []
+    indexes: list[int] = []
+    seen: dict[tuple[str, str], int] = {}
+
+    for next_node in next_nodes:
+        key = get_tool_call_key(next_node.node.full_name, next_node.input_)
+        if key is not None and key in seen:
+            indexes.append(seen[key])
+            continue
+
+        if key is not None:
+            seen[key] = len(unique)
+        indexes.append(len(unique))
+        unique.append(next_node)
+
+    return ToolCallGroups(unique, indexes)
+
+
+def fan_out_output(
+    output: ExecutorOutput | BaseException, next_node: NextNode
+) -> ExecutorOutput | BaseException:
+    """
+    Address the output of a shared tool execution to the tool call
+    of the next node, i.e. set its ToolMessage `tool_call_id`
+    """
+    if isinstance(output, BaseException):
+        return output
+
+    message = output.node_output
+    tool_call_id = _get_tool_call_id(next_node)
+    if (
+        not isinstance(message, ToolMessage)
+        or tool_call_id is None
+        or message.tool_call_id == tool_call_id
+    ):
+        return output
+
+    return output.model_copy(
+        update={
+            "node_output": message.model_copy(update={"tool_call_id": tool_call_id})
+        }
+    )
+
+
+def get_tool_call_key(node_full_name: str, tool_call: Any) -> tuple[str, str] | None:
+    """
+    Get the key identical calls of the tool share
+
+    Returns:
+        Tool name and canonical JSON of the arguments,
+        None if the input isn't a tool call
+    """
+    if not isinstance(tool_call, dict) or "args" not in tool_call:
+        return None
+
+    args = json.dumps(
+        tool_call["args"], sort_keys=True, separators=(",", ":"), default=str
+    )
+    return node_full_name, args
+
+
+def _get_tool_call_id(next_node: NextNode) -> Any:
+    if isinstance(next_node.input_, dict):
+        return next_node.input_.get("id")
+    return None
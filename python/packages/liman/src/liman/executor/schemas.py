@@ -16,6 +16,7 @@ class ExecutorStatus(str, Enum):
     SUSPENDED = "suspended"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
 
 class ExecutorInput(BaseModel):
@@ -25,6 +26,8 @@ class ExecutorInput(BaseModel):
     node_full_name: str
     context: dict[str, Any] | None = None
 
+    stream: bool = False
+
 
 class ExecutorOutput(BaseModel):
     execution_id: UUID
@@ -51,6 +54,34 @@ class ExecutorOutput(BaseModel):
         return str(self.node_output)
 
 
+class ExecutorChunk(BaseModel):
+    """
+    Chunk of a node output streamed before the node completes,
+    e.g. LLM response tokens
+    """
+
+    execution_id: UUID
+    node_actor_id: UUID
+    node_full_name: str
+    chunk: Any
+
+    def __str__(self) -> str:
+        if isinstance(self.chunk, BaseMessage):
+            content = self.chunk.content
+
+            if isinstance(content, list):
+                return "".join(
+                    item if isinstance(item, str) else str(item.get("text", ""))
+                    for item in content
+                )
+            return content
+
+        return str(self.chunk)
+
+
+ExecutorEvent = ExecutorChunk | ExecutorOutput
+
+
 class ExecutorState(BaseModel):
     """
     Executor state that can restore the execution tree structure.
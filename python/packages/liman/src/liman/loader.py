@@ -6,7 +6,6 @@ from liman_core.base.component import Component
 from liman_core.errors import InvalidSpecError, LimanError
 from liman_core.nodes.supported_types import get_node_cls
 from liman_core.registry import Registry
-from ruamel.yaml import YAML
 
 logger = logging.getLogger(__name__)
 
@@ -99,6 +98,8 @@ def _load_nodes_from_yaml(
     """
     Load nodes from a YAML file that may contain single or multiple documents.
     """
+    from ruamel.yaml import YAML
+
     yaml = YAML()
 
     try:
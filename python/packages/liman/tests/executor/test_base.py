@@ -1,10 +1,18 @@
 import asyncio
 from asyncio import Queue
+from typing import Any
 from unittest.mock import AsyncMock, Mock, patch
 from uuid import UUID, uuid4
 
 import pytest
 from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    HumanMessage,
+    ToolMessage,
+)
+from liman_core.edge.schemas import EdgeSpec
 from liman_core.node_actor.actor import NodeActor
 from liman_core.node_actor.schemas import NextNode, Result
 from liman_core.nodes.base.node import BaseNode
@@ -13,7 +21,12 @@ from liman_core.nodes.tool_node.node import ToolNode
 from liman_core.registry import Registry
 
 from liman.executor.base import Executor
-from liman.executor.schemas import ExecutorInput, ExecutorOutput, ExecutorStatus
+from liman.executor.schemas import (
+    ExecutorEvent,
+    ExecutorInput,
+    ExecutorOutput,
+    ExecutorStatus,
+)
 from liman.state import InMemoryStateStorage
 
 
@@ -136,7 +149,7 @@ def test_executor_init_with_root_output_queue(
     node_actor: NodeActor[LLMNode],
     mock_llm: Mock,
 ) -> None:
-    root_queue: Queue[ExecutorOutput] = Queue()
+    root_queue: Queue[ExecutorEvent] = Queue()
     executor = Executor(
         registry=registry,
         state_storage=storage,
@@ -365,7 +378,9 @@ async def test_execute_node_basic(
         result = await executor._execute_node(input_)
 
         mock_execute.assert_called_once_with(
-            "test input", execution_id=execution_id, context=None
+            "test input",
+            execution_id=execution_id,
+            context={"root_execution_id": execution_id},
         )
         mock_storage_asave.assert_called_once_with(
             execution_id,
@@ -418,8 +433,11 @@ async def test_fork_executor(
         assert child_executor.node_actor == mock_child_actor
         assert child_executor.execution_id in executor.child_executors
         assert executor.child_executors[child_executor.execution_id] == child_executor
+        assert child_executor.root_execution_id == execution_id
 
-        mock_node_actor_class.create.assert_called_once_with(next_node, llm=mock_llm)
+        mock_node_actor_class.create.assert_called_once_with(
+            next_node, llm=mock_llm, memory_llm=None, llm_cache=None
+        )
 
 
 @pytest.mark.asyncio
@@ -497,3 +515,433 @@ def test_on_exit_input_loop_cancelled_error(
     executor._on_exit_input_loop(cancelled_task)
 
     assert executor._processing_task is None
+
+
+@pytest.mark.asyncio
+async def test_handle_dag_execution(
+    registry: Registry,
+    storage: InMemoryStateStorage,
+    node_actor: NodeActor[LLMNode],
+    mock_llm: Mock,
+) -> None:
+    executor = Executor(
+        registry=registry,
+        state_storage=storage,
+        node_actor=node_actor,
+        llm=mock_llm,
+    )
+
+    nodes = {}
+    for name in ("a", "b", "join"):
+        nodes[name] = Mock(spec=BaseNode)
+        nodes[name].full_name = f"ToolNode/{name}"
+
+    next_nodes = [
+        NextNode(
+            nodes["join"], "join input", EdgeSpec(target="join", depends=["a", "b"])
+        ),
+        NextNode(nodes["a"], "a input", EdgeSpec(target="a", id="a")),
+        NextNode(nodes["b"], "b input", EdgeSpec(target="b", id="b")),
+    ]
+
+    started: list[str] = []
+    both_started = asyncio.Event()
+
+    def _fork(node: Mock) -> Mock:
+        name = node.full_name.split("/")[1]
+        child = Mock()
+        child.execution_id = uuid4()
+        child.node_actor.id = uuid4()
+
+        async def _step(input_: ExecutorInput) -> ExecutorOutput:
+            started.append(name)
+            if name in ("a", "b"):
+                if len(started) == 2:
+                    both_started.set()
+                # independent branches must run concurrently
+                await asyncio.wait_for(both_started.wait(), timeout=1)
+            return ExecutorOutput(
+                execution_id=child.execution_id,
+                node_actor_id=child.node_actor.id,
+                node_full_name=node.full_name,
+                node_output=f"{name}: {input_.node_input}",
+            )
+
+        child.step = _step
+        return child
+
+    with patch.object(executor, "_fork_executor", side_effect=_fork):
+        await executor._handle_next_nodes(
+            ExecutorInput(
+                execution_id=executor.execution_id,
+                node_actor_id=node_actor.id,
+                node_input="input",
+                node_full_name="LLMNode/test_llm_node",
+            ),
+            Result(output="output", next_nodes=next_nodes),
+        )
+
+    assert started[2] == "join"
+    combined_input = executor._input_queue.get_nowait()
+    assert combined_input.node_input == [
+        "join: ['a: a input', 'b: b input']",
+        "a: a input",
+        "b: b input",
+    ]
+    assert executor.status == ExecutorStatus.RUNNING
+
+
+@pytest.mark.asyncio
+async def test_handle_dag_execution_skips_join_on_failed_dependency(
+    registry: Registry,
+    storage: InMemoryStateStorage,
+    node_actor: NodeActor[LLMNode],
+    mock_llm: Mock,
+) -> None:
+    mock_llm.ainvoke = AsyncMock(side_effect=RuntimeError("LLM is unavailable"))
+    executor = Executor(
+        registry=registry,
+        state_storage=storage,
+        node_actor=node_actor,
+        llm=mock_llm,
+    )
+    nodes = {
+        name: LLMNode.from_dict(
+            {"kind": "LLMNode", "name": name, "prompts": {"system": {"en": "Hi"}}},
+            registry,
+        )
+        for name in ("a", "join")
+    }
+
+    next_nodes = [
+        NextNode(nodes["a"], "a input", EdgeSpec(target="a", id="a")),
+        NextNode(nodes["join"], None, EdgeSpec(target="join", depends=["a"])),
+    ]
+    forked: list[str] = []
+    fork_executor = executor._fork_executor
+
+    async def _fork(node: Any) -> Any:
+        forked.append(node.name)
+        return await fork_executor(node)
+
+    with patch.object(executor, "_fork_executor", side_effect=_fork):
+        await executor._handle_next_nodes(
+            ExecutorInput(
+                execution_id=executor.execution_id,
+                node_actor_id=node_actor.id,
+                node_input="input",
+                node_full_name="LLMNode/test_llm_node",
+            ),
+            Result(output="output", next_nodes=next_nodes),
+        )
+
+    assert forked == ["a"]
+    assert mock_llm.ainvoke.await_count == 1
+    combined_input = executor._input_queue.get_nowait()
+    error = "Node execution failed: LLM is unavailable"
+    assert combined_input.node_input == [
+        error,
+        f"Join node LLMNode/join is skipped, its dependency failed: {error}",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_handle_dag_execution_with_llm_node_join(
+    registry: Registry,
+    storage: InMemoryStateStorage,
+    node_actor: NodeActor[LLMNode],
+    mock_llm: Mock,
+) -> None:
+    executor = Executor(
+        registry=registry,
+        state_storage=storage,
+        node_actor=node_actor,
+        llm=mock_llm,
+    )
+    join_node = LLMNode.from_dict(
+        {"kind": "LLMNode", "name": "join", "prompts": {"system": {"en": "Join."}}},
+        registry,
+    )
+
+    nodes = {}
+    for name in ("a", "b"):
+        nodes[name] = Mock(spec=BaseNode)
+        nodes[name].full_name = f"ToolNode/{name}"
+
+    next_nodes = [
+        NextNode(nodes["a"], "a input", EdgeSpec(target="a", id="a")),
+        NextNode(nodes["b"], "b input", EdgeSpec(target="b", id="b")),
+        NextNode(join_node, None, EdgeSpec(target="join", depends=["a", "b"])),
+    ]
+    fork_executor = executor._fork_executor
+
+    async def _fork(node: Any) -> Any:
+        if node is join_node:
+            return await fork_executor(node)
+
+        name = node.full_name.split("/")[1]
+        child = Mock()
+        child.execution_id = uuid4()
+        child.node_actor.id = uuid4()
+
+        async def _step(input_: ExecutorInput) -> ExecutorOutput:
+            return ExecutorOutput(
+                execution_id=child.execution_id,
+                node_actor_id=child.node_actor.id,
+                node_full_name=node.full_name,
+                node_output=AIMessage(f"{name} result"),
+            )
+
+        child.step = _step
+        return child
+
+    with (
+        patch.object(executor, "_fork_executor", side_effect=_fork),
+        patch.object(LLMNode, "invoke", new_callable=AsyncMock) as mock_invoke,
+    ):
+        mock_invoke.return_value = AIMessage("joined")
+        await executor._handle_next_nodes(
+            ExecutorInput(
+                execution_id=executor.execution_id,
+                node_actor_id=node_actor.id,
+                node_input="input",
+                node_full_name="LLMNode/test_llm_node",
+            ),
+            Result(output="output", next_nodes=next_nodes),
+        )
+
+    messages = mock_invoke.call_args.args[1]
+    assert messages == [HumanMessage("a result\n\nb result")]
+    combined_input = executor._input_queue.get_nowait()
+    assert combined_input.node_input[2] == AIMessage("joined")
+
+
+@pytest.mark.asyncio
+async def test_eager_tool_calls_start_before_llm_completes(
+    registry: Registry,
+    storage: InMemoryStateStorage,
+    node_actor: NodeActor[LLMNode],
+    mock_llm: Mock,
+) -> None:
+    executor = Executor(
+        registry=registry,
+        state_storage=storage,
+        node_actor=node_actor,
+        llm=mock_llm,
+        eager_tool_calls=True,
+    )
+    input_ = ExecutorInput(
+        execution_id=executor.execution_id,
+        node_actor_id=node_actor.id,
+        node_input="input",
+        node_full_name="LLMNode/test_llm_node",
+    )
+
+    tools = {}
+    for name in ("first", "second"):
+        tools[name] = Mock(spec=ToolNode)
+        tools[name].full_name = f"ToolNode/{name}"
+
+    tool_calls = [
+        {"name": "first", "args": {"q": 1}, "id": "call_1", "type": "tool_call"},
+        {"name": "second", "args": {"q": 2}, "id": "call_2", "type": "tool_call"},
+    ]
+    started: list[str] = []
+    second_done = asyncio.Event()
+
+    def _fork(node: Mock) -> Mock:
+        name = node.full_name.split("/")[1]
+        child = Mock()
+        child.execution_id = uuid4()
+        child.node_actor.id = uuid4()
+
+        async def _step(child_input: ExecutorInput) -> ExecutorOutput:
+            started.append(name)
+            if name == "first":
+                # finishes last, but its result must stay first
+                await asyncio.wait_for(second_done.wait(), timeout=1)
+            else:
+                second_done.set()
+            return ExecutorOutput(
+                execution_id=child.execution_id,
+                node_actor_id=child.node_actor.id,
+                node_full_name=node.full_name,
+                node_output=f"{name}: {child_input.node_input['args']}",
+            )
+
+        child.step = _step
+        return child
+
+    def _chunk(*tool_call_chunks: dict[str, Any]) -> AIMessageChunk:
+        return AIMessageChunk(content="", tool_call_chunks=list(tool_call_chunks))
+
+    async def _execute(*args: Any, on_chunk: Any, **kwargs: Any) -> Result:
+        await on_chunk(
+            _chunk({"name": "first", "args": '{"q": ', "id": "call_1", "index": 0})
+        )
+        await on_chunk(
+            _chunk(
+                {"args": "1}", "index": 0},
+                {"name": "second", "args": '{"q"', "id": "call_2", "index": 1},
+            )
+        )
+        await asyncio.sleep(0)
+        # the first tool runs while the second call is still streamed
+        assert started == ["first"]
+
+        await on_chunk(_chunk({"args": ": 2}", "index": 1}))
+        return Result(
+            output=AIMessage(content="", tool_calls=tool_calls),
+            next_nodes=[
+                NextNode(tools["first"], tool_calls[0]),
+                NextNode(tools["second"], tool_calls[1]),
+            ],
+        )
+
+    with (
+        patch.object(registry, "lookup", side_effect=lambda _, name: tools[name]),
+        patch.object(node_actor, "execute", side_effect=_execute),
+        patch.object(executor, "_fork_executor", side_effect=_fork) as mock_fork,
+    ):
+        result = await executor._execute_node(input_)
+        await executor._handle_next_nodes(input_, result)
+
+    assert mock_fork.call_count == 2
+    combined_input = executor._input_queue.get_nowait()
+    assert combined_input.node_input == ["first: {'q': 1}", "second: {'q': 2}"]
+    assert executor._eager_tasks == {}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_eager_tool_calls_do_not_complete(
+    registry: Registry,
+    storage: InMemoryStateStorage,
+    node_actor: NodeActor[LLMNode],
+    mock_llm: Mock,
+) -> None:
+    executor = Executor(
+        registry=registry,
+        state_storage=storage,
+        node_actor=node_actor,
+        llm=mock_llm,
+        eager_tool_calls=True,
+    )
+    input_ = ExecutorInput(
+        execution_id=executor.execution_id,
+        node_actor_id=node_actor.id,
+        node_input="input",
+        node_full_name="LLMNode/test_llm_node",
+    )
+
+    tool_events: list[str] = []
+
+    async def slow_tool() -> str:
+        tool_events.append("started")
+        await asyncio.sleep(0.05)
+        tool_events.append("finished")
+        return "done"
+
+    tool = ToolNode.from_dict({"kind": "ToolNode", "name": "slow_tool"}, registry)
+    tool.set_func(slow_tool)
+    tool.compile()
+
+    async def _execute(*args: Any, on_chunk: Any, **kwargs: Any) -> Result:
+        await on_chunk(
+            AIMessageChunk(
+                content="",
+                tool_call_chunks=[
+                    {"name": "slow_tool", "args": "{}", "id": "call_1", "index": 0}
+                ],
+            )
+        )
+        await asyncio.sleep(0.01)
+        raise RuntimeError("LLM stream failed")
+
+    with (
+        patch.object(node_actor, "execute", side_effect=_execute),
+        pytest.raises(RuntimeError, match="LLM stream failed"),
+    ):
+        await executor._execute_node(input_)
+
+    await asyncio.sleep(0.1)
+
+    assert tool_events == ["started"]
+    assert executor._eager_tasks == {}
+    assert executor.child_executors == {}
+
+
+@pytest.mark.asyncio
+async def test_cancel_returns_cancelled_output(
+    registry: Registry,
+    storage: InMemoryStateStorage,
+    node_actor: NodeActor[LLMNode],
+    mock_llm: Mock,
+) -> None:
+    executor = Executor(
+        registry=registry,
+        state_storage=storage,
+        node_actor=node_actor,
+        llm=mock_llm,
+    )
+    child_executor = Mock(spec=Executor)
+    executor.child_executors[uuid4()] = child_executor
+    input_ = ExecutorInput(
+        execution_id=executor.execution_id,
+        node_actor_id=node_actor.id,
+        node_input="input",
+        node_full_name="LLMNode/test_llm_node",
+    )
+
+    async def _execute(*args: Any, **kwargs: Any) -> Result:
+        await asyncio.sleep(10)
+        raise AssertionError("execution is not cancelled")
+
+    with patch.object(node_actor, "execute", side_effect=_execute):
+        step_task = asyncio.create_task(executor.step(input_))
+        await asyncio.sleep(0.01)
+        executor.cancel("Stopped by user")
+        output = await asyncio.wait_for(step_task, 1)
+
+    assert output.exit_ is True
+    assert output.error == "Stopped by user"
+    assert output.error_type == "CancelledError"
+    assert output.node_output is None
+    assert executor.status == ExecutorStatus.CANCELLED
+    assert executor.child_executors == {}
+    child_executor._cancel_processing.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_cancel_tool_node_outputs_error_tool_message(
+    registry: Registry, storage: InMemoryStateStorage, mock_llm: Mock
+) -> None:
+    async def slow_tool() -> str:
+        await asyncio.sleep(10)
+        return "done"
+
+    tool = ToolNode.from_dict({"kind": "ToolNode", "name": "slow_tool"}, registry)
+    tool.set_func(slow_tool)
+    tool.compile()
+    tool_actor = NodeActor(tool, llm=mock_llm)
+    executor = Executor(
+        registry=registry,
+        state_storage=storage,
+        node_actor=tool_actor,
+        llm=mock_llm,
+    )
+    input_ = ExecutorInput(
+        execution_id=executor.execution_id,
+        node_actor_id=tool_actor.id,
+        node_input={"name": "slow_tool", "args": {}, "id": "call_1"},
+        node_full_name=tool.full_name,
+    )
+
+    step_task = asyncio.create_task(executor.step(input_))
+    await asyncio.sleep(0.01)
+    executor.cancel()
+    output = await asyncio.wait_for(step_task, 1)
+
+    assert isinstance(output.node_output, ToolMessage)
+    assert output.node_output.tool_call_id == "call_1"
+    assert output.node_output.status == "error"
+    assert output.node_output.content == "Execution is cancelled"
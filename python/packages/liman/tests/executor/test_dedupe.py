@@ -0,0 +1,220 @@
+import asyncio
+import json
+from typing import Any
+from unittest.mock import Mock, patch
+from uuid import uuid4
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+from liman_core.node_actor.actor import NodeActor
+from liman_core.node_actor.schemas import NextNode, Result
+from liman_core.nodes.llm_node.node import LLMNode
+from liman_core.nodes.tool_node.node import ToolNode
+from liman_core.registry import Registry
+
+from liman.executor.base import Executor
+from liman.executor.dedupe import fan_out_output, group_tool_calls
+from liman.executor.schemas import ExecutorInput, ExecutorOutput
+from liman.state import InMemoryStateStorage
+
+
+def _tool(name: str) -> Mock:
+    tool = Mock(spec=ToolNode)
+    tool.full_name = f"ToolNode/{name}"
+    return tool
+
+
+def _tool_call(name: str, id_: str, **args: Any) -> dict[str, Any]:
+    return {"name": name, "args": args, "id": id_, "type": "tool_call"}
+
+
+def test_group_tool_calls() -> None:
+    weather, geo = _tool("weather"), _tool("geo")
+    next_nodes = [
+        NextNode(weather, _tool_call("weather", "call_1", city="Paris", days=1)),
+        NextNode(geo, _tool_call("geo", "call_2", city="Paris", days=1)),
+        NextNode(weather, _tool_call("weather", "call_3", days=1, city="Paris")),
+        NextNode(weather, _tool_call("weather", "call_4", city="Rome", days=1)),
+        NextNode(weather, _tool_call("weather", "call_5", city="Paris", days=1)),
+    ]
+
+    groups = group_tool_calls(next_nodes)
+
+    assert [n.input_["id"] for n in groups.unique] == ["call_1", "call_2", "call_4"]
+    assert groups.indexes == [0, 1, 0, 2, 0]
+    assert groups.duplicates == 2
+
+
+def test_group_tool_calls_keeps_other_inputs() -> None:
+    node = _tool("node")
+    next_nodes = [NextNode(node, "output"), NextNode(node, "output")]
+
+    groups = group_tool_calls(next_nodes)
+
+    assert groups.unique == next_nodes
+    assert groups.duplicates == 0
+
+
+def test_fan_out_output_sets_tool_call_id() -> None:
+    output = ExecutorOutput(
+        execution_id=uuid4(),
+        node_actor_id=uuid4(),
+        node_full_name="ToolNode/weather",
+        node_output=ToolMessage(content="sunny", tool_call_id="call_1"),
+    )
+    next_node = NextNode(_tool("weather"), _tool_call("weather", "call_3"))
+
+    fanned_out = fan_out_output(output, next_node)
+
+    assert isinstance(fanned_out, ExecutorOutput)
+    assert fanned_out.node_output is not None
+    assert output.node_output is not None
+    assert fanned_out.node_output.tool_call_id == "call_3"
+    assert fanned_out.node_output.content == "sunny"
+    assert output.node_output.tool_call_id == "call_1"
+
+
+@pytest.mark.asyncio
+async def test_parallel_execution_runs_identical_tool_calls_once(
+    registry: Registry, storage: InMemoryStateStorage, llm_node: LLMNode
+) -> None:
+    llm = Mock(spec=BaseChatModel)
+    node_actor = NodeActor(llm_node, llm=llm)
+    executor = Executor(
+        registry=registry,
+        state_storage=storage,
+        node_actor=node_actor,
+        llm=llm,
+        dedupe_tool_calls=True,
+    )
+    weather = _tool("weather")
+    next_nodes = [
+        NextNode(weather, _tool_call("weather", "call_1", city="Paris")),
+        NextNode(weather, _tool_call("weather", "call_2", city="Rome")),
+        NextNode(weather, _tool_call("weather", "call_3", city="Paris")),
+    ]
+    executed: list[str] = []
+
+    def _fork(node: Mock) -> Mock:
+        child = Mock()
+        child.execution_id = uuid4()
+        child.node_actor.id = uuid4()
+
+        async def _step(input_: ExecutorInput) -> ExecutorOutput:
+            tool_call = input_.node_input
+            executed.append(tool_call["id"])
+            await asyncio.sleep(0)
+            return ExecutorOutput(
+                execution_id=child.execution_id,
+                node_actor_id=child.node_actor.id,
+                node_full_name=node.full_name,
+                node_output=ToolMessage(
+                    content=f"weather in {tool_call['args']['city']}",
+                    tool_call_id=tool_call["id"],
+                ),
+            )
+
+        child.step = _step
+        return child
+
+    with patch.object(executor, "_fork_executor", side_effect=_fork):
+        await executor._handle_next_nodes(
+            ExecutorInput(
+                execution_id=executor.execution_id,
+                node_actor_id=node_actor.id,
+                node_input="input",
+                node_full_name=llm_node.full_name,
+            ),
+            Result(output="output", next_nodes=next_nodes),
+        )
+
+    assert executed == ["call_1", "call_2"]
+    assert executor.deduplicated_tool_calls == 1
+    combined_input = executor._input_queue.get_nowait()
+    assert [(m.tool_call_id, m.content) for m in combined_input.node_input] == [
+        ("call_1", "weather in Paris"),
+        ("call_2", "weather in Rome"),
+        ("call_3", "weather in Paris"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_eager_execution_starts_identical_tool_calls_once(
+    registry: Registry, storage: InMemoryStateStorage, llm_node: LLMNode
+) -> None:
+    llm = Mock(spec=BaseChatModel)
+    node_actor = NodeActor(llm_node, llm=llm)
+    executor = Executor(
+        registry=registry,
+        state_storage=storage,
+        node_actor=node_actor,
+        llm=llm,
+        eager_tool_calls=True,
+        dedupe_tool_calls=True,
+    )
+    input_ = ExecutorInput(
+        execution_id=executor.execution_id,
+        node_actor_id=node_actor.id,
+        node_input="input",
+        node_full_name=llm_node.full_name,
+    )
+    weather = _tool("weather")
+    tool_calls = [
+        _tool_call("weather", "call_1", city="Paris"),
+        _tool_call("weather", "call_2", city="Rome"),
+        _tool_call("weather", "call_3", city="Paris"),
+    ]
+    executed: list[str] = []
+
+    def _fork(node: Mock) -> Mock:
+        child = Mock()
+        child.execution_id = uuid4()
+        child.node_actor.id = uuid4()
+
+        async def _step(child_input: ExecutorInput) -> ExecutorOutput:
+            tool_call = child_input.node_input
+            executed.append(tool_call["id"])
+            return ExecutorOutput(
+                execution_id=child.execution_id,
+                node_actor_id=child.node_actor.id,
+                node_full_name=node.full_name,
+                node_output=ToolMessage(
+                    content=f"weather in {tool_call['args']['city']}",
+                    tool_call_id=tool_call["id"],
+                ),
+            )
+
+        child.step = _step
+        return child
+
+    async def _execute(*args: Any, on_chunk: Any, **kwargs: Any) -> Result:
+        for index, tool_call in enumerate(tool_calls):
+            chunk = {
+                "name": tool_call["name"],
+                "args": json.dumps(tool_call["args"]),
+                "id": tool_call["id"],
+                "index": index,
+            }
+            await on_chunk(AIMessageChunk(content="", tool_call_chunks=[chunk]))
+        return Result(
+            output=AIMessage(content="", tool_calls=tool_calls),
+            next_nodes=[NextNode(weather, tool_call) for tool_call in tool_calls],
+        )
+
+    with (
+        patch.object(registry, "lookup", return_value=weather),
+        patch.object(node_actor, "execute", side_effect=_execute),
+        patch.object(executor, "_fork_executor", side_effect=_fork),
+    ):
+        result = await executor._execute_node(input_)
+        await executor._handle_next_nodes(input_, result)
+
+    assert executed == ["call_1", "call_2"]
+    combined_input = executor._input_queue.get_nowait()
+    assert [(m.tool_call_id, m.content) for m in combined_input.node_input] == [
+        ("call_1", "weather in Paris"),
+        ("call_2", "weather in Rome"),
+        ("call_3", "weather in Paris"),
+    ]
+    assert executor._eager_tasks == {}
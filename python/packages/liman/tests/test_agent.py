@@ -7,12 +7,15 @@ from uuid import UUID, uuid4
 
 import pytest
 from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
 from liman_core.node_actor.actor import NodeActor
+from liman_core.nodes.llm_node.node import LLMNode
 from liman_core.registry import Registry
 
 from liman.agent import Agent, NodeAgentConfig
 from liman.executor.base import Executor
-from liman.executor.schemas import ExecutorInput, ExecutorOutput
+from liman.executor.schemas import ExecutorChunk, ExecutorInput, ExecutorOutput
 from liman.state import InMemoryStateStorage
 
 
@@ -317,3 +320,262 @@ def test_on_exit_input_loop_other_exception(agent: Agent) -> None:
 
     with pytest.raises(RuntimeError, match="Task failed"):
         agent._on_exit_input_loop(failed_task)
+
+
+def _create_streaming_agent(registry: Registry, storage: InMemoryStateStorage) -> Agent:
+    LLMNode.from_dict(
+        {"kind": "LLMNode", "name": "start", "prompts": {"system": {"en": "Hi"}}},
+        registry,
+    )
+    llm = GenericFakeChatModel(messages=iter([AIMessage("Hello there friend")]))
+    with TemporaryDirectory() as temp_dir:
+        return Agent(
+            specs_dir=temp_dir,
+            start_node="LLMNode/start",
+            llm=llm,
+            registry=registry,
+            state_storage=storage,
+        )
+
+
+@pytest.mark.asyncio
+async def test_astream_yields_chunks_and_same_output_as_step(
+    registry: Registry, storage: InMemoryStateStorage
+) -> None:
+    stream_agent = _create_streaming_agent(registry, storage)
+    events = [event async for event in stream_agent.astream("Hi")]
+
+    chunks = [event for event in events if isinstance(event, ExecutorChunk)]
+    output = events[-1]
+    assert len(chunks) > 1
+    assert "".join(str(chunk) for chunk in chunks) == "Hello there friend"
+    assert isinstance(output, ExecutorOutput)
+    assert output.exit_ is True
+
+    step_storage = InMemoryStateStorage()
+    step_agent = _create_streaming_agent(Registry(), step_storage)
+    step_output = await step_agent.step("Hi")
+
+    assert str(output) == str(step_output) == "Hello there friend"
+    assert type(output.node_output) is type(step_output.node_output)
+
+    def saved_messages(storage: InMemoryStateStorage) -> list[tuple[str, Any]]:
+        (actor_states,) = storage.actor_states.values()
+        (state,) = actor_states.values()
+        return [(m["type"], m["content"]) for m in state["node_state"]["messages"]]
+
+    assert saved_messages(storage) == saved_messages(step_storage)
+
+
+@pytest.mark.asyncio
+async def test_astream_closed_early_leaves_no_chunks(
+    registry: Registry, storage: InMemoryStateStorage
+) -> None:
+    stream_agent = _create_streaming_agent(registry, storage)
+    stream = stream_agent.astream("Hi")
+
+    first = await anext(stream)
+    await stream.aclose()
+
+    assert isinstance(first, ExecutorChunk)
+    assert stream_agent._stream_queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_astream_closed_early_doesnt_leak_output_to_next_step(
+    registry: Registry, storage: InMemoryStateStorage
+) -> None:
+    LLMNode.from_dict(
+        {"kind": "LLMNode", "name": "start", "prompts": {"system": {"en": "Hi"}}},
+        registry,
+    )
+    llm = GenericFakeChatModel(
+        messages=iter([AIMessage("first answer words"), AIMessage("second answer")])
+    )
+    with TemporaryDirectory() as temp_dir:
+        agent = Agent(
+            specs_dir=temp_dir,
+            start_node="LLMNode/start",
+            llm=llm,
+            registry=registry,
+            state_storage=storage,
+        )
+
+    stream = agent.astream("Hi")
+    await anext(stream)
+    await stream.aclose()
+
+    assert agent._processing_task is None
+    assert agent._output_queue.empty()
+
+    output = await asyncio.wait_for(agent.step("Again"), 1)
+    assert str(output) == "second answer"
+    assert output.error is None
+
+
+@pytest.mark.asyncio
+async def test_step_timeout_cancels_execution(
+    registry: Registry, storage: InMemoryStateStorage
+) -> None:
+    llm = Mock(spec=BaseChatModel)
+
+    async def _ainvoke(*args: Any, **kwargs: Any) -> AIMessage:
+        await asyncio.sleep(10)
+        return AIMessage("late")
+
+    llm.ainvoke = AsyncMock(side_effect=_ainvoke)
+    LLMNode.from_dict(
+        {"kind": "LLMNode", "name": "start", "prompts": {"system": {"en": "Hi"}}},
+        registry,
+    )
+    with TemporaryDirectory() as temp_dir:
+        agent = Agent(
+            specs_dir=temp_dir,
+            start_node="LLMNode/start",
+            llm=llm,
+            registry=registry,
+            state_storage=storage,
+        )
+        output = await asyncio.wait_for(agent.step("Hi", timeout=0.05), 1)
+
+    assert output.exit_ is True
+    assert output.error == "Agent step timed out after 0.05 seconds"
+    assert output.error_type == "CancelledError"
+
+
+def _create_batch_agent(
+    registry: Registry, storage: InMemoryStateStorage, llm: Mock
+) -> Agent:
+    LLMNode.from_dict(
+        {"kind": "LLMNode", "name": "start", "prompts": {"system": {"en": "Hi"}}},
+        registry,
+    )
+    with TemporaryDirectory() as temp_dir:
+        return Agent(
+            specs_dir=temp_dir,
+            start_node="LLMNode/start",
+            llm=llm,
+            registry=registry,
+            state_storage=storage,
+        )
+
+
+def _create_echo_llm(
+    delays: dict[str, float] | None = None, in_flight: list[int] | None = None
+) -> Mock:
+    llm = Mock(spec=BaseChatModel)
+    running = [0]
+
+    async def _ainvoke(messages: Any, *args: Any, **kwargs: Any) -> AIMessage:
+        content = messages[-1].content
+        running[0] += 1
+        if in_flight is not None:
+            in_flight.append(running[0])
+        try:
+            await asyncio.sleep((delays or {}).get(content, 0.01))
+            if content == "fail":
+                raise RuntimeError("LLM is unavailable")
+            return AIMessage(f"echo: {content}")
+        finally:
+            running[0] -= 1
+
+    llm.ainvoke = AsyncMock(side_effect=_ainvoke)
+    return llm
+
+
+@pytest.mark.asyncio
+async def test_abatch_preserves_order_and_bounds_concurrency(
+    registry: Registry, storage: InMemoryStateStorage
+) -> None:
+    inputs = [f"input {i}" for i in range(6)]
+    in_flight: list[int] = []
+    # earlier inputs finish later
+    delays = {input_: 0.06 - i * 0.01 for i, input_ in enumerate(inputs)}
+    agent = _create_batch_agent(registry, storage, _create_echo_llm(delays, in_flight))
+
+    result = await agent.abatch(inputs, concurrency=2)
+
+    assert [item.input_ for item in result.items] == inputs
+    assert [str(output) for output in result.outputs] == [
+        f"echo: {input_}" for input_ in inputs
+    ]
+    assert max(in_flight) == 2
+    assert len({output.execution_id for output in result.outputs}) == len(inputs)
+    assert len(storage.actor_states) == len(inputs)
+    assert agent._executor is None
+
+    assert result.stats.items == 6
+    assert result.stats.succeeded == 6
+    assert result.stats.failed == 0
+    assert result.stats.items_per_second > 0
+    assert result.stats.cost is None
+
+
+@pytest.mark.asyncio
+async def test_abatch_returns_errors_per_item(
+    registry: Registry, storage: InMemoryStateStorage
+) -> None:
+    agent = _create_batch_agent(registry, storage, _create_echo_llm())
+
+    result = await agent.abatch(["first", "fail", "last"], concurrency=3)
+
+    first, failed, last = result.items
+    assert first.ok and str(first.output) == "echo: first"
+    assert last.ok and str(last.output) == "echo: last"
+    assert not failed.ok
+    assert failed.error == "Node execution failed: LLM is unavailable"
+    assert failed.output.error_type == "NodeActorError"
+    assert (result.stats.succeeded, result.stats.failed) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_abatch_returns_start_errors_per_item(
+    registry: Registry, storage: InMemoryStateStorage
+) -> None:
+    agent = _create_batch_agent(registry, storage, _create_echo_llm())
+    create_executor = agent._create_executor
+
+    async def _create_executor(input_: Any, **kwargs: Any) -> Executor:
+        if input_.node_input == "broken":
+            raise OSError("State storage is unavailable")
+        return await create_executor(input_, **kwargs)
+
+    with patch.object(agent, "_create_executor", side_effect=_create_executor):
+        result = await agent.abatch(["first", "broken", "last"], concurrency=1)
+
+    first, broken, last = result.items
+    assert first.ok and last.ok
+    assert broken.error == "State storage is unavailable"
+    assert broken.output.error_type == "OSError"
+    assert broken.output.node_full_name == "LLMNode/start"
+    assert (result.stats.succeeded, result.stats.failed) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_abatch_timeout_cancels_item(
+    registry: Registry, storage: InMemoryStateStorage
+) -> None:
+    agent = _create_batch_agent(registry, storage, _create_echo_llm({"slow": 10}))
+
+    result = await asyncio.wait_for(
+        agent.abatch(["slow", "fast"], concurrency=2, timeout=0.1), 1
+    )
+
+    slow, fast = result.items
+    assert slow.error == "Batch item timed out after 0.1 seconds"
+    assert slow.output.error_type == "CancelledError"
+    assert fast.ok
+
+
+@pytest.mark.asyncio
+async def test_abatch_empty_and_invalid_concurrency(
+    registry: Registry, storage: InMemoryStateStorage
+) -> None:
+    agent = _create_batch_agent(registry, storage, _create_echo_llm())
+
+    result = await agent.abatch([])
+    assert result.items == []
+    assert result.stats.items == 0
+
+    with pytest.raises(ValueError, match="concurrency must be positive"):
+        await agent.abatch(["Hi"], concurrency=0)
@@ -0,0 +1,43 @@
+import json
+import subprocess
+import sys
+
+# ~350 modules, ~900 with the heavy dependencies, the wall time budget
+# is checked by liman_core/benchmarks/bench_import_time.py
+IMPORT_MODULES_BUDGET = 500
+# loaded only to print specs, load YAML, parse the DSL or call a model
+LAZY_DEPENDENCIES = (
+    "langchain_core.language_models",
+    "langsmith",
+    "lark",
+    "rich",
+    "ruamel",
+)
+
+
+def _imported_modules(module: str) -> set[str]:
+    """
+    Import the module in a fresh interpreter
+
+    Returns:
+        Modules imported with it
+    """
+    code = (
+        "import json, sys\n"
+        "before = set(sys.modules)\n"
+        f"import {module}\n"
+        "print(json.dumps(sorted(set(sys.modules) - before)))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return set(json.loads(result.stdout))
+
+
+def test_import_liman_budget() -> None:
+    modules = _imported_modules("liman")
+
+    assert len(modules) < IMPORT_MODULES_BUDGET
+
+    loaded = [name for name in LAZY_DEPENDENCIES if name in modules]
+    assert loaded == []
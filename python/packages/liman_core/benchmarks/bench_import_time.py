@@ -0,0 +1,114 @@
+"""
+Benchmark of the cold start of liman packages.
+
+Every module is imported in a fresh interpreter several times, the median
+wall time, the number of imported modules and the heavy dependencies loaded
+on import are reported, as well as the self import time of the DSL grammar
+module. The exit status is 1 if a time budget is exceeded.
+
+    python benchmarks/bench_import_time.py [module ...]
+
+Without arguments `liman_core`, `liman_core.node_actor.actor` and `liman`
+are measured.
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+
+MODULES = ("liman_core", "liman_core.node_actor.actor", "liman")
+# loaded only to print specs, load YAML, parse the DSL or call a model
+HEAVY_MODULES = (
+    "langchain_core.language_models",
+    "langsmith",
+    "lark",
+    "rich",
+    "ruamel.yaml",
+)
+RUNS = 7
+# ~0.4s on a developer machine, ~1.3s with the heavy dependencies
+IMPORT_BUDGET_SECONDS = 1.0
+# parser tables generation alone takes ~50ms, the module itself well below it
+GRAMMAR_IMPORT_BUDGET_US = 20_000
+
+MEASURE_CODE = """
+import json, sys, time
+before = set(sys.modules)
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "modules": len(set(sys.modules) - before),
+    "heavy": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure(module: str) -> tuple[float, int, list[str]]:
+    code = MEASURE_CODE.format(module=module, heavy=HEAVY_MODULES)
+    runs = []
+    for _ in range(RUNS):
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        runs.append(json.loads(result.stdout))
+    return (
+        statistics.median(run["seconds"] for run in runs),
+        runs[-1]["modules"],
+        runs[-1]["heavy"],
+    )
+
+
+def measure_grammar_self_time() -> int:
+    """
+    Median self import time of the DSL grammar module in microseconds,
+    reported by `-X importtime`
+    """
+    runs = []
+    for _ in range(RUNS):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                "import liman_core.edge.dsl.grammar",
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        for line in result.stderr.splitlines():
+            if line.rstrip().endswith("liman_core.edge.dsl.grammar"):
+                runs.append(int(line.removeprefix("import time:").split("|")[0]))
+                break
+    return int(statistics.median(runs))
+
+
+def main() -> int:
+    over_budget = False
+    for module in sys.argv[1:] or MODULES:
+        seconds, modules, heavy = measure(module)
+        over_budget = over_budget or seconds > IMPORT_BUDGET_SECONDS
+        print(
+            f"{module:<32} {seconds * 1000:8.1f} ms {modules:6d} modules  "
+            f"heavy: {', '.join(heavy) or '-'}"
+        )
+
+    grammar_us = measure_grammar_self_time()
+    over_budget = over_budget or grammar_us > GRAMMAR_IMPORT_BUDGET_US
+    print(f"{'liman_core.edge.dsl.grammar':<32} {grammar_us / 1000:8.1f} ms self")
+
+    if over_budget:
+        print(
+            f"over budget: {IMPORT_BUDGET_SECONDS}s per module, "
+            f"{GRAMMAR_IMPORT_BUDGET_US / 1000}ms of the grammar module"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
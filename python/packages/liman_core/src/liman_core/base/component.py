@@ -9,10 +9,6 @@ from typing import TYPE_CHECKING, Any, Generic, TypeAlias, TypeVar
 from uuid import UUID, uuid4
 
 from pydantic import Field, create_model
-from rich import print as rich_print
-from rich.syntax import Syntax
-from ruamel.yaml import YAML
-from ruamel.yaml.scalarstring import PreservedScalarString
 
 from liman_core.base.schemas import S
 from liman_core.errors import InvalidSpecError
@@ -123,6 +119,8 @@ class Component(Generic[S], ABC):
         Returns:
             Component: An instance of Component initialized with the YAML data.
         """
+        from ruamel.yaml import YAML
+
         yaml_path_str = str(yaml_path)
         yaml = YAML()
         with open(yaml_path_str, encoding="utf-8") as fd:
@@ -196,6 +194,11 @@ class Component(Generic[S], ABC):
         Args:
             raw (bool): If True, print the raw declaration; otherwise, print the validated spec.
         """
+        # rich and ruamel are loaded only to print the spec
+        from rich import print as rich_print
+        from rich.syntax import Syntax
+        from ruamel.yaml import YAML
+
         yaml = YAML()
         yaml.indent(mapping=2, sequence=4, offset=2)
         yaml.preserve_quotes = True
@@ -228,6 +231,8 @@ def _preserve_multiline_strings(data: YamlValue | None) -> YamlValue | None:
     Recursively convert multiline strings to PreservedScalarString
     so that YAML dumps them as block scalars (|).
     """
+    from ruamel.yaml.scalarstring import PreservedScalarString
+
     if data is None:
         return None
 
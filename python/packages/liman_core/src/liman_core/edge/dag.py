@@ -0,0 +1,77 @@
+from collections.abc import Sequence
+
+from liman_core.edge.schemas import EdgeSpec
+from liman_core.errors import InvalidSpecError
+
+
+def validate_edges_dependencies(edges: Sequence[EdgeSpec]) -> None:
+    """
+    Validate `depends` references between edges of the same node.
+
+    Every id listed in `depends` must point to another edge of the node
+    and the dependencies must form a DAG.
+
+    Args:
+        edges: Edges declared by a single node
+
+    Raises:
+        InvalidSpecError: If ids are duplicated, a dependency is unknown
+            or dependencies form a cycle
+    """
+    edges_by_id: dict[str, EdgeSpec] = {}
+    for edge in edges:
+        if not edge.id_:
+            continue
+        if edge.id_ in edges_by_id:
+            raise InvalidSpecError(f"Duplicate edge id '{edge.id_}'")
+        edges_by_id[edge.id_] = edge
+
+    for edge in edges:
+        for dep in edge.depends or []:
+            if dep not in edges_by_id:
+                raise InvalidSpecError(
+                    f"Edge to '{edge.target}' depends on unknown edge id '{dep}'"
+                )
+
+    # 0 - not visited, 1 - in progress, 2 - done
+    marks: dict[str, int] = {}
+
+    def visit(edge_id: str, path: list[str]) -> None:
+        mark = marks.get(edge_id, 0)
+        if mark == 2:
+            return
+        if mark == 1:
+            cycle = " -> ".join([*path[path.index(edge_id) :], edge_id])
+            raise InvalidSpecError(f"Edge dependencies form a cycle: {cycle}")
+
+        marks[edge_id] = 1
+        for dep in edges_by_id[edge_id].depends or []:
+            visit(dep, [*path, edge_id])
+        marks[edge_id] = 2
+
+    for edge_id in edges_by_id:
+        visit(edge_id, [])
+
+
+def prune_unsatisfied_edges(edges: Sequence[EdgeSpec]) -> list[EdgeSpec]:
+    """
+    Drop edges which can't be joined because one of their dependencies
+    is not followed, e.g. its `when` condition evaluated to false.
+
+    Pruning is transitive: an edge depending on a pruned edge is pruned too.
+
+    Args:
+        edges: Edges selected to be followed
+
+    Returns:
+        Edges whose dependencies are all satisfied, in the original order
+    """
+    selected = list(edges)
+    while True:
+        ids = {edge.id_ for edge in selected if edge.id_}
+        pruned = [
+            edge for edge in selected if all(dep in ids for dep in edge.depends or [])
+        ]
+        if len(pruned) == len(selected):
+            return pruned
+        selected = pruned
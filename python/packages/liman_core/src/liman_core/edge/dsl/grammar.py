@@ -1,4 +1,14 @@
-from lark import Lark
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from lark import Lark
 
 when_grammar = r"""
     ?start: when_expr
@@ -47,4 +57,60 @@ when_grammar = r"""
     %ignore WS
 """
 
-when_parser = Lark(when_grammar, start="start", parser="lalr")
+
+@cache
+def get_when_parser() -> Lark:
+    """
+    Get the parser of `when` expressions, built on the first call.
+
+    The LALR tables are persisted with the Lark cache and loaded on the next
+    start instead of being generated again, see `get_parser_cache_path`.
+    """
+    from lark import Lark
+
+    cache_path = get_parser_cache_path()
+    if cache_path is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            cache_path = None
+
+    return Lark(
+        when_grammar,
+        start="start",
+        parser="lalr",
+        cache=str(cache_path) if cache_path is not None else False,
+    )
+
+
+def get_parser_cache_path() -> Path | None:
+    """
+    Get the path of the persisted parser tables.
+
+    Files are stored in `$LIMAN_CACHE_DIR`, `$XDG_CACHE_HOME/liman` or
+    `~/.cache/liman`, an empty `LIMAN_CACHE_DIR` disables the cache. The name
+    is versioned by the grammar, Lark and Python versions, so installations
+    sharing the directory don't overwrite the tables of each other. A stale
+    or broken file is ignored by Lark and the tables are generated again.
+    """
+    from lark import __version__ as lark_version
+
+    cache_dir = os.getenv("LIMAN_CACHE_DIR")
+    if cache_dir == "":
+        return None
+    if cache_dir is None:
+        cache_home = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+        cache_dir = str(Path(cache_home) / "liman")
+
+    grammar_hash = hashlib.sha256(when_grammar.encode()).hexdigest()[:16]
+    python_version = "{}{}".format(*sys.version_info[:2])
+    return Path(cache_dir) / (
+        f"when_parser-{grammar_hash}-lark{lark_version}-py{python_version}.lark"
+    )
+
+
+def __getattr__(name: str) -> Any:
+    # the parser was a module attribute, it's kept for compatibility
+    if name == "when_parser":
+        return get_when_parser()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,61 +1,38 @@
-from enum import Enum
-from typing import Literal, NamedTuple
-
 from lark import Token, Transformer, v_args
 
-
-# Type aliases for DSL AST nodes
-# ("var", "variable_name")
-class VarNode(NamedTuple):
-    type_: Literal["var"]
-    name: str
-
-
-BoolNode = bool
-NumberNode = float
-StringNode = str
-ValueNode = BoolNode | NumberNode | StringNode | VarNode
-
-
-# ("==", operand, operand) - both sides can be variables or values
-class ComparisonNode(NamedTuple):
-    type_: Literal["==", "!=", ">", "<"]
-    left: ValueNode
-    right: ValueNode
-
-
-# ("and", expr1, expr2)
-class LogicalNode(NamedTuple):
-    type_: Literal["and", "or", "&&", "||"]
-    left: "ExprNode"
-    right: "ExprNode"
-
-
-# ("not", expr)
-class NotNode(NamedTuple):
-    type_: Literal["not"]
-    expr: "ExprNode"
-
-
-ExprNode = ComparisonNode | LogicalNode | NotNode | ValueNode
-
-
-class ExprType(str, Enum):
-    LIMAN_CE = "liman_ce"
-    FUNCTION_REF = "function_ref"
-
-
-class ConditionalExprNode(NamedTuple):
-    type_: Literal[ExprType.LIMAN_CE]
-    expr: ExprNode
-
-
-class FunctionRefNode(NamedTuple):
-    type_: Literal[ExprType.FUNCTION_REF]
-    dotted_name: str
-
-
-WhenExprNode = ConditionalExprNode | FunctionRefNode
+from liman_core.edge.dsl.schemas import (
+    BoolNode,
+    ComparisonNode,
+    ConditionalExprNode,
+    ExprNode,
+    ExprType,
+    FunctionRefNode,
+    LogicalNode,
+    NotNode,
+    NumberNode,
+    StringNode,
+    ValueNode,
+    VarNode,
+    WhenExprNode,
+)
+
+# AST nodes moved to schemas, re-exported for compatibility
+__all__ = [
+    "BoolNode",
+    "ComparisonNode",
+    "ConditionalExprNode",
+    "ExprNode",
+    "ExprType",
+    "FunctionRefNode",
+    "LogicalNode",
+    "NotNode",
+    "NumberNode",
+    "StringNode",
+    "ValueNode",
+    "VarNode",
+    "WhenExprNode",
+    "WhenTransformer",
+]
 
 
 @v_args(inline=True)
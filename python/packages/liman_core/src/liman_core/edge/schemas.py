@@ -8,3 +8,6 @@ class EdgeSpec(BaseModel):
     when: str | None = None
     id_: Annotated[str | None, Field(alias="id", default=None)] = None
     depends: list[str] | None = None
+    # edges of a group are a switch: only the first matching edge is followed,
+    # edges without a group are all followed when their conditions match
+    group: str | None = None
@@ -23,6 +23,12 @@ class InvalidSpecError(LimanError):
     code: str = "invalid_spec"
 
 
+class NodeTimeoutError(LimanError):
+    """Raised when a node execution exceeds its timeout."""
+
+    code: str = "node_timeout"
+
+
 class ComponentNotFoundError(LimanError):
     """Raised when a component is not found in the registry."""
 
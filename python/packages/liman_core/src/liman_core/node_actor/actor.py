@@ -5,20 +5,31 @@ import logging
 import sys
 from collections.abc import Callable, Coroutine
 from inspect import iscoroutinefunction
-from typing import Any, Generic, TypedDict, TypeVar, cast
+from typing import TYPE_CHECKING, Any, Generic, TypedDict, TypeVar, cast
 from uuid import UUID, uuid4
 
-from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.messages import HumanMessage, ToolMessage
+from langchain_core.messages import (
+    AIMessageChunk,
+    BaseMessageChunk,
+    HumanMessage,
+    ToolMessage,
+    message_chunk_to_message,
+)
 
 from liman_core.base.schemas import S
 from liman_core.conf import settings
-from liman_core.edge.dsl.grammar import when_parser
-from liman_core.edge.dsl.transformer import WhenTransformer
+from liman_core.edge.dag import prune_unsatisfied_edges, validate_edges_dependencies
 from liman_core.edge.schemas import EdgeSpec
-from liman_core.node_actor.conditional_evaluator import ConditionalEvaluator
+from liman_core.errors import InvalidSpecError
+from liman_core.node_actor.conditional_evaluator import (
+    ConditionalEvaluator,
+    compile_condition,
+    diagnose_edges,
+)
 from liman_core.node_actor.errors import NodeActorError
 from liman_core.node_actor.schemas import (
+    EdgeDiagnostic,
+    EdgeDiagnosticKind,
     NextNode,
     NodeActorStatus,
     Result,
@@ -30,6 +41,7 @@ from liman_core.nodes.base.schemas import (
     LangChainMessage,
 )
 from liman_core.nodes.function_node.node import FunctionNode
+from liman_core.nodes.llm_node.cache import LLMCache
 from liman_core.nodes.llm_node.node import LLMNode
 from liman_core.nodes.llm_node.schemas import LLMNodeState
 from liman_core.nodes.node.node import Node
@@ -38,6 +50,9 @@ from liman_core.nodes.tool_node.node import ToolNode
 from liman_core.nodes.tool_node.schemas import ToolCall, ToolNodeState
 from liman_core.utils import to_snake_case
 
+if TYPE_CHECKING:
+    from langchain_core.language_models.chat_models import BaseChatModel
+
 if sys.version_info >= (3, 11):
     from typing import Self
 else:
@@ -88,6 +103,9 @@ PostExecutionHook = Callable[
 ]
 
 
+ChunkHandler = Callable[[AIMessageChunk], Coroutine[None, None, None]]
+
+
 class NodeActor(Generic[T]):
     """
     Unified NodeActor supporting both sync and async execution
@@ -101,14 +119,22 @@ class NodeActor(Generic[T]):
         node: T,
         actor_id: UUID | None = None,
         llm: BaseChatModel | None = None,
+        memory_llm: BaseChatModel | None = None,
+        llm_cache: LLMCache | None = None,
     ):
         self.id = actor_id or uuid4()
         self.llm = llm
+        self.memory_llm = memory_llm
+        self.llm_cache = llm_cache
         self.node = node
         self.node_state = node.get_new_state()
 
         self.status = NodeActorStatus.IDLE
         self.error: NodeActorError | None = None
+        # issues of the edge conditions, found statically or while evaluated
+        self.diagnostics: list[EdgeDiagnostic] = []
+        # (edge, error type) of the evaluation errors already reported
+        self._reported_errors: set[tuple[int, type[Exception]]] = set()
 
         self._execution_lock = asyncio.Lock()
 
@@ -155,6 +181,8 @@ class NodeActor(Generic[T]):
         node: T,
         actor_id: UUID | None = None,
         llm: BaseChatModel | None = None,
+        memory_llm: BaseChatModel | None = None,
+        llm_cache: LLMCache | None = None,
     ) -> Self:
         """
         Create a NodeActor instance from a node.
@@ -163,11 +191,20 @@ class NodeActor(Generic[T]):
             node: The node to wrap in this actor
             actor_id: Optional custom actor ID
             llm: Optional LLM instance for LLMNodes
+            memory_llm: Optional LLM summarizing conversation memory,
+                `llm` is used if not provided
+            llm_cache: Optional cache of LLM responses
 
         Returns:
             Configured NodeActor instance
         """
-        actor = cls(node=node, actor_id=actor_id, llm=llm)
+        actor = cls(
+            node=node,
+            actor_id=actor_id,
+            llm=llm,
+            memory_llm=memory_llm,
+            llm_cache=llm_cache,
+        )
         return actor
 
     @classmethod
@@ -176,6 +213,8 @@ class NodeActor(Generic[T]):
         node: T,
         state: dict[str, Any] | None,
         llm: BaseChatModel | None = None,
+        memory_llm: BaseChatModel | None = None,
+        llm_cache: LLMCache | None = None,
     ) -> Self:
         """
         Create a new NodeActor or restore from saved state
@@ -184,17 +223,27 @@ class NodeActor(Generic[T]):
             node: The node to wrap in this actor
             state: Saved state to restore
             llm: Optional LLM instance for LLMNodes
+            memory_llm: Optional LLM summarizing conversation memory
+            llm_cache: Optional cache of LLM responses
 
         Returns:
             NodeActor instance (new or restored)
         """
         if state and cls.can_restore(node, state):
             actor_id = UUID(state["actor_id"])
-            actor = cls(node=node, actor_id=actor_id, llm=llm)
+            actor = cls(
+                node=node,
+                actor_id=actor_id,
+                llm=llm,
+                memory_llm=memory_llm,
+                llm_cache=llm_cache,
+            )
             actor._restore_state(state)
             return actor
         else:
-            return cls.create(node=node, llm=llm)
+            return cls.create(
+                node=node, llm=llm, memory_llm=memory_llm, llm_cache=llm_cache
+            )
 
     def add_pre_hook(self, hook: PreExecutionHook[T]) -> None:
         """
@@ -219,6 +268,8 @@ class NodeActor(Generic[T]):
         input_: Any,
         execution_id: UUID,
         context: dict[str, Any] | None = None,
+        *,
+        on_chunk: ChunkHandler | None = None,
     ) -> Result:
         """
         Execute the wrapped node with the provided inputs (async version).
@@ -227,6 +278,8 @@ class NodeActor(Generic[T]):
             input_: Input for the node
             context: Additional execution context
             execution_id: Execution tracking ID
+            on_chunk: Optional handler receiving LLM response chunks,
+                enables streaming for LLMNodes
 
         Returns:
             Result from node execution
@@ -241,7 +294,9 @@ class NodeActor(Generic[T]):
 
         context = context or {}
         async with self._execution_lock:
-            return await self._execute_internal(input_, execution_id, context)
+            return await self._execute_internal(
+                input_, execution_id, context, on_chunk=on_chunk
+            )
 
     def serialize_state(self) -> dict[str, Any]:
         """
@@ -268,6 +323,21 @@ class NodeActor(Generic[T]):
             if not self.node._compiled:
                 self.node.compile()
 
+            edges = [edge for _, edge in self._get_node_edges()]
+            if not isinstance(self.node, ToolNode) and any(
+                edge.depends for edge in edges
+            ):
+                # only ToolNode edges are scheduled as a DAG
+                raise InvalidSpecError(
+                    f"Edge depends is supported only by ToolNode edges, "
+                    f"{self.node.spec.kind} '{self.node.name}' declares it"
+                )
+            validate_edges_dependencies(edges)
+            # compiles the conditions, so invalid ones fail here
+            self.diagnostics = diagnose_edges(edges)
+            for diagnostic in self.diagnostics:
+                self.logger.warning(diagnostic.message)
+
             for plugin in self.node.registry.get_plugins(self.node.spec.kind):
                 plugin.apply(self)
 
@@ -279,7 +349,12 @@ class NodeActor(Generic[T]):
             raise self.error from e
 
     async def _execute_internal(
-        self, input_: Any, execution_id: UUID, context: dict[str, Any]
+        self,
+        input_: Any,
+        execution_id: UUID,
+        context: dict[str, Any],
+        *,
+        on_chunk: ChunkHandler | None = None,
     ) -> Result:
         self.status = NodeActorStatus.EXECUTING
 
@@ -304,7 +379,7 @@ class NodeActor(Generic[T]):
             )
 
             if isinstance(self.node, LLMNode):
-                node_output = await self._execute_llm_node(**kwargs)
+                node_output = await self._execute_llm_node(**kwargs, on_chunk=on_chunk)
             elif isinstance(self.node, ToolNode):
                 node_output = await self._execute_tool_node(
                     kwargs["input_"], execution_context
@@ -322,7 +397,7 @@ class NodeActor(Generic[T]):
                 f"NodeActor completed {self.node.full_name} with output: {node_output}"
             )
 
-            next_nodes = self._get_next_nodes(node_output)
+            next_nodes = await self._get_next_nodes(node_output)
             self.logger.debug(f"Next nodes to execute: {next_nodes}")
 
             data: PostHookData = {
@@ -350,7 +425,9 @@ class NodeActor(Generic[T]):
             )
             raise self.error from e
 
-    async def _execute_llm_node(self, input_: Any, **kwargs: Any) -> LangChainMessage:
+    async def _execute_llm_node(
+        self, input_: Any, on_chunk: ChunkHandler | None = None, **kwargs: Any
+    ) -> LangChainMessage:
         if not self.llm:
             raise create_error(
                 "LLM required for LLMNode execution but not provided", self
@@ -378,12 +455,52 @@ class NodeActor(Generic[T]):
                 f"Unsupported input type {type(input_)} for LLMNode", self
             )
 
-        node_output = await self.node.invoke(self.llm, [*node_state.messages, *inputs])
+        messages = [*node_state.messages, *inputs]
+        if self.node.memory:
+            compaction = await self.node.memory.acompact(
+                messages, self.memory_llm or self.llm
+            )
+            if compaction.dropped_messages:
+                self.logger.debug(
+                    f"Memory dropped {compaction.dropped_messages} messages, "
+                    f"saved ~{compaction.tokens_saved} tokens"
+                )
+            messages = compaction.messages
 
-        node_state.messages.extend(inputs)
-        node_state.messages.append(node_output)
+        if on_chunk:
+            node_output = await self._stream_llm_node(self.node, messages, on_chunk)
+        else:
+            node_output = await self.node.invoke(
+                self.llm, messages, cache=self.llm_cache
+            )
+
+        node_state.messages = [*messages, node_output]
         return node_output
 
+    async def _stream_llm_node(
+        self,
+        node: LLMNode,
+        messages: list[LangChainMessage],
+        on_chunk: ChunkHandler,
+    ) -> LangChainMessage:
+        """
+        Stream the LLM response forwarding every chunk to the handler,
+        returns the same message as the non-streaming execution
+        """
+        if not self.llm:
+            raise create_error(
+                "LLM required for LLMNode execution but not provided", self
+            )
+
+        output_chunk: BaseMessageChunk | None = None
+        async for chunk in node.astream(self.llm, messages, cache=self.llm_cache):
+            output_chunk = chunk if output_chunk is None else output_chunk + chunk
+            await on_chunk(chunk)
+
+        if output_chunk is None:
+            raise create_error("LLM stream finished without any chunk", self)
+        return cast(LangChainMessage, message_chunk_to_message(output_chunk))
+
     async def _execute_tool_node(
         self, input_: Any, execution_context: ExecutionContext[ToolNodeState]
     ) -> ToolMessage:
@@ -413,7 +530,7 @@ class NodeActor(Generic[T]):
 
     # State synchronization privatemethods
 
-    def _get_next_nodes(
+    async def _get_next_nodes(
         self, output: LangChainMessage | ToolMessage | dict[str, Any] | None
     ) -> list[NextNode]:
         """
@@ -438,15 +555,19 @@ class NodeActor(Generic[T]):
             return []
 
         context, state_context = self._build_evaluation_context(output)
-        transformer = WhenTransformer()
+        evaluator = ConditionalEvaluator(context, state_context)
 
         # ToolNode supports FunctionNode and LLMNode edges
         if isinstance(self.node, ToolNode) and edges:
+            node_types = {id(edge): node_type for node_type, edge in edges}
+            followed = await self._get_followed_edges(
+                [edge for _, edge in edges], evaluator
+            )
+
             next_nodes = []
-            for node_type, edge in edges:
-                if self._should_follow_edge(edge, context, state_context, transformer):
-                    target_node = registry.lookup(node_type, edge.target)
-                    next_nodes.append(NextNode(target_node, output))
+            for edge in prune_unsatisfied_edges(followed):
+                target_node = registry.lookup(node_types[id(edge)], edge.target)
+                next_nodes.append(NextNode(target_node, output, edge))
             return next_nodes
 
         return []
@@ -484,27 +605,112 @@ class NodeActor(Generic[T]):
 
         return context, state_data.get("context", {})
 
+    async def _get_followed_edges(
+        self, edges: list[EdgeSpec], evaluator: ConditionalEvaluator
+    ) -> list[EdgeSpec]:
+        """
+        Evaluate the edge conditions.
+
+        Edges without a group are all followed when their conditions match.
+        Edges of a group are evaluated in order until the first match, the
+        rest of the group isn't evaluated. Async predicates of ungrouped edges
+        and different groups are awaited concurrently.
+        """
+        followed: set[int] = set()
+        pending: list[Coroutine[None, None, list[EdgeSpec]]] = []
+        groups: dict[str, list[EdgeSpec]] = {}
+        for edge in edges:
+            if edge.group:
+                groups.setdefault(edge.group, []).append(edge)
+            elif self._is_async_edge(edge):
+                pending.append(self._aselect_edges([edge], evaluator))
+            elif self._should_follow_edge(edge, evaluator):
+                followed.add(id(edge))
+
+        for group_edges in groups.values():
+            if any(self._is_async_edge(edge) for edge in group_edges):
+                pending.append(self._aselect_edges(group_edges, evaluator))
+                continue
+            for edge in group_edges:
+                if self._should_follow_edge(edge, evaluator):
+                    followed.add(id(edge))
+                    break
+
+        if pending:
+            for selected in await asyncio.gather(*pending):
+                followed.update(id(edge) for edge in selected)
+
+        return [edge for edge in edges if id(edge) in followed]
+
+    async def _aselect_edges(
+        self, edges: list[EdgeSpec], evaluator: ConditionalEvaluator
+    ) -> list[EdgeSpec]:
+        """
+        Select the first edge to follow, the edges are awaited one by one
+        """
+        for edge in edges:
+            if await self._ashould_follow_edge(edge, evaluator):
+                return [edge]
+        return []
+
+    def _is_async_edge(self, edge: EdgeSpec) -> bool:
+        if not edge.when:
+            return False
+        try:
+            return compile_condition(edge.when).is_async
+        except InvalidSpecError:
+            # reported when the edge is evaluated
+            return False
+
     def _should_follow_edge(
-        self,
-        edge: EdgeSpec,
-        context: dict[str, Any],
-        state_context: dict[str, Any],
-        transformer: WhenTransformer,
+        self, edge: EdgeSpec, evaluator: ConditionalEvaluator
     ) -> bool:
         """
-        Determine if an edge should be followed based on its conditions
+        Determine if an edge should be followed based on its conditions,
+        an evaluation error is reported as a diagnostic
         """
         if not edge.when:
             return True
 
         try:
-            tree = when_parser.parse(edge.when)
-            ast = transformer.transform(tree)
-            evaluator = ConditionalEvaluator(context, state_context)
-            return evaluator.evaluate(ast)
-        except Exception:
+            return evaluator.evaluate_condition(compile_condition(edge.when))
+        except Exception as e:
+            self._report_evaluation_error(edge, e)
+            return False
+
+    async def _ashould_follow_edge(
+        self, edge: EdgeSpec, evaluator: ConditionalEvaluator
+    ) -> bool:
+        """
+        Determine if an edge with an async predicate should be followed
+        """
+        if not self._is_async_edge(edge):
+            return self._should_follow_edge(edge, evaluator)
+
+        try:
+            return await evaluator.aevaluate(compile_condition(cast(str, edge.when)))
+        except (InvalidSpecError, ValueError) as e:
+            # predicate errors are raised as ValueError
+            self._report_evaluation_error(edge, e)
             return False
 
+    def _report_evaluation_error(self, edge: EdgeSpec, error: Exception) -> None:
+        """
+        Report the evaluation error as a diagnostic once per edge and error type,
+        a condition failing on every execution doesn't grow the diagnostics
+        """
+        message = f"Condition of edge to '{edge.target}' failed: '{edge.when}': {error}"
+        key = (id(edge), type(error))
+        if key in self._reported_errors:
+            self.logger.debug(message)
+            return
+
+        self._reported_errors.add(key)
+        self.diagnostics.append(
+            EdgeDiagnostic(EdgeDiagnosticKind.EVALUATION_ERROR, edge, message)
+        )
+        self.logger.warning(message)
+
     def _prepare_execution_context(
         self, context: dict[str, Any], execution_id: UUID
     ) -> ExecutionContext[Any]:
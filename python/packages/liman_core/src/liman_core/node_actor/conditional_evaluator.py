@@ -1,7 +1,10 @@
+from collections.abc import Callable, Sequence
+from functools import lru_cache
 from importlib import import_module
-from typing import Any
+from inspect import Parameter, isawaitable, iscoroutinefunction, signature
+from typing import Any, NamedTuple
 
-from liman_core.edge.dsl.transformer import (
+from liman_core.edge.dsl.schemas import (
     ComparisonNode,
     ConditionalExprNode,
     ExprNode,
@@ -12,7 +15,162 @@ from liman_core.edge.dsl.transformer import (
     VarNode,
     WhenExprNode,
 )
+from liman_core.edge.schemas import EdgeSpec
 from liman_core.errors import InvalidSpecError
+from liman_core.node_actor.schemas import EdgeDiagnostic, EdgeDiagnosticKind
+
+# value of an expression depending on the evaluation context
+_UNKNOWN: Any = object()
+
+
+class FunctionRef(NamedTuple):
+    """
+    Predicate of a `when` function reference, resolved once
+    """
+
+    dotted_name: str
+    func: Callable[..., Any]
+    # the predicate is called with the evaluation context
+    takes_context: bool
+    is_async: bool
+
+    def call(self, context: dict[str, Any]) -> Any:
+        """
+        Call the predicate
+
+        Returns:
+            Predicate result, an awaitable if the predicate is async
+        """
+        return self.func(context) if self.takes_context else self.func()
+
+
+class EdgeCondition(NamedTuple):
+    """
+    `when` condition of an edge compiled once: the parsed expression and
+    the resolved function reference
+    """
+
+    when: str
+    expr: WhenExprNode
+    function_ref: FunctionRef | None
+    # value of a condition not depending on the context
+    constant: bool | None = None
+
+    @property
+    def is_async(self) -> bool:
+        return self.function_ref is not None and self.function_ref.is_async
+
+
+@lru_cache(maxsize=1024)
+def compile_condition(when: str) -> EdgeCondition:
+    """
+    Parse the `when` condition and resolve its function reference.
+    Conditions are cached by the expression, every edge is compiled once.
+
+    Raises:
+        InvalidSpecError: If the condition can't be parsed or the function
+            reference can't be imported
+    """
+    # the DSL depends on lark, it's loaded by the first condition
+    from lark.exceptions import LarkError
+
+    from liman_core.edge.dsl.grammar import get_when_parser
+    from liman_core.edge.dsl.transformer import WhenTransformer
+
+    try:
+        expr = WhenTransformer().transform(get_when_parser().parse(when))
+    except LarkError as e:
+        raise InvalidSpecError(f"Invalid edge condition '{when}': {e}") from e
+
+    function_ref = None
+    if isinstance(expr, FunctionRefNode):
+        function_ref = resolve_function_ref(expr.dotted_name)
+    return EdgeCondition(when, expr, function_ref, fold_constant(expr))
+
+
+def fold_constant(expr: WhenExprNode) -> bool | None:
+    """
+    Evaluate the condition statically, e.g. `1 == 1` or `x or true`
+
+    Returns:
+        Value of the condition or None if it depends on the context
+    """
+    if not isinstance(expr, ConditionalExprNode):
+        return None
+    value = _fold(expr.expr)
+    return None if value is _UNKNOWN else bool(value)
+
+
+def diagnose_edges(edges: Sequence[EdgeSpec]) -> list[EdgeDiagnostic]:
+    """
+    Find edges whose conditions never change: always true or false ones and
+    edges of a group following one which always matches.
+
+    Raises:
+        InvalidSpecError: If a condition can't be compiled
+    """
+    diagnostics: list[EdgeDiagnostic] = []
+    # group -> the edge always matching in it
+    matched_groups: dict[str, EdgeSpec] = {}
+    for edge in edges:
+        if edge.group and (matched := matched_groups.get(edge.group)):
+            diagnostics.append(
+                EdgeDiagnostic(
+                    EdgeDiagnosticKind.UNREACHABLE,
+                    edge,
+                    f"Edge to '{edge.target}' is never followed, edge to "
+                    f"'{matched.target}' of group '{edge.group}' always matches",
+                )
+            )
+            continue
+
+        constant = compile_condition(edge.when).constant if edge.when else True
+        if constant is None:
+            continue
+        if edge.when:
+            state = "true" if constant else "false"
+            diagnostics.append(
+                EdgeDiagnostic(
+                    EdgeDiagnosticKind.ALWAYS_TRUE
+                    if constant
+                    else EdgeDiagnosticKind.ALWAYS_FALSE,
+                    edge,
+                    f"Condition of edge to '{edge.target}' is always {state}: "
+                    f"'{edge.when}'",
+                )
+            )
+        if constant and edge.group:
+            matched_groups[edge.group] = edge
+    return diagnostics
+
+
+def resolve_function_ref(dotted_name: str) -> FunctionRef:
+    """
+    Import the predicate the reference points to.
+
+    A predicate takes no arguments or the evaluation context with `$output`,
+    `$status` and `$state`, it may be async.
+
+    Raises:
+        InvalidSpecError: If the function can't be imported
+    """
+    try:
+        module_name, func_name = dotted_name.rsplit(".", 1)
+        func = getattr(import_module(module_name), func_name)
+    except (ImportError, AttributeError, ValueError) as e:
+        raise InvalidSpecError(
+            f"Failed to import or execute function '{dotted_name}': {e}"
+        ) from e
+
+    try:
+        takes_context = any(
+            param.kind != Parameter.KEYWORD_ONLY
+            for param in signature(func).parameters.values()
+        )
+    except (TypeError, ValueError):
+        # builtins without a signature are called without arguments
+        takes_context = False
+    return FunctionRef(dotted_name, func, takes_context, iscoroutinefunction(func))
 
 
 class ConditionalEvaluator:
@@ -35,6 +193,36 @@ class ConditionalEvaluator:
             case FunctionRefNode(dotted_name=dotted_name):
                 return self._evaluate_function_ref(dotted_name)
 
+    async def aevaluate(self, condition: EdgeCondition) -> bool:
+        """
+        Evaluate a compiled condition, async predicates are awaited
+        """
+        if condition.constant is not None:
+            return condition.constant
+        if condition.function_ref is None:
+            return self.evaluate(condition.expr)
+
+        function_ref = condition.function_ref
+        try:
+            result = function_ref.call(self.context)
+            if isawaitable(result):
+                result = await result
+            return bool(result)
+        except Exception as e:
+            raise ValueError(
+                f"Function execution failed '{function_ref.dotted_name}': {e}"
+            ) from e
+
+    def evaluate_condition(self, condition: EdgeCondition) -> bool:
+        """
+        Evaluate a compiled condition with a sync predicate
+        """
+        if condition.constant is not None:
+            return condition.constant
+        if condition.function_ref is None:
+            return self.evaluate(condition.expr)
+        return self._call_function_ref(condition.function_ref)
+
     def _evaluate_conditional(self, expr: ExprNode) -> bool:
         """
         Evaluate a conditional expression using pattern matching
@@ -74,18 +262,7 @@ class ConditionalEvaluator:
         """
         left_val = self._resolve_operand(comp_node.left)
         right_val = self._resolve_operand(comp_node.right)
-
-        match comp_node.type_:
-            case "==":
-                return bool(left_val == right_val)
-            case "!=":
-                return bool(left_val != right_val)
-            case ">":
-                return bool(left_val > right_val)
-            case "<":
-                return bool(left_val < right_val)
-            case _:
-                raise ValueError(f"Unknown comparison operator: {comp_node.type_}")
+        return _compare(comp_node.type_, left_val, right_val)
 
     def _evaluate_logical(self, logical_node: LogicalNode) -> bool:
         """
@@ -118,19 +295,19 @@ class ConditionalEvaluator:
         """
         Evaluate a function reference by importing and executing it
         """
-        try:
-            func_path = func_ref.split(".")
-            module = import_module(".".join(func_path[:-1]))
-            func = getattr(module, func_path[-1])
+        return self._call_function_ref(resolve_function_ref(func_ref))
 
-            result = func()
-            return bool(result)
-        except (ImportError, AttributeError) as e:
-            raise InvalidSpecError(
-                f"Failed to import or execute function '{func_ref}': {e}"
-            ) from e
+    def _call_function_ref(self, function_ref: FunctionRef) -> bool:
+        if function_ref.is_async:
+            raise ValueError(
+                f"Function '{function_ref.dotted_name}' is async, use aevaluate"
+            )
+        try:
+            return bool(function_ref.call(self.context))
         except Exception as e:
-            raise ValueError(f"Function execution failed '{func_ref}': {e}") from e
+            raise ValueError(
+                f"Function execution failed '{function_ref.dotted_name}': {e}"
+            ) from e
 
     def _resolve_variable(self, var_name: str) -> Any:
         """
@@ -150,3 +327,57 @@ class ConditionalEvaluator:
                 raise KeyError(
                     f"Variable '{var_name}' not found in context or state.context"
                 )
+
+
+def _compare(operator: str, left: Any, right: Any) -> bool:
+    match operator:
+        case "==":
+            return bool(left == right)
+        case "!=":
+            return bool(left != right)
+        case ">":
+            return bool(left > right)
+        case "<":
+            return bool(left < right)
+        case _:
+            raise ValueError(f"Unknown comparison operator: {operator}")
+
+
+def _fold(expr: ExprNode) -> Any:
+    """
+    Fold the expression into its value, `_UNKNOWN` if it depends on the context
+    """
+    match expr:
+        case VarNode():
+            return _UNKNOWN
+
+        case bool() | float() | str():
+            return expr
+
+        case NotNode():
+            value = _fold(expr.expr)
+            return value if value is _UNKNOWN else not value
+
+        case ComparisonNode():
+            left, right = _fold(expr.left), _fold(expr.right)
+            if left is _UNKNOWN or right is _UNKNOWN:
+                return _UNKNOWN
+            try:
+                return _compare(expr.type_, left, right)
+            except (TypeError, ValueError):
+                # fails on every evaluation, left to the evaluator
+                return _UNKNOWN
+
+        case LogicalNode() if expr.type_ in ("and", "&&", "or", "||"):
+            left, right = _fold(expr.left), _fold(expr.right)
+            # a constant operand decides the result regardless of the other one
+            decisive = expr.type_ in ("or", "||")
+            values = [value for value in (left, right) if value is not _UNKNOWN]
+            if any(bool(value) is decisive for value in values):
+                return decisive
+            if len(values) < 2:
+                return _UNKNOWN
+            return not decisive
+
+        case _:
+            return _UNKNOWN
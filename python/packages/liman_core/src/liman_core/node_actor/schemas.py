@@ -6,6 +6,7 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict
 
+from liman_core.edge.schemas import EdgeSpec
 from liman_core.nodes.base.node import BaseNode
 from liman_core.nodes.base.schemas import NS
 
@@ -52,7 +53,33 @@ class Result(BaseModel):
 class NextNode(NamedTuple):
     """
     Represents a next node in the execution flow.
+
+    `edge` is set when the node is reached through a declared edge,
+    so the executor can schedule it according to `edge.depends`.
     """
 
     node: BaseNode[Any, Any]
     input_: Any
+    edge: EdgeSpec | None = None
+
+
+class EdgeDiagnosticKind(str, Enum):
+    """
+    Issue of an edge condition found statically or while evaluated
+    """
+
+    ALWAYS_TRUE = "always_true"
+    ALWAYS_FALSE = "always_false"
+    # an earlier edge of the group always matches
+    UNREACHABLE = "unreachable"
+    EVALUATION_ERROR = "evaluation_error"
+
+
+class EdgeDiagnostic(NamedTuple):
+    """
+    Diagnostic of an edge condition, the edge is still valid
+    """
+
+    kind: EdgeDiagnosticKind
+    edge: EdgeSpec
+    message: str
@@ -4,7 +4,7 @@ from collections.abc import Callable
 from typing import Any
 
 from liman_core.dishka import Scope
-from liman_core.errors import LimanError
+from liman_core.errors import LimanError, NodeTimeoutError
 from liman_core.nodes.base.node import BaseNode
 from liman_core.nodes.function_node.schemas import FunctionNodeSpec, FunctionNodeState
 from liman_core.registry import Registry
@@ -95,15 +95,30 @@ class FunctionNode(BaseNode[FunctionNodeSpec, FunctionNodeState]):
 
         Returns:
             Result of function execution
+
+        Raises:
+            NodeTimeoutError: If the function exceeds the spec timeout
         """
         func = self.func
         call_args = self._extract_function_args(input_)
+        timeout = self.spec.timeout
 
         async with self.registry.container(kwargs, scope=Scope.NODE):
-            if asyncio.iscoroutinefunction(func):
-                result = await func(**call_args)
-            else:
-                result = func(**call_args)
+            try:
+                if asyncio.iscoroutinefunction(func):
+                    result = await asyncio.wait_for(func(**call_args), timeout)
+                elif timeout is not None:
+                    # sync function can't be interrupted, it keeps running
+                    # in the thread after the timeout
+                    result = await asyncio.wait_for(
+                        asyncio.to_thread(func, **call_args), timeout
+                    )
+                else:
+                    result = func(**call_args)
+            except asyncio.TimeoutError as e:
+                raise NodeTimeoutError(
+                    f"FunctionNode '{self.name}' timed out after {timeout} seconds"
+                ) from e
         return result
 
     def get_new_state(self) -> FunctionNodeState:
@@ -1,6 +1,7 @@
 from typing import Any, Literal
 
 from langchain_core.messages import BaseMessage
+from pydantic import Field
 
 from liman_core.base.schemas import BaseSpec
 from liman_core.edge.schemas import EdgeSpec
@@ -27,6 +28,9 @@ class FunctionNodeSpec(BaseSpec):
     llm_nodes: list[str | EdgeSpec] = []
     tools: list[str] = []
 
+    # seconds, NodeTimeoutError is raised when the function exceeds it
+    timeout: float | None = Field(default=None, gt=0)
+
 
 class FunctionNodeState(BaseNodeState):
     """
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
+
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+
+from liman_core.nodes.base.schemas import LangChainMessage
+
+if TYPE_CHECKING:
+    from langchain_core.language_models.chat_models import BaseChatModel
+
+# bump to invalidate stored entries when the key or payload format changes
+CACHE_KEY_VERSION = 1
+
+
+def get_llm_cache_key(
+    llm: BaseChatModel,
+    messages: Sequence[BaseMessage],
+    tools: Sequence[dict[str, Any]],
+) -> str:
+    """
+    Build a stable key of the LLM request.
+
+    Only the fields affecting the model response are hashed, so volatile
+    metadata like message ids or token usage doesn't break exact matches.
+
+    Args:
+        llm: Language model the request is sent to
+        messages: Messages of the request including the system one
+        tools: Tool JSON schemas of the request
+
+    Returns:
+        Hex digest identifying the request
+    """
+    payload = {
+        "version": CACHE_KEY_VERSION,
+        "model": llm._get_llm_string(),
+        "messages": [_message_key(message) for message in messages],
+        "tools": list(tools),
+    }
+    data = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+class LLMCache(ABC):
+    """
+    Exact-match cache of LLM responses.
+
+    Entries expire after `ttl` seconds if it's set. Backends store serialized
+    messages, so cached responses can't be mutated by the callers.
+    """
+
+    def __init__(self, ttl: float | None = None) -> None:
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+
+    async def aget(self, key: str) -> LangChainMessage | None:
+        """
+        Get the cached response
+
+        Args:
+            key: Request key, see `get_llm_cache_key`
+
+        Returns:
+            Cached response message or None if it's missing or expired
+        """
+        entry = await self._aread(key)
+        if (
+            entry is not None
+            and self.ttl is not None
+            and (time.time() - entry[0] > self.ttl)
+        ):
+            await self._adelete(key)
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        message = messages_from_dict([json.loads(entry[1])])[0]
+        return cast(LangChainMessage, message)
+
+    async def aset(self, key: str, message: BaseMessage) -> None:
+        """
+        Store the response
+
+        Args:
+            key: Request key, see `get_llm_cache_key`
+            message: Response message of the LLM
+        """
+        await self._awrite(key, time.time(), json.dumps(message_to_dict(message)))
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @abstractmethod
+    async def _aread(self, key: str) -> tuple[float, str] | None:
+        """
+        Read the entry creation time and payload
+        """
+
+    @abstractmethod
+    async def _awrite(self, key: str, created_at: float, payload: str) -> None:
+        """
+        Write the entry
+        """
+
+    @abstractmethod
+    async def _adelete(self, key: str) -> None:
+        """
+        Delete the entry
+        """
+
+
+class InMemoryLLMCache(LLMCache):
+    """
+    In-memory LRU cache of LLM responses
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float | None = None) -> None:
+        super().__init__(ttl=ttl)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def _aread(self, key: str) -> tuple[float, str] | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def _awrite(self, key: str, created_at: float, payload: str) -> None:
+        self._entries[key] = (created_at, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _adelete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+class SQLiteLLMCache(LLMCache):
+    """
+    Persistent cache of LLM responses stored in a SQLite database,
+    survives process restarts and can be shared between processes.
+
+    Expired entries are purged on open and on every write, the oldest
+    entries are evicted above `max_entries`.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        ttl: float | None = None,
+        max_entries: int | None = 10_000,
+    ) -> None:
+        super().__init__(ttl=ttl)
+        self.max_entries = max_entries
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, created_at REAL NOT NULL, payload TEXT NOT NULL"
+                ")"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS llm_cache_created_at "
+                "ON llm_cache (created_at)"
+            )
+            self._purge(conn, time.time())
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            row = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        return int(row[0])
+
+    async def _aread(self, key: str) -> tuple[float, str] | None:
+        return await asyncio.to_thread(self._read, key)
+
+    async def _awrite(self, key: str, created_at: float, payload: str) -> None:
+        await asyncio.to_thread(self._write, key, created_at, payload)
+
+    async def _adelete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _read(self, key: str) -> tuple[float, str] | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT created_at, payload FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _write(self, key: str, created_at: float, payload: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, created_at, payload) "
+                "VALUES (?, ?, ?)",
+                (key, created_at, payload),
+            )
+            self._purge(conn, created_at)
+
+    def _purge(self, conn: sqlite3.Connection, now: float) -> None:
+        """
+        Delete expired entries and the oldest ones above `max_entries`
+        """
+        if self.ttl is not None:
+            conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,)
+            )
+        if self.max_entries is not None:
+            conn.execute(
+                "DELETE FROM llm_cache WHERE key NOT IN ("
+                "SELECT key FROM llm_cache ORDER BY created_at DESC LIMIT ?"
+                ")",
+                (self.max_entries,),
+            )
+
+    def _delete(self, key: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+
+
+def _message_key(message: BaseMessage) -> dict[str, Any]:
+    key: dict[str, Any] = {"type": message.type, "content": message.content}
+    if message.name:
+        key["name"] = message.name
+    if tool_calls := getattr(message, "tool_calls", None):
+        key["tool_calls"] = [
+            {"name": tc["name"], "args": tc["args"], "id": tc["id"]}
+            for tc in tool_calls
+        ]
+    if tool_call_id := getattr(message, "tool_call_id", None):
+        key["tool_call_id"] = tool_call_id
+    return key
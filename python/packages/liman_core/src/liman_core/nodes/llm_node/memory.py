@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING, NamedTuple
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langchain_core.messages.utils import count_tokens_approximately, get_buffer_string
+
+from liman_core.errors import LimanError
+from liman_core.nodes.base.schemas import LangChainMessage
+from liman_core.nodes.llm_node.schemas import MemorySpec
+
+if TYPE_CHECKING:
+    from langchain_core.language_models.chat_models import BaseChatModel
+
+DEFAULT_SUMMARY_PROMPT = (
+    "Summarize the conversation below. Keep facts, decisions, tool results "
+    "and open questions which may be needed to continue it. "
+    "Answer with the summary only."
+)
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+TokenCounter = Callable[[Sequence[BaseMessage]], int]
+
+
+class MemoryCompaction(NamedTuple):
+    """
+    Result of the conversation memory compaction
+    """
+
+    messages: list[LangChainMessage]
+    dropped_messages: int
+    tokens_before: int
+    tokens_after: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(self.tokens_before - self.tokens_after, 0)
+
+
+class ConversationMemory:
+    """
+    Bounds the conversation history of an LLM node according to MemorySpec.
+
+    Messages are grouped in turns first: a HumanMessage with all messages
+    following it up to the next one, so the window never starts with an AI or
+    tool message and a tool call is never sent without its result. When the
+    history exceeds the limits, the newest turns fitting `low_water` of them
+    are kept together with pinned ones, the current turn is kept even if it
+    doesn't fit.
+
+    With `summarize` dropped turns are replaced by a single summary message
+    placed after the pinned turns. The next compaction folds the previous
+    summary into the new one instead of adding another message.
+    """
+
+    def __init__(
+        self,
+        spec: MemorySpec,
+        *,
+        name: str | None = None,
+        token_counter: TokenCounter = count_tokens_approximately,
+    ) -> None:
+        self.spec = spec
+        self.name = name
+        self.token_counter = token_counter
+
+    @property
+    def strategy(self) -> str:
+        return "summary" if self.spec.summarize else "window"
+
+    async def acompact(
+        self,
+        messages: Sequence[LangChainMessage],
+        llm: BaseChatModel | None = None,
+    ) -> MemoryCompaction:
+        """
+        Compact the conversation history.
+
+        Args:
+            messages: Conversation history including the latest input
+            llm: Model used to summarize dropped messages,
+                required if `summarize` is enabled
+
+        Returns:
+            MemoryCompaction with the messages to keep and token statistics
+
+        Raises:
+            LimanError: If summarization is enabled but no model is provided
+        """
+        tokens_before = self.token_counter(messages)
+        if self._fits(len(messages), tokens_before):
+            return MemoryCompaction(list(messages), 0, tokens_before, tokens_before)
+
+        summary = next((m for m in messages if _is_summary(m)), None)
+        turns = _group_turns([m for m in messages if not _is_summary(m)])
+
+        pinned_prefix: list[list[LangChainMessage]] = []
+        pinned_count = 0
+        while turns and pinned_count < self.spec.pinned:
+            turn = turns.pop(0)
+            pinned_prefix.append(turn)
+            pinned_count += len(turn)
+
+        pinned = [_is_pinned(turn) for turn in turns]
+        kept = [False] * len(turns)
+
+        messages_left = _scale(self.spec.max_messages, self.spec.low_water)
+        tokens_left = _scale(self.spec.max_tokens, self.spec.low_water)
+        reserved = [
+            *pinned_prefix,
+            *(t for t, p in zip(turns, pinned, strict=True) if p),
+        ]
+        if summary:
+            reserved.append([summary])
+        for turn in reserved:
+            if messages_left is not None:
+                messages_left -= len(turn)
+            if tokens_left is not None:
+                tokens_left -= self.token_counter(turn)
+
+        for i in reversed(range(len(turns))):
+            if pinned[i]:
+                continue
+
+            turn_tokens = self.token_counter(turns[i])
+            is_current = i == len(turns) - 1
+            fits = (messages_left is None or messages_left >= len(turns[i])) and (
+                tokens_left is None or tokens_left >= turn_tokens
+            )
+            if not fits and not is_current:
+                break
+
+            kept[i] = True
+            if messages_left is not None:
+                messages_left -= len(turns[i])
+            if tokens_left is not None:
+                tokens_left -= turn_tokens
+
+        dropped = [
+            message
+            for turn, keep, pin in zip(turns, kept, pinned, strict=True)
+            if not keep and not pin
+            for message in turn
+        ]
+        if not dropped:
+            return MemoryCompaction(list(messages), 0, tokens_before, tokens_before)
+
+        compacted = [message for turn in pinned_prefix for message in turn]
+        if self.spec.summarize:
+            compacted.append(await self._summarize(dropped, summary, llm))
+        elif summary:
+            compacted.append(summary)
+        compacted.extend(
+            message
+            for turn, keep, pin in zip(turns, kept, pinned, strict=True)
+            if keep or pin
+            for message in turn
+        )
+
+        return MemoryCompaction(
+            compacted, len(dropped), tokens_before, self.token_counter(compacted)
+        )
+
+    def _fits(self, messages: int, tokens: int) -> bool:
+        return (
+            self.spec.max_messages is None or messages <= self.spec.max_messages
+        ) and (self.spec.max_tokens is None or tokens <= self.spec.max_tokens)
+
+    async def _summarize(
+        self,
+        messages: list[LangChainMessage],
+        summary: LangChainMessage | None,
+        llm: BaseChatModel | None,
+    ) -> HumanMessage:
+        if not llm:
+            raise LimanError("LLM is required to summarize conversation memory")
+
+        conversation = get_buffer_string(messages)
+        if summary:
+            conversation = f"{summary.text()}\n\n{conversation}"
+
+        response = await llm.ainvoke(
+            [
+                SystemMessage(
+                    content=self.spec.summary_prompt or DEFAULT_SUMMARY_PROMPT
+                ),
+                HumanMessage(content=conversation),
+            ]
+        )
+        return HumanMessage(
+            content=SUMMARY_PREFIX + response.text(),
+            additional_kwargs={"summary": True},
+        )
+
+
+def _group_turns(
+    messages: Sequence[LangChainMessage],
+) -> list[list[LangChainMessage]]:
+    """
+    Split messages into turns, every turn starts with a HumanMessage except
+    the messages preceding the first one
+    """
+    turns: list[list[LangChainMessage]] = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([message])
+        else:
+            turns[-1].append(message)
+    return turns
+
+
+def _scale(limit: int | None, ratio: float) -> int | None:
+    return None if limit is None else int(limit * ratio)
+
+
+def _is_summary(message: LangChainMessage) -> bool:
+    return bool(message.additional_kwargs.get("summary"))
+
+
+def _is_pinned(turn: list[LangChainMessage]) -> bool:
+    return any(message.additional_kwargs.get("pinned") for message in turn)
@@ -1,22 +1,43 @@
-from collections.abc import Sequence
-from typing import Any, cast
-
-from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.messages import BaseMessage
+from __future__ import annotations
+
+import json
+import math
+from collections.abc import AsyncIterator, Sequence
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, TypeVar, cast
+
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    BaseMessageChunk,
+    SystemMessage,
+    message_chunk_to_message,
+)
+from langchain_core.messages.tool import tool_call_chunk
 
-from liman_core.errors import LimanError
+from liman_core.errors import InvalidSpecError, LimanError
 from liman_core.languages import LanguageCode
 from liman_core.nodes.base.node import BaseNode
 from liman_core.nodes.base.schemas import LangChainMessage
+from liman_core.nodes.llm_node.cache import LLMCache, get_llm_cache_key
+from liman_core.nodes.llm_node.memory import ConversationMemory
+from liman_core.nodes.llm_node.prompt import CompiledPrompt
 from liman_core.nodes.llm_node.schemas import (
     LLMNodeSpec,
     LLMNodeState,
     LLMPrompts,
     LLMPromptsBundle,
 )
+from liman_core.nodes.llm_node.tool_selection import ToolSelector, get_turn_query
 from liman_core.nodes.tool_node.node import ToolNode
 from liman_core.registry import Registry
 
+if TYPE_CHECKING:
+    from langchain_core.language_models.chat_models import BaseChatModel
+
+_V = TypeVar("_V")
+
 
 class LLMNode(BaseNode[LLMNodeSpec, LLMNodeState]):
     """
@@ -33,6 +54,15 @@ class LLMNode(BaseNode[LLMNodeSpec, LLMNodeState]):
     tools:
       - WeatherTool
       - EmailTool
+    memory:
+      max_messages: 20
+      max_tokens: 4000
+      pinned: 1
+      summarize: true
+    tool_selection:
+      top_k: 5
+      pinned:
+        - EmailTool
     ```
 
     Language:
@@ -65,6 +95,9 @@ class LLMNode(BaseNode[LLMNodeSpec, LLMNodeState]):
     __slots__ = BaseNode.__slots__ + (
         "prompts",
         "registry",
+        "memory",
+        "tool_selectors",
+        "compiled_prompts",
     )
 
     spec_type = LLMNodeSpec
@@ -104,6 +137,9 @@ class LLMNode(BaseNode[LLMNodeSpec, LLMNodeState]):
         )
 
         self.registry = registry
+        self.memory: ConversationMemory | None = None
+        self.tool_selectors: dict[LanguageCode, ToolSelector] = {}
+        self.compiled_prompts: dict[LanguageCode, CompiledPrompt] = {}
         self.registry.add(self)
 
     def add_tools(self, tools: list[ToolNode]) -> None:
@@ -125,16 +161,22 @@ class LLMNode(BaseNode[LLMNodeSpec, LLMNodeState]):
         """
         Compile the LLM node for execution.
 
-        Initializes prompts bundle and prepares the node for invocation.
+        Precomputes per-language system messages and tool schemas,
+        initializes conversation memory and tool selection index.
         Must be called before invoke().
 
         Raises:
             LimanError: If the node is already compiled
+            InvalidSpecError: If a pinned tool isn't declared in `tools`
         """
         if self._compiled:
             raise LimanError("LLMNode is already compiled")
 
         self._init_prompts()
+        if self.spec.tool_selection:
+            self._init_tool_selectors()
+        if self.spec.memory:
+            self.memory = ConversationMemory(self.spec.memory, name=self.name)
         self._compiled = True
 
     async def invoke(
@@ -142,6 +184,8 @@ class LLMNode(BaseNode[LLMNodeSpec, LLMNodeState]):
         llm: BaseChatModel,
         inputs: Sequence[BaseMessage],
         lang: LanguageCode | None = None,
+        *,
+        cache: LLMCache | None = None,
         **kwargs: Any,
     ) -> LangChainMessage:
         """
@@ -154,6 +198,8 @@ class LLMNode(BaseNode[LLMNodeSpec, LLMNodeState]):
             llm: Language model instance to use for generation
             inputs: Sequence of input messages for the conversation
             lang: Language code for prompt selection (uses default_lang if None)
+            cache: Optional cache returning stored responses for identical
+                requests instead of calling the LLM
             **kwargs: Additional arguments passed to LLM invocation
 
         Returns:
@@ -167,31 +213,74 @@ class LLMNode(BaseNode[LLMNodeSpec, LLMNodeState]):
                 "LLMNode must be compiled before invoking. Use `compile()` method."
             )
 
-        lang = lang or self.default_lang
+        system_message, tools_jsonschema = self._prepare_request(lang, inputs)
+        messages = [system_message, *inputs]
 
-        system_message = self.prompts.to_system_message(lang)
-        tools_jsonschema = []
-        tools: dict[str, ToolNode] = {}
-
-        for tool in self.spec.tools:
-            tool_node = self.registry.lookup(ToolNode, tool)
-            if not tool_node:
-                raise LimanError(f"Tool {tool} isn't found in registry")
-
-            tool_jsonschema = tool_node.get_json_schema(lang)
-            tools_jsonschema.append(tool_jsonschema)
-            tools[tool_node.name] = tool_node
-
-        response = await llm.ainvoke(
-            [
-                system_message,
-                *inputs,
-            ],
-            tools=tools_jsonschema,
-        )
+        cache_key = None
+        if cache is not None:
+            cache_key = get_llm_cache_key(llm, messages, tools_jsonschema)
+            if cached := await cache.aget(cache_key):
+                return cached
+
+        response = await llm.ainvoke(messages, tools=tools_jsonschema)
 
+        if cache is not None and cache_key:
+            await cache.aset(cache_key, response)
         return cast(LangChainMessage, response)
 
+    async def astream(
+        self,
+        llm: BaseChatModel,
+        inputs: Sequence[BaseMessage],
+        lang: LanguageCode | None = None,
+        *,
+        cache: LLMCache | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[AIMessageChunk]:
+        """
+        Execute the LLM node with given inputs and stream the response.
+
+        Builds the same request as invoke() but uses the model's `astream`,
+        yielding response chunks as they arrive. Chunks can be summed up
+        to get the final message.
+
+        Args:
+            llm: Language model instance to use for generation
+            inputs: Sequence of input messages for the conversation
+            lang: Language code for prompt selection (uses default_lang if None)
+            cache: Optional cache, a stored response is yielded as a single chunk
+            **kwargs: Additional arguments passed to LLM invocation
+
+        Yields:
+            Response message chunks from the language model
+
+        Raises:
+            LimanError: If node is not compiled or tool is not found in registry
+        """
+        if not self._compiled:
+            raise LimanError(
+                "LLMNode must be compiled before streaming. Use `compile()` method."
+            )
+
+        system_message, tools_jsonschema = self._prepare_request(lang, inputs)
+        messages = [system_message, *inputs]
+
+        cache_key = None
+        if cache is not None:
+            cache_key = get_llm_cache_key(llm, messages, tools_jsonschema)
+            if isinstance(cached := await cache.aget(cache_key), AIMessage):
+                yield _message_to_chunk(cached)
+                return
+
+        output_chunk: BaseMessageChunk | None = None
+        async for chunk in llm.astream(messages, tools=tools_jsonschema):
+            if cache_key:
+                output_chunk = chunk if output_chunk is None else output_chunk + chunk
+            yield cast(AIMessageChunk, chunk)
+
+        if cache is not None and cache_key and output_chunk is not None:
+            await cache.aset(cache_key, message_chunk_to_message(output_chunk))
+
     def get_new_state(self) -> LLMNodeState:
         """
         Create new state instance for this LLM node.
@@ -201,11 +290,48 @@ class LLMNode(BaseNode[LLMNodeSpec, LLMNodeState]):
         """
         return LLMNodeState(kind=self.spec.kind, name=self.spec.name, messages=[])
 
+    def select_tools(
+        self, inputs: Sequence[BaseMessage], lang: LanguageCode | None = None
+    ) -> list[str]:
+        """
+        Select the tools sent to the LLM for the given inputs.
+
+        Without `tool_selection` in the spec all declared tools are selected.
+
+        Args:
+            inputs: Sequence of input messages for the conversation
+            lang: Language code of the tool descriptions to match
+
+        Returns:
+            Names of the selected tools in the declaration order
+        """
+        selector = self._get_by_lang(self.tool_selectors, lang)
+        if not selector:
+            return list(self.spec.tools)
+
+        query, called_tools = get_turn_query(inputs)
+        return selector.select(query, required=called_tools).tools
+
+    def _prepare_request(
+        self, lang: LanguageCode | None = None, inputs: Sequence[BaseMessage] = ()
+    ) -> tuple[SystemMessage, list[dict[str, Any]]]:
+        """
+        Build the system message and tools JSON schemas for the LLM request
+        from the prompt compiled for the language.
+        """
+        prompt = self._get_by_lang(self.compiled_prompts, lang)
+        if not prompt:
+            raise LimanError(f"LLMNode {self.name} has no compiled prompt")
+
+        if not self.tool_selectors:
+            return prompt.build()
+        return prompt.build(self.select_tools(inputs, lang))
+
     def _init_prompts(self) -> None:
         self.prompts = LLMPromptsBundle.model_validate(
             {**self.spec.prompts, "fallback_lang": self.fallback_lang}
         )
-        supported_langs = self.spec.prompts.keys()
+        supported_langs = list(self.spec.prompts.keys())
         tool_descs: dict[LanguageCode, list[str]] = {k: [] for k in supported_langs}
 
         for tool_name in self.spec.tools:
@@ -222,6 +348,14 @@ class LLMNode(BaseNode[LLMNodeSpec, LLMNodeState]):
                 tool_desc = tool.get_tool_description(lang)
                 tool_descs[lang].append(tool_desc)
 
+        tool_descriptions = {
+            lang: dict(zip(self.spec.tools, bundle, strict=True))
+            for lang, bundle in tool_descs.items()
+        }
+        if self.spec.tool_selection:
+            # descriptions of the selected tools are added on every request
+            tool_descs = {}
+
         for lang, bundle in tool_descs.items():
             if not bundle:
                 continue
@@ -234,3 +368,66 @@ class LLMNode(BaseNode[LLMNodeSpec, LLMNodeState]):
             )
 
         self.spec.prompts = cast(dict[LanguageCode, Any], self.prompts.model_dump())
+
+        for lang in {*supported_langs, self.fallback_lang}:
+            tool_schemas = {
+                tool_name: self.registry.lookup(ToolNode, tool_name).get_json_schema(
+                    lang
+                )
+                for tool_name in self.spec.tools
+            }
+            self.compiled_prompts[lang] = CompiledPrompt(
+                system_message=self.prompts.to_system_message(lang),
+                tools_jsonschema=tuple(tool_schemas.values()),
+                tool_schemas=MappingProxyType(tool_schemas),
+                tool_descriptions=MappingProxyType(tool_descriptions.get(lang, {})),
+            )
+
+    def _init_tool_selectors(self) -> None:
+        spec = self.spec.tool_selection
+        if not spec:
+            return
+
+        for tool_name in spec.pinned:
+            if tool_name not in self.spec.tools:
+                raise InvalidSpecError(
+                    f"Pinned tool '{tool_name}' isn't declared in tools of {self.name}"
+                )
+
+        for lang, prompt in self.compiled_prompts.items():
+            documents = {}
+            tokens = {}
+            for tool_name in self.spec.tools:
+                schema = json.dumps(prompt.tool_schemas[tool_name])
+                description = prompt.tool_descriptions.get(tool_name, "")
+                documents[tool_name] = f"{tool_name}\n{description}"
+                tokens[tool_name] = math.ceil((len(schema) + len(description)) / 4)
+
+            self.tool_selectors[lang] = ToolSelector(
+                spec, documents, tokens, name=self.name
+            )
+
+    def _get_by_lang(
+        self, values: dict[LanguageCode, _V], lang: LanguageCode | None
+    ) -> _V | None:
+        lang = lang or self.default_lang
+        return values.get(lang) or values.get(self.fallback_lang)
+
+
+def _message_to_chunk(message: AIMessage) -> AIMessageChunk:
+    return AIMessageChunk(
+        content=message.content,
+        id=message.id,
+        additional_kwargs=message.additional_kwargs,
+        response_metadata=message.response_metadata,
+        usage_metadata=message.usage_metadata,
+        tool_call_chunks=[
+            tool_call_chunk(
+                name=tool_call["name"],
+                args=json.dumps(tool_call["args"]),
+                id=tool_call["id"],
+                index=i,
+            )
+            for i, tool_call in enumerate(message.tool_calls)
+        ],
+    )
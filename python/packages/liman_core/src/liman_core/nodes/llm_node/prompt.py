@@ -0,0 +1,54 @@
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from langchain_core.messages import SystemMessage
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledPrompt:
+    """
+    Request parts of an LLMNode precomputed for a language at compile time.
+
+    `system_message` and `tools_jsonschema` are the stable prefix shared by
+    every request, so providers' prompt-prefix caching can hit. With tool
+    selection the descriptions of the selected tools are the variable part,
+    they are sent as a separate content block after the stable one.
+    """
+
+    system_message: SystemMessage
+    tools_jsonschema: tuple[dict[str, Any], ...]
+    tool_schemas: Mapping[str, dict[str, Any]]
+    tool_descriptions: Mapping[str, str]
+
+    def build(
+        self, tools: Sequence[str] | None = None
+    ) -> tuple[SystemMessage, list[dict[str, Any]]]:
+        """
+        Build the system message and tools JSON schemas of a request
+
+        Args:
+            tools: Names of the selected tools, all tools if None
+
+        Returns:
+            System message and tools JSON schemas
+        """
+        if tools is None:
+            return self.system_message, list(self.tools_jsonschema)
+
+        tools_jsonschema = [self.tool_schemas[tool] for tool in tools]
+        descriptions = [
+            description
+            for tool in tools
+            if (description := self.tool_descriptions.get(tool))
+        ]
+        if not descriptions:
+            return self.system_message, tools_jsonschema
+
+        system_message = SystemMessage(
+            content=[
+                {"type": "text", "text": self.system_message.text()},
+                {"type": "text", "text": "\n".join(descriptions)},
+            ]
+        )
+        return system_message, tools_jsonschema
@@ -1,7 +1,7 @@
 from typing import Literal
 
 from langchain_core.messages import SystemMessage
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from liman_core.base.schemas import BaseSpec
 from liman_core.edge.schemas import EdgeSpec
@@ -47,6 +47,44 @@ class LLMPromptsBundle(LanguagesBundle[LLMPrompts]):
         return SystemMessage(content=prompts.system if prompts else "")
 
 
+class MemorySpec(BaseModel):
+    """
+    Conversation memory configuration of an LLM node.
+
+    Bounds the message history sent to the model and kept in the node state.
+    History is dropped by whole turns, i.e. a HumanMessage with everything
+    following it, so the current turn is always kept and tool calls are never
+    separated from their results.
+    """
+
+    # sliding window limits, the current turn is always kept
+    max_messages: int | None = Field(default=None, gt=0)
+    max_tokens: int | None = Field(default=None, gt=0)
+    # once the limits are exceeded the history is compacted to this fraction
+    # of them, so compaction doesn't run again on every following turn
+    low_water: float = Field(default=0.5, gt=0, le=1)
+
+    # turns holding the first `pinned` messages are never dropped,
+    # turns with a message with `additional_kwargs["pinned"]` are kept as well
+    pinned: int = Field(default=0, ge=0)
+
+    # summarize dropped messages instead of forgetting them
+    summarize: bool = False
+    summary_prompt: str | None = None
+
+
+class ToolSelectionSpec(BaseModel):
+    """
+    Relevance-based tool selection configuration of an LLM node.
+
+    Only the `top_k` tools matching the current turn best are sent to the
+    model, pinned tools are always sent.
+    """
+
+    top_k: int = Field(default=5, gt=0)
+    pinned: list[str] = []
+
+
 class LLMNodeSpec(BaseSpec):
     """
     Specification schema for LLM nodes.
@@ -60,6 +98,8 @@ class LLMNodeSpec(BaseSpec):
     prompts: LocalizedValue
     tools: list[str] = []
     nodes: list[str | EdgeSpec] = []
+    memory: MemorySpec | None = None
+    tool_selection: ToolSelectionSpec | None = None
 
 
 class LLMNodeState(NodeState):
@@ -0,0 +1,71 @@
+import json
+from dataclasses import dataclass
+
+from langchain_core.messages import AIMessageChunk
+from langchain_core.messages.tool import ToolCall, tool_call
+
+
+@dataclass
+class _PartialToolCall:
+    name: str = ""
+    id_: str | None = None
+    args: str = ""
+    completed: bool = False
+
+
+class ToolCallChunkAccumulator:
+    """
+    Collect streamed `tool_call_chunks` of an LLM response and report
+    every tool call as soon as its arguments JSON is complete.
+
+    Chunks belonging to the same tool call share the `index`, the same way
+    LangChain merges them into the final `AIMessage.tool_calls`.
+    """
+
+    def __init__(self) -> None:
+        self._tool_calls: dict[int, _PartialToolCall] = {}
+
+    def add(self, chunk: AIMessageChunk) -> list[ToolCall]:
+        """
+        Add a streamed chunk
+
+        Args:
+            chunk: Chunk of the LLM response
+
+        Returns:
+            Tool calls completed by this chunk, in the tool call order
+        """
+        touched: list[int] = []
+        for tool_call_chunk in chunk.tool_call_chunks:
+            index = tool_call_chunk.get("index")
+            if index is None:
+                index = len(self._tool_calls)
+
+            partial = self._tool_calls.setdefault(index, _PartialToolCall())
+            if partial.completed:
+                continue
+
+            partial.name += tool_call_chunk.get("name") or ""
+            partial.id_ = partial.id_ or tool_call_chunk.get("id")
+            partial.args += tool_call_chunk.get("args") or ""
+            if index not in touched:
+                touched.append(index)
+
+        completed: list[ToolCall] = []
+        for index in sorted(touched):
+            partial = self._tool_calls[index]
+            args = _parse_args(partial.args)
+            if args is None or not partial.name or not partial.id_:
+                continue
+
+            partial.completed = True
+            completed.append(tool_call(name=partial.name, args=args, id=partial.id_))
+        return completed
+
+
+def _parse_args(args: str) -> dict[str, object] | None:
+    try:
+        parsed = json.loads(args)
+    except json.JSONDecodeError:
+        return None
+    return parsed if isinstance(parsed, dict) else None
@@ -0,0 +1,165 @@
+import math
+import re
+from collections import Counter
+from collections.abc import Mapping, Sequence
+from typing import NamedTuple
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+
+from liman_core.nodes.llm_node.schemas import ToolSelectionSpec
+
+_CAMEL_CASE_RE = re.compile(r"([a-z0-9])([A-Z])")
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into lowercase terms, snake_case and camelCase identifiers
+    are split into words
+    """
+    return _TOKEN_RE.findall(_CAMEL_CASE_RE.sub(r"\1 \2", text).lower())
+
+
+class BM25Index:
+    """
+    Okapi BM25 lexical index over a fixed set of documents
+    """
+
+    def __init__(self, documents: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+
+        self._terms = [Counter(tokenize(document)) for document in documents]
+        self._lengths = [sum(terms.values()) for terms in self._terms]
+        self._avg_length = (
+            sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+        )
+
+        doc_freqs: Counter[str] = Counter()
+        for terms in self._terms:
+            doc_freqs.update(terms.keys())
+        count = len(self._terms)
+        self._idf = {
+            term: math.log((count - freq + 0.5) / (freq + 0.5) + 1)
+            for term, freq in doc_freqs.items()
+        }
+
+    def score(self, query: str) -> list[float]:
+        """
+        Score every document against the query
+
+        Args:
+            query: Free text query
+
+        Returns:
+            Scores in the documents order, 0 means no common terms
+        """
+        query_terms = set(tokenize(query)) & self._idf.keys()
+        scores = []
+        for terms, length in zip(self._terms, self._lengths, strict=True):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / (self._avg_length or 1))
+            for term in query_terms:
+                if freq := terms.get(term):
+                    score += self._idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            scores.append(score)
+        return scores
+
+
+class ToolSelection(NamedTuple):
+    """
+    Tools selected for an LLM request
+    """
+
+    tools: list[str]
+    tokens_total: int
+    tokens_selected: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_total - self.tokens_selected
+
+
+class ToolSelector:
+    """
+    Selects the tools relevant to the current conversation turn.
+
+    Tool descriptions are indexed once, then every request gets the `top_k`
+    best matching tools plus the pinned ones, in the declaration order.
+    If no tool matches the query all tools are selected.
+    """
+
+    def __init__(
+        self,
+        spec: ToolSelectionSpec,
+        documents: Mapping[str, str],
+        tokens: Mapping[str, int],
+        *,
+        name: str | None = None,
+    ) -> None:
+        """
+        Args:
+            spec: Tool selection configuration
+            documents: Indexed text of every tool by tool name
+            tokens: Approximate prompt tokens every tool costs by tool name
+            name: Name of the node the selector belongs to
+        """
+        self.spec = spec
+        self.name = name
+        self.tool_names = list(documents)
+        self.tokens = dict(tokens)
+        self.index = BM25Index([documents[tool] for tool in self.tool_names])
+
+    def select(self, query: str, required: Sequence[str] = ()) -> ToolSelection:
+        """
+        Select tools for the query
+
+        Args:
+            query: Text of the current turn
+            required: Tools which must be selected in addition to pinned ones,
+                e.g. tools already called during the turn
+
+        Returns:
+            ToolSelection with the tool names and tokens statistics
+        """
+        scores = self.index.score(query)
+        ranked = sorted(
+            (i for i, score in enumerate(scores) if score > 0),
+            key=lambda i: scores[i],
+            reverse=True,
+        )
+
+        if ranked:
+            selected = {self.tool_names[i] for i in ranked[: self.spec.top_k]}
+            selected.update(self.spec.pinned)
+            selected.update(required)
+            tools = [tool for tool in self.tool_names if tool in selected]
+        else:
+            tools = list(self.tool_names)
+
+        tokens_total = sum(self.tokens.values())
+        tokens_selected = sum(self.tokens.get(tool, 0) for tool in tools)
+        return ToolSelection(tools, tokens_total, tokens_selected)
+
+
+def get_turn_query(messages: Sequence[BaseMessage]) -> tuple[str, list[str]]:
+    """
+    Extract the query and already called tools of the current turn,
+    i.e. the messages starting from the last HumanMessage
+
+    Returns:
+        Text of the turn and names of the tools called during it
+    """
+    start = 0
+    for i in reversed(range(len(messages))):
+        if isinstance(messages[i], HumanMessage):
+            start = i
+            break
+
+    texts: list[str] = []
+    called: list[str] = []
+    for message in messages[start:]:
+        texts.append(message.text())
+        if isinstance(message, AIMessage):
+            called.extend(tool_call["name"] for tool_call in message.tool_calls)
+    return "\n".join(texts), called
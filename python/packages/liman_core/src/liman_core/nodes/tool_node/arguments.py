@@ -0,0 +1,74 @@
+import json
+from collections.abc import Sequence
+from typing import Any, cast
+
+from pydantic import ConfigDict, TypeAdapter, ValidationError, with_config
+from typing_extensions import NotRequired, TypedDict
+
+from liman_core.nodes.tool_node.schemas import ToolArgument, ToolObjectArgument
+from liman_core.nodes.tool_node.utils import get_tool_arg_python_type
+
+ToolArgs = dict[str, Any]
+
+
+def create_args_adapter(
+    arguments: Sequence[ToolArgument | ToolObjectArgument], name: str = "ToolArgs"
+) -> TypeAdapter[ToolArgs]:
+    """
+    Compile tool argument specs into a validator of the tool call arguments.
+
+    Arguments are validated and coerced in one pass, e.g. "5" becomes 5 for
+    an int argument. Optional arguments may be omitted or null, omitted ones
+    stay omitted, so the function defaults apply. Unknown arguments are kept.
+
+    Args:
+        arguments: Tool argument specs
+        name: Name of the validated type used in the errors
+
+    Returns:
+        TypeAdapter validating the arguments dict
+
+    Raises:
+        InvalidSpecError: If an argument type is unsupported
+    """
+    return TypeAdapter(_create_typed_dict(name, arguments))
+
+
+def format_args_error(tool_name: str, error: ValidationError) -> str:
+    """
+    Format the validation error of tool call arguments for the LLM
+
+    Returns:
+        JSON with the invalid arguments and the reasons
+    """
+    return json.dumps(
+        {
+            "error": f"Invalid arguments of tool '{tool_name}'",
+            "details": [
+                {
+                    "argument": ".".join(str(loc) for loc in details["loc"]),
+                    "message": details["msg"],
+                }
+                for details in error.errors(include_url=False)
+            ],
+        },
+        ensure_ascii=False,
+    )
+
+
+def _create_typed_dict(
+    name: str, arguments: Sequence[ToolArgument | ToolObjectArgument]
+) -> type[ToolArgs]:
+    fields: dict[str, Any] = {}
+    for arg in arguments:
+        if isinstance(arg, ToolObjectArgument) and arg.properties:
+            type_ = _create_typed_dict(f"{name}_{arg.name}", arg.properties)
+        else:
+            type_ = get_tool_arg_python_type(arg.type)
+        fields[arg.name] = NotRequired[type_ | None] if arg.optional else type_
+
+    # argument names aren't known statically and may not be identifiers
+    typed_dict = cast(Any, TypedDict)(name, fields)
+    # models send numbers for string arguments like ids or zip codes
+    config = ConfigDict(extra="allow", coerce_numbers_to_str=True)
+    return cast(type[ToolArgs], with_config(config)(typed_dict))
@@ -0,0 +1,171 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any, Literal, NamedTuple
+
+from liman_core.nodes.base.execution_context import ExecutionContext
+from liman_core.nodes.tool_node.schemas import ToolCacheSpec
+
+# bump to invalidate entries when the key format changes
+CACHE_KEY_VERSION = 1
+
+ToolCacheStatus = Literal["hit", "miss", "shared"]
+
+
+class ToolCacheResult(NamedTuple):
+    """
+    Result of the tool cache lookup
+    """
+
+    content: str
+    # "shared" means the result of a concurrent identical call was awaited
+    status: ToolCacheStatus
+
+
+class ToolResultCache:
+    """
+    In-memory LRU cache of tool results.
+
+    Concurrent calls with the same key share a single execution running in
+    its own task, so an expensive tool isn't run several times while the first
+    call is in flight. Failed executions are propagated to every waiter and
+    never cached.
+    """
+
+    def __init__(
+        self,
+        spec: ToolCacheSpec,
+        *,
+        name: str | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.spec = spec
+        self.name = name
+        self.clock = clock
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._in_flight: dict[str, asyncio.Task[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get_key(
+        self,
+        args: Mapping[str, Any],
+        execution_context: ExecutionContext[Any] | None = None,
+    ) -> str:
+        """
+        Build the canonical key of the tool call
+
+        Args:
+            args: Arguments of the tool call
+            execution_context: Execution context the scope is taken from
+
+        Returns:
+            Hex digest identifying the call within the cache scope
+        """
+        if self.spec.key is not None:
+            args = {name: args.get(name) for name in self.spec.key}
+
+        payload = {
+            "version": CACHE_KEY_VERSION,
+            "scope": self._get_scope_id(execution_context),
+            "args": args,
+        }
+        data = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    async def aget_or_call(
+        self, key: str, call: Callable[[], Awaitable[str]]
+    ) -> ToolCacheResult:
+        """
+        Get the cached result or execute the call and cache its result
+
+        Args:
+            key: Tool call key, see `get_key`
+            call: Coroutine function executing the tool
+
+        Returns:
+            ToolCacheResult with the result content and the lookup status
+        """
+        entry = self._entries.get(key)
+        if entry is not None and self._is_expired(entry[0]):
+            del self._entries[key]
+            entry = None
+
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return ToolCacheResult(entry[1], "hit")
+
+        if (in_flight := self._in_flight.get(key)) is not None:
+            self.hits += 1
+            return ToolCacheResult(await asyncio.shield(in_flight), "shared")
+
+        self.misses += 1
+        task = asyncio.create_task(self._call(key, call))
+        task.add_done_callback(_retrieve_exception)
+        self._in_flight[key] = task
+        # the execution is shared, cancelling one caller doesn't cancel the others
+        return ToolCacheResult(await asyncio.shield(task), "miss")
+
+    def clear(self) -> None:
+        """
+        Drop all cached results
+        """
+        self._entries.clear()
+
+    async def _call(self, key: str, call: Callable[[], Awaitable[str]]) -> str:
+        try:
+            content = await call()
+        finally:
+            del self._in_flight[key]
+        self._set(key, content)
+        return content
+
+    def _set(self, key: str, content: str) -> None:
+        self._entries[key] = (self.clock(), content)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.spec.max_entries:
+            self._entries.popitem(last=False)
+
+    def _is_expired(self, created_at: float) -> bool:
+        return self.spec.ttl is not None and self.clock() - created_at > self.spec.ttl
+
+    def _get_scope_id(self, execution_context: ExecutionContext[Any] | None) -> str:
+        if self.spec.scope == "global" or execution_context is None:
+            return ""
+
+        if self.spec.scope == "session":
+            session_id = _get_context_value(execution_context, "session_id")
+            if session_id is not None:
+                return f"session:{session_id}"
+
+        execution_id = _get_context_value(
+            execution_context, "root_execution_id"
+        ) or _get_context_value(execution_context, "execution_id")
+        return f"execution:{execution_id}"
+
+
+def _retrieve_exception(task: asyncio.Task[str]) -> None:
+    # the loop logs unretrieved exceptions when every caller was cancelled
+    if not task.cancelled():
+        task.exception()
+
+
+def _get_context_value(execution_context: ExecutionContext[Any], key: str) -> Any:
+    try:
+        return execution_context[key]
+    except KeyError:
+        return None
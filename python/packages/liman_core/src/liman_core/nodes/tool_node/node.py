@@ -6,6 +6,7 @@ from importlib import import_module
 from typing import Any, cast, get_type_hints
 
 from langchain_core.messages import ToolMessage
+from pydantic import TypeAdapter, ValidationError
 
 from liman_core.base.utils import noop
 from liman_core.dishka import (
@@ -19,6 +20,13 @@ from liman_core.languages import LanguageCode, flatten_dict
 from liman_core.nodes.base.execution_context import ExecutionContext
 from liman_core.nodes.base.liman import Liman
 from liman_core.nodes.base.node import BaseNode
+from liman_core.nodes.tool_node.arguments import (
+    ToolArgs,
+    create_args_adapter,
+    format_args_error,
+)
+from liman_core.nodes.tool_node.cache import ToolResultCache
+from liman_core.nodes.tool_node.output import ToolOutputShaper
 from liman_core.nodes.tool_node.schemas import ToolCall, ToolNodeSpec, ToolNodeState
 from liman_core.nodes.tool_node.utils import (
     ToolArgumentJSONSchema,
@@ -76,6 +84,19 @@ class ToolNode(BaseNode[ToolNodeSpec, ToolNodeState]):
         {name} - {description}
         Примеры:
           {triggers}
+    # Optionally, you can limit the execution time in seconds.
+    timeout: 10
+    # Optionally, you can cache results of idempotent tools.
+    cache:
+      ttl: 300
+      key: [lat, lon]
+      max_entries: 1024
+      scope: global
+    # Optionally, you can shape the result fed back to the LLM.
+    output:
+      fields: ["$.current.temperature", "$.hourly[*].temperature"]
+      max_items: 24
+      max_tokens: 2000
     ```
 
     Usage:
@@ -127,6 +148,9 @@ class ToolNode(BaseNode[ToolNodeSpec, ToolNodeState]):
         self.registry = registry
         self.registry.add(self)
         self.func: Callable[..., Any] | None = None
+        self.cache: ToolResultCache | None = None
+        self.output_shaper: ToolOutputShaper | None = None
+        self._args_adapter: TypeAdapter[ToolArgs] | None = None
         self._compiled = False
 
     def compile(self) -> None:
@@ -137,6 +161,17 @@ class ToolNode(BaseNode[ToolNodeSpec, ToolNodeState]):
         for execution. Must be called before invoke().
         """
         self.func = self._load_func()
+        self._get_args_adapter()
+        self.cache = (
+            ToolResultCache(self.spec.cache, name=self.name)
+            if self.spec.cache
+            else None
+        )
+        self.output_shaper = (
+            ToolOutputShaper(self.spec.output, name=self.name)
+            if self.spec.output
+            else None
+        )
         self._compiled = True
 
     def set_func(self, func: Callable[..., Any]) -> None:
@@ -160,6 +195,12 @@ class ToolNode(BaseNode[ToolNodeSpec, ToolNodeState]):
 
         Calls the underlying function with extracted arguments and returns
         the result wrapped in a ToolMessage. Handles both sync and async functions.
+        Arguments are validated and coerced according to the spec arguments,
+        invalid ones are reported with an error ToolMessage without calling
+        the function.
+        If the result cache is configured, identical calls reuse the result.
+        If the call exceeds the spec timeout, an error ToolMessage is returned,
+        so the conversation can continue.
 
         Args:
             tool_call: Tool call containing name, arguments, and call ID
@@ -178,32 +219,49 @@ class ToolNode(BaseNode[ToolNodeSpec, ToolNodeState]):
         func = self.func
         tool_call_id = tool_call.id_
         tool_call_name = tool_call.name
+
+        args = tool_call.args
+        if (args_adapter := self._get_args_adapter()) is not None:
+            try:
+                args = args_adapter.validate_python(args)
+            except ValidationError as e:
+                return ToolMessage(
+                    content=format_args_error(self.name, e),
+                    tool_call_id=tool_call_id,
+                    name=tool_call_name,
+                    status="error",
+                )
         call_args = self._extract_function_args(
-            tool_call.args, execution_context=execution_context
+            args, execution_context=execution_context
         )
 
         try:
-            async with self.registry.container(
-                {"execution_context": execution_context, **kwargs}, scope=Scope.NODE
-            ) as container:
-                # Resolve FromLiman dependencies using dishka container
-                di_keys = [key for key in call_args if key.startswith(DI_VAR_PREFIX)]
-                for key in di_keys:
-                    param_name = key.replace(DI_VAR_PREFIX, "")
-                    param_type = call_args.pop(key)  # Remove the marker
-                    dependency = await resolve_from_liman_dependency(
-                        param_type, container
-                    )
-                    call_args[param_name] = dependency
-
-                if asyncio.iscoroutinefunction(func) or (
-                    callable(func)
-                    and not inspect.isfunction(func)
-                    and asyncio.iscoroutinefunction(getattr(func, "__call__", None))
-                ):
-                    result = await func(**call_args)
-                else:
-                    result = func(**call_args)
+            if self.cache is not None:
+                key = self.cache.get_key(args, execution_context)
+                cached = await asyncio.wait_for(
+                    self.cache.aget_or_call(
+                        key,
+                        lambda: self._acall(
+                            func, call_args, execution_context, **kwargs
+                        ),
+                    ),
+                    self.spec.timeout,
+                )
+                content = cached.content
+            else:
+                content = await asyncio.wait_for(
+                    self._acall(func, call_args, execution_context, **kwargs),
+                    self.spec.timeout,
+                )
+        except asyncio.TimeoutError:
+            response = ToolMessage(
+                content=(
+                    f"Tool '{self.name}' timed out after {self.spec.timeout} seconds"
+                ),
+                tool_call_id=tool_call_id,
+                name=tool_call_name,
+                status="error",
+            )
         except Exception as e:
             response = ToolMessage(
                 content=str(e),
@@ -212,12 +270,66 @@ class ToolNode(BaseNode[ToolNodeSpec, ToolNodeState]):
             )
         else:
             response = ToolMessage(
-                content=str(result),
+                content=content,
                 tool_call_id=tool_call_id,
                 name=tool_call_name,
             )
         return response
 
+    async def _acall(
+        self,
+        func: Callable[..., Any],
+        call_args: dict[str, Any],
+        execution_context: ExecutionContext[ToolNodeState] | None = None,
+        **kwargs: Any,
+    ) -> str:
+        """
+        Resolve FromLiman dependencies and call the function
+
+        Returns:
+            String representation of the function result, shaped
+            according to the output spec if it's set
+        """
+        async with self.registry.container(
+            {"execution_context": execution_context, **kwargs}, scope=Scope.NODE
+        ) as container:
+            # Resolve FromLiman dependencies using dishka container
+            di_keys = [key for key in call_args if key.startswith(DI_VAR_PREFIX)]
+            for key in di_keys:
+                param_name = key.replace(DI_VAR_PREFIX, "")
+                param_type = call_args.pop(key)  # Remove the marker
+                dependency = await resolve_from_liman_dependency(param_type, container)
+                call_args[param_name] = dependency
+
+            if asyncio.iscoroutinefunction(func) or (
+                callable(func)
+                and not inspect.isfunction(func)
+                and asyncio.iscoroutinefunction(getattr(func, "__call__", None))
+            ):
+                result = await func(**call_args)
+            elif self.spec.timeout is not None:
+                # run in a thread, so the timeout doesn't wait for the function,
+                # it can't be interrupted and keeps running in the thread
+                result = await asyncio.to_thread(func, **call_args)
+            else:
+                result = func(**call_args)
+
+        if self.output_shaper is not None:
+            return self.output_shaper.shape(result).content
+        return str(result)
+
+    def _get_args_adapter(self) -> TypeAdapter[ToolArgs] | None:
+        """
+        Get the validator of the spec arguments, it's created once
+        """
+        if not self.spec.arguments:
+            return None
+        if self._args_adapter is None:
+            self._args_adapter = create_args_adapter(
+                self.spec.arguments, name=f"{self.name}_args"
+            )
+        return self._args_adapter
+
     def _extract_function_args(
         self,
         args_dict: dict[str, Any],
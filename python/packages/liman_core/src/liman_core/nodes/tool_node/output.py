@@ -0,0 +1,164 @@
+import json
+import math
+import re
+from contextlib import suppress
+from typing import Any, NamedTuple
+
+from liman_core.errors import InvalidSpecError
+from liman_core.nodes.tool_node.schemas import ToolOutputSpec
+
+# approximation used for the token limits and the tokens saved
+CHARS_PER_TOKEN = 4
+
+_PATH_TOKEN_RE = re.compile(r"\.?([^.\[\]]+)|\[(\*|\d+)\]")
+_MISSING = object()
+
+# field name or list index -> selection of the nested value, empty selects all
+FieldTree = dict[str | int, "FieldTree"]
+
+
+class ToolOutput(NamedTuple):
+    """
+    Tool result shaped for the LLM
+    """
+
+    content: str
+    # size of the result as it would be sent without shaping
+    original_bytes: int
+    original_chars: int
+
+    @property
+    def bytes_saved(self) -> int:
+        return max(self.original_bytes - len(self.content.encode()), 0)
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(
+            math.ceil((self.original_chars - len(self.content)) / CHARS_PER_TOKEN), 0
+        )
+
+
+class ToolOutputShaper:
+    """
+    Shapes tool results according to ToolOutputSpec, field paths are compiled once
+    """
+
+    def __init__(self, spec: ToolOutputSpec, *, name: str | None = None) -> None:
+        self.spec = spec
+        self.name = name
+
+        self.fields = parse_fields(spec.fields) if spec.fields else None
+        limits = [spec.max_chars, spec.max_tokens and spec.max_tokens * CHARS_PER_TOKEN]
+        self.max_chars = min((limit for limit in limits if limit), default=None)
+
+    def shape(self, result: Any) -> ToolOutput:
+        """
+        Shape the tool result
+
+        Args:
+            result: Result returned by the tool function
+
+        Returns:
+            ToolOutput with the content for the ToolMessage
+        """
+        original = str(result)
+
+        value = result
+        if isinstance(value, str) and (self.fields or self.spec.max_items):
+            with suppress(ValueError):
+                value = json.loads(value)
+
+        if isinstance(value, str):
+            content = value
+        else:
+            if self.fields is not None:
+                value = project(value, self.fields)
+                value = None if value is _MISSING else value
+            if self.spec.max_items is not None:
+                value = truncate_arrays(value, self.spec.max_items)
+            content = json.dumps(
+                value, ensure_ascii=False, separators=(",", ":"), default=str
+            )
+
+        if self.max_chars is not None and len(content) > self.max_chars:
+            content = truncate_text(content, self.max_chars)
+        return ToolOutput(content, len(original.encode()), len(original))
+
+
+def parse_fields(paths: list[str]) -> FieldTree:
+    """
+    Compile JSONPath-like field paths into a tree of the selected fields
+
+    Raises:
+        InvalidSpecError: If a path is invalid
+    """
+    tree: FieldTree = {}
+    for path in paths:
+        rest = path.removeprefix("$")
+        tokens: list[str | int] = []
+        position = 0
+        while position < len(rest):
+            match = _PATH_TOKEN_RE.match(rest, position)
+            if match is None:
+                raise InvalidSpecError(f"Invalid output field path: '{path}'")
+            name, index = match.groups()
+            tokens.append(int(index) if index and index != "*" else name or index)
+            position = match.end()
+        if not tokens:
+            raise InvalidSpecError(f"Invalid output field path: '{path}'")
+
+        node = tree
+        for token in tokens:
+            node = node.setdefault(token, {})
+    return tree
+
+
+def project(value: Any, tree: FieldTree) -> Any:
+    """
+    Keep only the selected fields of the value, preserving its structure
+    """
+    if not tree:
+        return value
+
+    if isinstance(value, dict):
+        projected = {}
+        for key, item in value.items():
+            subtree = tree.get(key, tree.get("*"))
+            if subtree is not None:
+                item = project(item, subtree)
+                if item is not _MISSING:
+                    projected[key] = item
+        return projected or _MISSING
+
+    if isinstance(value, list | tuple):
+        items = []
+        for i, item in enumerate(value):
+            subtree = tree.get(i, tree.get("*"))
+            if subtree is not None:
+                item = project(item, subtree)
+                if item is not _MISSING:
+                    items.append(item)
+        return items
+
+    return _MISSING
+
+
+def truncate_arrays(value: Any, max_items: int) -> Any:
+    """
+    Keep the first `max_items` of every array followed by the count of omitted ones
+    """
+    if isinstance(value, dict):
+        return {key: truncate_arrays(item, max_items) for key, item in value.items()}
+
+    if isinstance(value, list | tuple):
+        items = [truncate_arrays(item, max_items) for item in value[:max_items]]
+        if len(value) > max_items:
+            items.append(f"... {len(value) - max_items} more of {len(value)} items")
+        return items
+
+    return value
+
+
+def truncate_text(content: str, max_chars: int) -> str:
+    suffix = f"... [truncated, {len(content)} chars in total]"
+    return content[: max(max_chars - len(suffix), 0)] + suffix
@@ -38,6 +38,40 @@ class ToolObjectArgument(BaseModel):
     properties: list[ToolArgument] | None = None
 
 
+class ToolCacheSpec(BaseModel):
+    """
+    Result cache configuration of a tool node.
+
+    Results are cached by the canonical hash of the tool call arguments,
+    only successful results are cached. The scope defines who shares entries:
+    `execution` - a single agent execution tree, `session` - calls with the same
+    `session_id` in the context (the execution otherwise), `global` - everyone.
+    """
+
+    ttl: float | None = Field(default=None, gt=0)
+    # arguments used for the key, all arguments if not set
+    key: list[str] | None = None
+    max_entries: int = Field(default=1024, gt=0)
+    scope: Literal["execution", "session", "global"] = "execution"
+
+
+class ToolOutputSpec(BaseModel):
+    """
+    Shaping of the tool result fed back to the LLM.
+
+    Structured results are serialized as compact JSON instead of the Python
+    representation. Fields are selected with a JSONPath subset: `$.items[*].id`,
+    `data.items[0]`, `*.name`. Arrays longer than `max_items` keep their first
+    items followed by the count of omitted ones. The serialized result is cut
+    to `max_chars` or `max_tokens`, approximated as 4 chars per token.
+    """
+
+    fields: list[str] | None = None
+    max_items: int | None = Field(default=None, gt=0)
+    max_chars: int | None = Field(default=None, gt=0)
+    max_tokens: int | None = Field(default=None, gt=0)
+
+
 class ToolNodeSpec(BaseSpec):
     """
     Specification schema for tool nodes.
@@ -54,6 +88,10 @@ class ToolNodeSpec(BaseSpec):
     arguments: list[ToolArgument] | list[ToolObjectArgument] | None = None
     triggers: list[LocalizedValue] | None = None
     tool_prompt_template: LocalizedValue | None = None
+    cache: ToolCacheSpec | None = None
+    output: ToolOutputSpec | None = None
+    # seconds, a timed out call returns an error ToolMessage
+    timeout: float | None = Field(default=None, gt=0)
     llm_nodes: list[EdgeSpec] = []
 
 
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import operator
+from functools import reduce
 from typing import Annotated, Any, TypedDict, cast
 
 from pydantic import Field
@@ -126,3 +128,40 @@ def get_tool_arg_type(type_: str | list[str]) -> str | list[str]:
         case _:
             raise InvalidSpecError(f"Unsupported type in tool specification: {type_}")
     return type_
+
+
+# JSON Schema types of the tool arguments to Python types of their validators
+_PYTHON_TYPES: dict[str, Any] = {
+    "string": str,
+    "number": float,
+    "boolean": bool,
+    "object": dict[str, Any],
+}
+# Python type names which are narrower than their JSON Schema type
+_NARROW_PYTHON_TYPES: dict[str, Any] = {"int": int, "integer": int}
+
+
+def get_tool_arg_python_type(type_: str | list[str]) -> Any:
+    """
+    Convert tool argument type names to Python types for argument validation.
+
+    Uses the same mapping as `get_tool_arg_type`, except that integer types
+    are kept as int instead of JSON Schema number.
+
+    Args:
+        type_: Python type name or list of type names
+
+    Returns:
+        Python type, a union of types for a list of type names
+
+    Raises:
+        InvalidSpecError: If type is unsupported
+    """
+    if isinstance(type_, list):
+        return reduce(operator.or_, [get_tool_arg_python_type(t) for t in type_])
+
+    if type_ in _NARROW_PYTHON_TYPES:
+        return _NARROW_PYTHON_TYPES[type_]
+    if type_ == "array":
+        return list[Any]
+    return _PYTHON_TYPES[cast(str, get_tool_arg_type(type_))]
@@ -4,8 +4,6 @@ import sys
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from ruamel.yaml import YAML
-
 from liman_core.base.component import Component
 from liman_core.errors import InvalidSpecError
 
@@ -62,6 +60,8 @@ class ServiceAccount(Component[ServiceAccountSpec]):
         Returns:
             ServiceAccount: An instance of ServiceAccount initialized with the YAML data.
         """
+        from ruamel.yaml import YAML
+
         yaml = YAML()
         yaml_path_str = str(yaml_path)
         with open(yaml_path_str, encoding="utf-8") as fd:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from typing import Any, TypeVar
 
 from liman_core.base.component import Component
@@ -23,6 +24,8 @@ class Registry:
 
     def __init__(self) -> None:
         self._components: dict[str, Component[Any]] = {}
+        # factories of the lazily added components, by the component key
+        self._factories: dict[str, Callable[[], Component[Any]]] = {}
 
         self._plugins_kinds: set[str] = {"Node", "LLMNode", "ToolNode"}
         self._plugins: dict[str, list[Plugin]] = {
@@ -75,6 +78,9 @@ class Registry:
             Component: The component associated with the given name.
         """
         key = f"{kind.__name__}:{name}"
+        if key not in self._components and key in self._factories:
+            self._materialize(key)
+
         if key in self._components:
             node = self._components[key]
 
@@ -97,10 +103,41 @@ class Registry:
             component (Component): The component to add to the registry.
         """
         key = f"{node.spec.kind}:{node.name}"
-        if self._components.get(key):
+        if self._components.get(key) or key in self._factories:
             raise LimanError(f"Node with key '{key}' already exists in the registry.")
         self._components[key] = node
 
+    def add_lazy(
+        self, kind: str, name: str, factory: Callable[[], Component[Any]]
+    ) -> None:
+        """
+        Add a component built by the factory on its first lookup.
+
+        Allows registering many components, e.g. generated from a large spec,
+        without paying for their validation until they're used.
+
+        Args:
+            kind (str): Kind of the component, e.g. "ToolNode".
+            name (str): Name of the component.
+            factory (Callable[[], Component]): Builds the component.
+        """
+        key = f"{kind}:{name}"
+        if key in self._components or key in self._factories:
+            raise LimanError(f"Node with key '{key}' already exists in the registry.")
+        self._factories[key] = factory
+
+    def _materialize(self, key: str) -> None:
+        # the factory is removed first, so the component can add itself
+        factory = self._factories.pop(key)
+        try:
+            component = factory()
+        except Exception:
+            self._factories[key] = factory
+            raise
+        # nodes add themselves to the registry on init
+        if key not in self._components:
+            self.add(component)
+
     def print_specs(self, initial: bool = False) -> None:
         """
         Print all registered components as YAML with --- separators, sorted by kind.
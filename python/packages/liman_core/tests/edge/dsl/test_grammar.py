@@ -1,7 +1,13 @@
+from pathlib import Path
+
 import pytest
 from lark import ParseError
 
-from liman_core.edge.dsl.grammar import when_parser
+from liman_core.edge.dsl.grammar import (
+    get_parser_cache_path,
+    get_when_parser,
+    when_parser,
+)
 
 
 def test_when_parser_boolean_literals() -> None:
@@ -97,3 +103,43 @@ def test_when_parser_invalid_syntax() -> None:
 
     with pytest.raises(ParseError):
         when_parser.parse("&& y")
+
+
+def test_get_when_parser_persists_tables(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("LIMAN_CACHE_DIR", str(tmp_path / "cache"))
+    get_when_parser.cache_clear()
+    try:
+        parser = get_when_parser()
+        assert get_when_parser() is parser
+
+        cache_path = get_parser_cache_path()
+        assert cache_path is not None
+        assert cache_path.parent == tmp_path / "cache"
+        assert cache_path.exists()
+
+        get_when_parser.cache_clear()
+        assert get_when_parser().parse("x == 1") == parser.parse("x == 1")
+    finally:
+        get_when_parser.cache_clear()
+
+
+def test_get_when_parser_ignores_broken_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("LIMAN_CACHE_DIR", str(tmp_path))
+    cache_path = get_parser_cache_path()
+    assert cache_path is not None
+    cache_path.write_bytes(b"broken")
+    get_when_parser.cache_clear()
+    try:
+        assert get_when_parser().parse("true") is not None
+    finally:
+        get_when_parser.cache_clear()
+
+
+def test_get_parser_cache_path_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LIMAN_CACHE_DIR", "")
+
+    assert get_parser_cache_path() is None
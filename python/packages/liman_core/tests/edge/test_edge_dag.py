@@ -0,0 +1,72 @@
+import pytest
+
+from liman_core.edge.dag import prune_unsatisfied_edges, validate_edges_dependencies
+from liman_core.edge.schemas import EdgeSpec
+from liman_core.errors import InvalidSpecError
+
+
+def test_validate_edges_without_dependencies() -> None:
+    edges = [EdgeSpec(target="a"), EdgeSpec(target="b", id="b")]
+
+    validate_edges_dependencies(edges)
+
+
+def test_validate_edges_with_valid_dependencies() -> None:
+    edges = [
+        EdgeSpec(target="a", id="a"),
+        EdgeSpec(target="b", id="b"),
+        EdgeSpec(target="c", id="c", depends=["a", "b"]),
+        EdgeSpec(target="d", depends=["c"]),
+    ]
+
+    validate_edges_dependencies(edges)
+
+
+def test_validate_edges_unknown_dependency() -> None:
+    edges = [EdgeSpec(target="a", depends=["missing"])]
+
+    with pytest.raises(InvalidSpecError, match="unknown edge id 'missing'"):
+        validate_edges_dependencies(edges)
+
+
+def test_validate_edges_duplicate_id() -> None:
+    edges = [EdgeSpec(target="a", id="x"), EdgeSpec(target="b", id="x")]
+
+    with pytest.raises(InvalidSpecError, match="Duplicate edge id 'x'"):
+        validate_edges_dependencies(edges)
+
+
+def test_validate_edges_cycle() -> None:
+    edges = [
+        EdgeSpec(target="a", id="a", depends=["c"]),
+        EdgeSpec(target="b", id="b", depends=["a"]),
+        EdgeSpec(target="c", id="c", depends=["b"]),
+    ]
+
+    with pytest.raises(InvalidSpecError, match="cycle"):
+        validate_edges_dependencies(edges)
+
+
+def test_validate_edges_self_dependency() -> None:
+    edges = [EdgeSpec(target="a", id="a", depends=["a"])]
+
+    with pytest.raises(InvalidSpecError, match="a -> a"):
+        validate_edges_dependencies(edges)
+
+
+def test_prune_unsatisfied_edges_keeps_satisfied() -> None:
+    edges = [
+        EdgeSpec(target="a", id="a"),
+        EdgeSpec(target="b", depends=["a"]),
+    ]
+
+    assert prune_unsatisfied_edges(edges) == edges
+
+
+def test_prune_unsatisfied_edges_is_transitive() -> None:
+    a = EdgeSpec(target="a", id="a")
+    c = EdgeSpec(target="c", id="c", depends=["b"])
+    d = EdgeSpec(target="d", depends=["c"])
+
+    # edge "b" isn't followed, so "c" and "d" can't be joined
+    assert prune_unsatisfied_edges([a, c, d]) == [a]
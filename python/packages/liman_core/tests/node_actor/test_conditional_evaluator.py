@@ -1,3 +1,5 @@
+import asyncio
+from typing import Any
 from unittest.mock import Mock, patch
 
 import pytest
@@ -11,8 +13,31 @@ from liman_core.edge.dsl.transformer import (
     NotNode,
     VarNode,
 )
+from liman_core.edge.schemas import EdgeSpec
 from liman_core.errors import InvalidSpecError
-from liman_core.node_actor.conditional_evaluator import ConditionalEvaluator
+from liman_core.node_actor.conditional_evaluator import (
+    ConditionalEvaluator,
+    compile_condition,
+    diagnose_edges,
+    fold_constant,
+    resolve_function_ref,
+)
+from liman_core.node_actor.schemas import EdgeDiagnosticKind
+
+PREDICATES = "tests.node_actor.test_conditional_evaluator"
+
+
+def is_enabled() -> bool:
+    return True
+
+
+def is_success(context: dict[str, Any]) -> bool:
+    return bool(context["$output"]["result"] == "success")
+
+
+async def ais_success(context: dict[str, Any]) -> bool:
+    await asyncio.sleep(0)
+    return is_success(context)
 
 
 @pytest.fixture
@@ -330,3 +355,112 @@ def test_resolve_variable_not_found(evaluator: ConditionalEvaluator) -> None:
     assert "Variable 'nonexistent' not found in context or state.context" in str(
         exc_info.value
     )
+
+
+def test_compile_condition_is_cached() -> None:
+    condition = compile_condition(f"{PREDICATES}.is_enabled")
+
+    assert compile_condition(f"{PREDICATES}.is_enabled") is condition
+    assert condition.function_ref is not None
+    assert condition.function_ref.func is is_enabled
+    assert condition.is_async is False
+
+
+def test_compile_condition_expression() -> None:
+    condition = compile_condition("count > 5")
+
+    assert isinstance(condition.expr, ConditionalExprNode)
+    assert condition.function_ref is None
+
+
+def test_compile_condition_invalid_syntax() -> None:
+    with pytest.raises(InvalidSpecError, match="Invalid edge condition 'x =='"):
+        compile_condition("x ==")
+
+
+def test_compile_condition_unknown_function() -> None:
+    with pytest.raises(InvalidSpecError, match="Failed to import"):
+        compile_condition(f"{PREDICATES}.missing_predicate")
+
+
+def test_resolve_function_ref_detects_signature() -> None:
+    assert resolve_function_ref(f"{PREDICATES}.is_enabled").takes_context is False
+    assert resolve_function_ref(f"{PREDICATES}.is_success").takes_context is True
+    assert resolve_function_ref(f"{PREDICATES}.ais_success").is_async is True
+
+
+def test_evaluate_condition_with_context(evaluator: ConditionalEvaluator) -> None:
+    condition = compile_condition(f"{PREDICATES}.is_success")
+
+    assert evaluator.evaluate_condition(condition) is True
+
+    evaluator.context["$output"] = {"result": "failure"}
+    assert evaluator.evaluate_condition(condition) is False
+
+
+def test_evaluate_condition_async_predicate(evaluator: ConditionalEvaluator) -> None:
+    condition = compile_condition(f"{PREDICATES}.ais_success")
+
+    with pytest.raises(ValueError, match="is async, use aevaluate"):
+        evaluator.evaluate_condition(condition)
+
+
+async def test_aevaluate_async_predicate(evaluator: ConditionalEvaluator) -> None:
+    condition = compile_condition(f"{PREDICATES}.ais_success")
+
+    assert await evaluator.aevaluate(condition) is True
+
+
+async def test_aevaluate_expression(evaluator: ConditionalEvaluator) -> None:
+    condition = compile_condition("threshold > 10")
+
+    assert await evaluator.aevaluate(condition) is False
+
+
+@pytest.mark.parametrize(
+    ("when", "expected"),
+    [
+        ("true", True),
+        ("not false", True),
+        ("1 == 1", True),
+        ("'a' != 'a'", False),
+        ("x or true", True),
+        ("x && false", False),
+        ("(1 < 2) and (2 < 3)", True),
+        ("x", None),
+        ("x == 1 or false", None),
+        ("'a' > 1", None),
+    ],
+)
+def test_fold_constant(when: str, expected: bool | None) -> None:
+    assert fold_constant(compile_condition(when).expr) is expected
+
+
+def test_fold_constant_function_ref() -> None:
+    assert compile_condition(f"{PREDICATES}.is_enabled").constant is None
+
+
+def test_diagnose_edges() -> None:
+    edges = [
+        EdgeSpec(target="a", when="count > 1"),
+        EdgeSpec(target="b", when="true"),
+        EdgeSpec(target="c", when="1 == 2"),
+        EdgeSpec(target="d", when="count > 2", group="route"),
+        EdgeSpec(target="e", group="route"),
+        EdgeSpec(target="f", when="count > 3", group="route"),
+    ]
+
+    diagnostics = diagnose_edges(edges)
+
+    assert [(d.kind, d.edge.target) for d in diagnostics] == [
+        (EdgeDiagnosticKind.ALWAYS_TRUE, "b"),
+        (EdgeDiagnosticKind.ALWAYS_FALSE, "c"),
+        (EdgeDiagnosticKind.UNREACHABLE, "f"),
+    ]
+    assert "edge to 'e' of group 'route' always matches" in diagnostics[2].message
+
+
+def test_evaluate_condition_constant_skips_context() -> None:
+    evaluator = ConditionalEvaluator({}, {})
+
+    assert evaluator.evaluate_condition(compile_condition("missing or true")) is True
@@ -3,11 +3,15 @@ from unittest.mock import AsyncMock
 from uuid import uuid4
 
 import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
 
 from liman_core.node_actor import NodeActor, NodeActorError, NodeActorStatus
 from liman_core.node_actor.schemas import Result
 from liman_core.nodes.function_node.node import FunctionNode
+from liman_core.nodes.llm_node.memory import ConversationMemory
 from liman_core.nodes.llm_node.node import LLMNode
+from liman_core.nodes.llm_node.schemas import LLMNodeState, MemorySpec
 from liman_core.nodes.tool_node.node import ToolNode
 from liman_core.nodes.tool_node.schemas import ToolCall
 from liman_core.registry import Registry
@@ -159,3 +163,35 @@ def test_actor_serialize_state(llm_actor: NodeActor[LLMNode]) -> None:
     assert state["node_id"] == str(llm_actor.node.id)
     assert state["status"] == NodeActorStatus.READY.value
     assert "node_state" in state
+
+
+async def test_actor_execute_llm_node_streaming(llm_node: LLMNode) -> None:
+    chunks: list[AIMessageChunk] = []
+
+    async def on_chunk(chunk: AIMessageChunk) -> None:
+        chunks.append(chunk)
+
+    llm = GenericFakeChatModel(messages=iter([AIMessage("streamed answer")]))
+    actor = NodeActor(node=llm_node, llm=llm)
+    result = await actor.execute("test", uuid4(), on_chunk=on_chunk)
+
+    assert "".join(str(chunk.content) for chunk in chunks) == "streamed answer"
+    assert isinstance(result.output, AIMessage)
+    assert not isinstance(result.output, AIMessageChunk)
+    assert result.output.content == "streamed answer"
+    assert cast(LLMNodeState, actor.node_state).messages[-1] == result.output
+
+
+async def test_actor_execute_llm_node_bounds_memory(llm_node: LLMNode) -> None:
+    llm_node.memory = ConversationMemory(MemorySpec(max_messages=3))
+    actor = NodeActor(node=llm_node, llm=AsyncMock())
+
+    for i in range(3):
+        await actor.execute(f"message {i}", uuid4())
+
+    invoke = cast(AsyncMock, llm_node.invoke)
+    sent_messages = invoke.call_args.args[1]
+    # the history is compacted down to the low water mark, the current turn stays
+    assert [m.content for m in sent_messages] == ["message 2"]
+    node_state = cast(LLMNodeState, actor.node_state)
+    assert [m.content for m in node_state.messages] == ["message 2", "llm_result"]
@@ -7,12 +7,51 @@ import pytest
 from langchain_core.language_models.chat_models import BaseChatModel
 
 from liman_core.edge.schemas import EdgeSpec
-from liman_core.node_actor import NodeActor, NodeActorStatus
+from liman_core.node_actor import NodeActor, NodeActorError, NodeActorStatus
+from liman_core.node_actor.conditional_evaluator import ConditionalEvaluator
+from liman_core.node_actor.schemas import EdgeDiagnosticKind
 from liman_core.nodes.function_node.node import FunctionNode
 from liman_core.nodes.llm_node.node import LLMNode
 from liman_core.nodes.tool_node.node import ToolNode
 from liman_core.registry import Registry
 
+PREDICATES = "tests.node_actor.test_node_actor_additional"
+
+_predicate_calls: list[str] = []
+
+
+async def _await_both_predicates(name: str) -> bool:
+    # serialized predicates would never see each other
+    _predicate_calls.append(name)
+    while len(_predicate_calls) < 2:
+        await asyncio.sleep(0)
+    return name == "first"
+
+
+_checked_routes: list[str] = []
+
+
+def is_route_a(context: dict[str, Any]) -> bool:
+    _checked_routes.append("a")
+    return bool(context["$output"].get("route") == "a")
+
+
+def is_route_b(context: dict[str, Any]) -> bool:
+    _checked_routes.append("b")
+    return bool(context["$output"].get("route") == "b")
+
+
+async def ais_route_b(context: dict[str, Any]) -> bool:
+    return is_route_b(context)
+
+
+async def afirst_predicate(context: dict[str, Any]) -> bool:
+    return await _await_both_predicates("first")
+
+
+async def asecond_predicate() -> bool:
+    return await _await_both_predicates("second")
+
 
 def test_can_restore_tool_node_ready(tool_node: ToolNode) -> None:
     saved_state = {"status": NodeActorStatus.READY}
@@ -115,13 +154,9 @@ def test_should_follow_edge_no_condition(
     function_actor: NodeActor[FunctionNode],
 ) -> None:
     edge = EdgeSpec(target="target_node")
-    context: dict[str, Any] = {}
-    state_context: dict[str, Any] = {}
-    transformer = Mock()
+    evaluator = ConditionalEvaluator({}, {})
 
-    result = function_actor._should_follow_edge(
-        edge, context, state_context, transformer
-    )
+    result = function_actor._should_follow_edge(edge, evaluator)
 
     assert result is True
 
@@ -129,46 +164,34 @@ def test_should_follow_edge_no_condition(
 def test_should_follow_edge_with_valid_condition(
     function_actor: NodeActor[FunctionNode],
 ) -> None:
-    edge = EdgeSpec(target="target_node", when="true")
-    context: dict[str, Any] = {}
-    state_context: dict[str, Any] = {}
-
-    with (
-        patch("liman_core.node_actor.actor.when_parser") as mock_parser,
-        patch("liman_core.node_actor.actor.ConditionalEvaluator") as mock_evaluator,
-    ):
-        mock_tree = Mock()
-        mock_ast = Mock()
-        mock_parser.parse.return_value = mock_tree
-        transformer = Mock()
-        transformer.transform.return_value = mock_ast
-        mock_evaluator_instance = Mock()
-        mock_evaluator_instance.evaluate.return_value = True
-        mock_evaluator.return_value = mock_evaluator_instance
-
-        result = function_actor._should_follow_edge(
-            edge, context, state_context, transformer
-        )
+    edge = EdgeSpec(target="target_node", when="count > 5")
+    evaluator = ConditionalEvaluator({}, {"count": 10})
 
-        assert result is True
+    result = function_actor._should_follow_edge(edge, evaluator)
 
+    assert result is True
 
-def test_should_follow_edge_with_exception(
+
+def test_should_follow_edge_with_invalid_syntax(
     function_actor: NodeActor[FunctionNode],
 ) -> None:
-    edge = EdgeSpec(target="target_node", when="invalid_syntax")
-    context: dict[str, Any] = {}
-    state_context: dict[str, Any] = {}
+    edge = EdgeSpec(target="target_node", when="x ==")
+    evaluator = ConditionalEvaluator({}, {})
 
-    with patch("liman_core.node_actor.actor.when_parser") as mock_parser:
-        mock_parser.parse.side_effect = Exception("Parse error")
-        transformer = Mock()
+    result = function_actor._should_follow_edge(edge, evaluator)
+
+    assert result is False
 
-        result = function_actor._should_follow_edge(
-            edge, context, state_context, transformer
-        )
 
-        assert result is False
+def test_should_follow_edge_with_exception(
+    function_actor: NodeActor[FunctionNode],
+) -> None:
+    edge = EdgeSpec(target="target_node", when="missing == 1")
+    evaluator = ConditionalEvaluator({}, {})
+
+    result = function_actor._should_follow_edge(edge, evaluator)
+
+    assert result is False
 
 
 def test_prepare_execution_context(function_actor: NodeActor[FunctionNode]) -> None:
@@ -225,3 +248,180 @@ def test_node_actor_error_property(function_actor: NodeActor[FunctionNode]) -> N
 
 def test_node_actor_execution_lock(function_actor: NodeActor[FunctionNode]) -> None:
     assert isinstance(function_actor._execution_lock, asyncio.Lock)
+
+
+def _create_tool_node_with_edges(
+    registry: Registry, llm_nodes: list[dict[str, Any]]
+) -> ToolNode:
+    for edge in llm_nodes:
+        LLMNode.from_dict(
+            {"kind": "LLMNode", "name": edge["target"], "prompts": {"en": "hi"}},
+            registry,
+        )
+    node = ToolNode.from_dict(
+        {"kind": "ToolNode", "name": "dag_tool", "llm_nodes": llm_nodes}, registry
+    )
+    node.set_func(lambda: "ok")
+    return node
+
+
+async def test_get_next_nodes_attaches_edges(registry: Registry) -> None:
+    node = _create_tool_node_with_edges(
+        registry,
+        [
+            {"target": "first", "id": "first"},
+            {"target": "second", "depends": ["first"]},
+        ],
+    )
+    actor = NodeActor.create(node)
+
+    next_nodes = await actor._get_next_nodes({"result": "ok"})
+
+    assert [n.node.name for n in next_nodes] == ["first", "second"]
+    assert [n.edge.id_ if n.edge else None for n in next_nodes] == ["first", None]
+    assert next_nodes[1].edge is not None
+    assert next_nodes[1].edge.depends == ["first"]
+
+
+async def test_get_next_nodes_prunes_unsatisfied_dependencies(
+    registry: Registry,
+) -> None:
+    node = _create_tool_node_with_edges(
+        registry,
+        [
+            {"target": "first", "id": "first", "when": "false"},
+            {"target": "second", "depends": ["first"]},
+            {"target": "third"},
+        ],
+    )
+    actor = NodeActor.create(node)
+
+    next_nodes = await actor._get_next_nodes({"result": "ok"})
+
+    assert [n.node.name for n in next_nodes] == ["third"]
+
+
+def test_actor_initialization_fails_on_invalid_dependencies(
+    registry: Registry,
+) -> None:
+    node = _create_tool_node_with_edges(
+        registry, [{"target": "first", "depends": ["missing"]}]
+    )
+
+    with pytest.raises(NodeActorError, match="unknown edge id 'missing'"):
+        NodeActor.create(node)
+
+
+def test_actor_initialization_fails_on_llm_node_dependencies(
+    registry: Registry,
+) -> None:
+    node = LLMNode.from_dict(
+        {
+            "kind": "LLMNode",
+            "name": "dag_llm",
+            "prompts": {"system": {"en": "hi"}},
+            "nodes": [
+                {"target": "first", "id": "first"},
+                {"target": "second", "depends": ["first"]},
+            ],
+        },
+        registry,
+    )
+
+    with pytest.raises(NodeActorError, match="supported only by ToolNode edges"):
+        NodeActor.create(node)
+
+
+async def test_get_next_nodes_awaits_async_predicates_concurrently(
+    registry: Registry,
+) -> None:
+    _predicate_calls.clear()
+    node = _create_tool_node_with_edges(
+        registry,
+        [
+            {"target": "first", "when": f"{PREDICATES}.afirst_predicate"},
+            {"target": "second", "when": f"{PREDICATES}.asecond_predicate"},
+            {"target": "third", "when": "true"},
+        ],
+    )
+    actor = NodeActor.create(node)
+
+    next_nodes = await asyncio.wait_for(actor._get_next_nodes({"result": "ok"}), 1)
+
+    assert sorted(_predicate_calls) == ["first", "second"]
+    assert [n.node.name for n in next_nodes] == ["first", "third"]
+
+
+def test_actor_initialization_fails_on_unknown_predicate(registry: Registry) -> None:
+    node = _create_tool_node_with_edges(
+        registry, [{"target": "first", "when": f"{PREDICATES}.missing_predicate"}]
+    )
+
+    with pytest.raises(NodeActorError, match="Failed to import"):
+        NodeActor.create(node)
+
+
+@pytest.mark.parametrize("predicate", ["is_route_b", "ais_route_b"])
+async def test_get_next_nodes_first_match_group(
+    registry: Registry, predicate: str
+) -> None:
+    _checked_routes.clear()
+    node = _create_tool_node_with_edges(
+        registry,
+        [
+            {"target": "a", "when": f"{PREDICATES}.is_route_a", "group": "route"},
+            {"target": "b", "when": f"{PREDICATES}.{predicate}", "group": "route"},
+            {"target": "fallback", "group": "route"},
+            {"target": "audit"},
+        ],
+    )
+    actor = NodeActor.create(node)
+
+    next_nodes = await actor._get_next_nodes({"route": "a"})
+
+    assert [n.node.name for n in next_nodes] == ["a", "audit"]
+    assert _checked_routes == ["a"]
+
+    next_nodes = await actor._get_next_nodes({"route": "c"})
+
+    assert [n.node.name for n in next_nodes] == ["fallback", "audit"]
+    assert _checked_routes == ["a", "a", "b"]
+
+
+async def test_get_next_nodes_reports_evaluation_errors(registry: Registry) -> None:
+    node = _create_tool_node_with_edges(
+        registry,
+        [
+            {"target": "first", "when": "missing == 1"},
+            {"target": "second"},
+        ],
+    )
+    actor = NodeActor.create(node)
+
+    next_nodes = await actor._get_next_nodes({"result": "ok"})
+    # a repeated failure is reported once
+    await actor._get_next_nodes({"result": "ok"})
+
+    assert [n.node.name for n in next_nodes] == ["second"]
+    assert len(actor.diagnostics) == 1
+    diagnostic = actor.diagnostics[0]
+    assert diagnostic.kind == EdgeDiagnosticKind.EVALUATION_ERROR
+    assert diagnostic.edge.target == "first"
+    assert "Variable 'missing' not found" in diagnostic.message
+
+
+def test_actor_initialization_reports_static_diagnostics(registry: Registry) -> None:
+    node = _create_tool_node_with_edges(
+        registry,
+        [
+            {"target": "first", "when": "true", "group": "route"},
+            {"target": "second", "when": "count > 1", "group": "route"},
+        ],
+    )
+
+    actor = NodeActor.create(node)
+
+    assert [d.kind for d in actor.diagnostics] == [
+        EdgeDiagnosticKind.ALWAYS_TRUE,
+        EdgeDiagnosticKind.UNREACHABLE,
+    ]
@@ -129,7 +129,7 @@ def test_create_extended_spec_multiple_plugins(registry: Registry) -> None:
     assert "field2" in result.model_fields
 
 
-@patch("liman_core.base.component.rich_print")
+@patch("rich.print")
 def test_component_print_spec_initial_false(
     mock_print: Mock, registry: Registry
 ) -> None:
@@ -143,7 +143,7 @@ def test_component_print_spec_initial_false(
     mock_print.assert_called_once()
 
 
-@patch("liman_core.base.component.rich_print")
+@patch("rich.print")
 def test_component_print_spec_initial_true(
     mock_print: Mock, registry: Registry
 ) -> None:
@@ -0,0 +1,44 @@
+import asyncio
+import time
+
+import pytest
+
+from liman_core.errors import NodeTimeoutError
+from liman_core.nodes.function_node.node import FunctionNode
+from liman_core.registry import Registry
+
+
+async def slow_func(value: str) -> str:
+    await asyncio.sleep(1)
+    return value
+
+
+def slow_sync_func(value: str) -> str:
+    time.sleep(0.1)
+    return value
+
+
+def create_node(
+    registry: Registry, func: object, timeout: float | None
+) -> FunctionNode:
+    node = FunctionNode.from_dict(
+        {"kind": "FunctionNode", "name": "slow", "timeout": timeout}, registry
+    )
+    node.set_func(func)  # type: ignore[arg-type]
+    return node
+
+
+@pytest.mark.asyncio
+async def test_invoke_without_timeout(registry: Registry) -> None:
+    node = create_node(registry, slow_sync_func, None)
+
+    assert await node.invoke({"value": "done"}) == "done"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("func", [slow_func, slow_sync_func])
+async def test_invoke_timeout_raises_error(registry: Registry, func: object) -> None:
+    node = create_node(registry, func, 0.01)
+
+    with pytest.raises(NodeTimeoutError, match="timed out after 0.01 seconds"):
+        await node.invoke({"value": "done"})
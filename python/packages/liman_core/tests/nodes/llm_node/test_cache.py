@@ -0,0 +1,149 @@
+from pathlib import Path
+from unittest.mock import patch
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from liman_core.nodes.llm_node.cache import (
+    InMemoryLLMCache,
+    SQLiteLLMCache,
+    get_llm_cache_key,
+)
+from liman_core.nodes.llm_node.node import LLMNode
+from liman_core.registry import Registry
+
+TOOLS = [{"name": "weather", "parameters": {"type": "object", "properties": {}}}]
+
+
+def _llm(*responses: str) -> GenericFakeChatModel:
+    return GenericFakeChatModel(messages=iter([AIMessage(r) for r in responses]))
+
+
+def test_cache_key_is_stable() -> None:
+    messages = [SystemMessage("system"), HumanMessage("hi")]
+
+    key = get_llm_cache_key(_llm(), messages, TOOLS)
+
+    assert key == get_llm_cache_key(
+        _llm(), [SystemMessage("system"), HumanMessage("hi", id="other")], TOOLS
+    )
+    assert key != get_llm_cache_key(_llm(), messages, [])
+    assert key != get_llm_cache_key(_llm(), [*messages, HumanMessage("hi")], TOOLS)
+
+
+async def test_in_memory_cache_roundtrip() -> None:
+    cache = InMemoryLLMCache()
+    message = AIMessage(
+        "cached",
+        usage_metadata={"input_tokens": 3, "output_tokens": 2, "total_tokens": 5},
+    )
+
+    assert await cache.aget("key") is None
+    await cache.aset("key", message)
+    cached = await cache.aget("key")
+
+    assert cached == message
+    assert cached is not message
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_ratio == 0.5
+
+
+async def test_in_memory_cache_lru_eviction() -> None:
+    cache = InMemoryLLMCache(max_entries=2)
+    for key in ("a", "b"):
+        await cache.aset(key, AIMessage(key))
+
+    await cache.aget("a")
+    await cache.aset("c", AIMessage("c"))
+
+    assert len(cache) == 2
+    assert await cache.aget("b") is None
+    assert await cache.aget("a") is not None
+
+
+async def test_cache_ttl_expiration() -> None:
+    cache = InMemoryLLMCache(ttl=10)
+    with patch("liman_core.nodes.llm_node.cache.time.time", return_value=100):
+        await cache.aset("key", AIMessage("cached"))
+
+    with patch("liman_core.nodes.llm_node.cache.time.time", return_value=105):
+        assert await cache.aget("key") is not None
+    with patch("liman_core.nodes.llm_node.cache.time.time", return_value=111):
+        assert await cache.aget("key") is None
+    assert len(cache) == 0
+
+
+async def test_sqlite_cache_persists_entries(tmp_path: Path) -> None:
+    path = tmp_path / "cache" / "llm.sqlite"
+    await SQLiteLLMCache(path).aset("key", AIMessage("persisted"))
+
+    cached = await SQLiteLLMCache(path).aget("key")
+
+    assert cached is not None
+    assert cached.content == "persisted"
+
+
+async def test_sqlite_cache_evicts_oldest_entries(tmp_path: Path) -> None:
+    cache = SQLiteLLMCache(tmp_path / "llm.sqlite", max_entries=2)
+    for i in range(3):
+        with patch("liman_core.nodes.llm_node.cache.time.time", return_value=100 + i):
+            await cache.aset(f"key_{i}", AIMessage(f"answer {i}"))
+
+    assert len(cache) == 2
+    assert await cache.aget("key_0") is None
+    assert await cache.aget("key_2") is not None
+
+
+async def test_sqlite_cache_purges_expired_entries(tmp_path: Path) -> None:
+    path = tmp_path / "llm.sqlite"
+    cache = SQLiteLLMCache(path, ttl=10)
+    with patch("liman_core.nodes.llm_node.cache.time.time", return_value=100):
+        await cache.aset("stale", AIMessage("stale"))
+    with patch("liman_core.nodes.llm_node.cache.time.time", return_value=105):
+        await cache.aset("fresh", AIMessage("fresh"))
+
+    with patch("liman_core.nodes.llm_node.cache.time.time", return_value=112):
+        # expired entries are purged on open, not only when read again
+        assert len(SQLiteLLMCache(path, ttl=10)) == 1
+
+
+async def test_llmnode_invoke_uses_cache(registry: Registry) -> None:
+    node = LLMNode.from_dict(
+        {"kind": "LLMNode", "name": "cached", "prompts": {"system": {"en": "Hi"}}},
+        registry,
+    )
+    node.compile()
+    cache = InMemoryLLMCache()
+
+    first = await node.invoke(_llm("first"), [HumanMessage("q")], cache=cache)
+    second = await node.invoke(_llm("second"), [HumanMessage("q")], cache=cache)
+    other = await node.invoke(_llm("third"), [HumanMessage("other q")], cache=cache)
+
+    assert first.content == "first"
+    assert second.content == "first"
+    assert other.content == "third"
+    assert cache.hits == 1
+
+
+async def test_llmnode_astream_uses_cache(registry: Registry) -> None:
+    node = LLMNode.from_dict(
+        {"kind": "LLMNode", "name": "cached", "prompts": {"system": {"en": "Hi"}}},
+        registry,
+    )
+    node.compile()
+    cache = InMemoryLLMCache()
+
+    streamed = [
+        chunk
+        async for chunk in node.astream(
+            _llm("streamed answer"), [HumanMessage("q")], cache=cache
+        )
+    ]
+    cached = [
+        chunk
+        async for chunk in node.astream(_llm("other"), [HumanMessage("q")], cache=cache)
+    ]
+
+    assert len(streamed) > 1
+    assert len(cached) == 1
+    assert cached[0].content == "streamed answer"
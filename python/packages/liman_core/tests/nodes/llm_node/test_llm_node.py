@@ -1,6 +1,9 @@
 import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
 from pydantic import ValidationError
 
+from liman_core.errors import LimanError
 from liman_core.nodes.llm_node.node import LLMNode
 from liman_core.registry import Registry
 
@@ -48,3 +51,37 @@ def test_llmnode_parses_style_2(registry: Registry) -> None:
 def test_llmnode_invalid_yaml_raises(registry: Registry) -> None:
     with pytest.raises(ValidationError):
         LLMNode.from_dict(INVALID_YAML, registry)
+
+
+async def test_llmnode_astream_yields_chunks(registry: Registry) -> None:
+    node = LLMNode.from_dict(YAML_STYLE_1, registry)
+    node.compile()
+    llm = GenericFakeChatModel(messages=iter([AIMessage("Hello there")]))
+
+    chunks = [chunk async for chunk in node.astream(llm, [HumanMessage("Hi")])]
+
+    assert len(chunks) > 1
+    assert all(isinstance(chunk, AIMessageChunk) for chunk in chunks)
+    assert "".join(str(chunk.content) for chunk in chunks) == "Hello there"
+
+
+async def test_llmnode_astream_requires_compile(registry: Registry) -> None:
+    node = LLMNode.from_dict(YAML_STYLE_1, registry)
+    llm = GenericFakeChatModel(messages=iter([AIMessage("Hello there")]))
+
+    with pytest.raises(LimanError, match="must be compiled"):
+        [chunk async for chunk in node.astream(llm, [HumanMessage("Hi")])]
+
+
+def test_llmnode_compile_precomputes_prompts(registry: Registry) -> None:
+    node = LLMNode.from_dict(YAML_STYLE_1, registry)
+    node.compile()
+
+    system_message, tools = node._prepare_request("en")
+    same_system_message, _ = node._prepare_request("en")
+    fallback_message, _ = node._prepare_request("de")
+
+    assert system_message is same_system_message
+    assert system_message == node.prompts.to_system_message("en")
+    assert fallback_message is node.compiled_prompts["en"].system_message
+    assert tools == []
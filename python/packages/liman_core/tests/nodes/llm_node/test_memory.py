@@ -0,0 +1,173 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from liman_core.errors import LimanError
+from liman_core.nodes.base.schemas import LangChainMessage
+from liman_core.nodes.llm_node.memory import SUMMARY_PREFIX, ConversationMemory
+from liman_core.nodes.llm_node.schemas import MemorySpec
+
+
+def _conversation() -> list[LangChainMessage]:
+    return [
+        HumanMessage(content="task"),
+        AIMessage(content="first answer"),
+        HumanMessage(content="what is the weather?"),
+        AIMessage(
+            content="",
+            tool_calls=[{"name": "weather", "args": {}, "id": "call_1"}],
+        ),
+        ToolMessage(content="sunny", tool_call_id="call_1"),
+        AIMessage(content="It is sunny"),
+        HumanMessage(content="thanks"),
+    ]
+
+
+def _count_messages(messages: object) -> int:
+    return len(messages)  # type: ignore[arg-type]
+
+
+async def test_memory_keeps_everything_within_limits() -> None:
+    memory = ConversationMemory(MemorySpec(max_messages=10))
+    messages = _conversation()
+
+    compaction = await memory.acompact(messages)
+
+    assert compaction.messages == messages
+    assert compaction.dropped_messages == 0
+    assert compaction.tokens_saved == 0
+
+
+async def test_memory_window_drops_whole_turns() -> None:
+    memory = ConversationMemory(MemorySpec(max_messages=4, low_water=1))
+
+    compaction = await memory.acompact(_conversation())
+
+    # the weather turn doesn't fit, its tool call and result are dropped together
+    assert [m.content for m in compaction.messages] == ["thanks"]
+    assert compaction.dropped_messages == 6
+    assert compaction.tokens_saved > 0
+
+
+async def test_memory_window_by_tokens() -> None:
+    memory = ConversationMemory(
+        MemorySpec(max_tokens=5, low_water=1), token_counter=_count_messages
+    )
+
+    compaction = await memory.acompact(_conversation())
+
+    assert [m.content for m in compaction.messages] == [
+        "what is the weather?",
+        "",
+        "sunny",
+        "It is sunny",
+        "thanks",
+    ]
+    assert compaction.tokens_before == 7
+    assert compaction.tokens_after == 5
+
+
+async def test_memory_keeps_current_turn_during_tool_loop() -> None:
+    messages: list[LangChainMessage] = [
+        HumanMessage(content="hi"),
+        AIMessage(content="hello"),
+        HumanMessage(content="What is weather in Paris?"),
+        AIMessage(content="", tool_calls=[{"name": "geo", "args": {}, "id": "call_1"}]),
+        ToolMessage(content="48.8,2.3", tool_call_id="call_1"),
+        AIMessage(
+            content="", tool_calls=[{"name": "weather", "args": {}, "id": "call_2"}]
+        ),
+        ToolMessage(content="sunny", tool_call_id="call_2"),
+    ]
+    memory = ConversationMemory(MemorySpec(max_messages=3))
+
+    compaction = await memory.acompact(messages)
+
+    assert compaction.messages == messages[2:]
+    assert isinstance(compaction.messages[0], HumanMessage)
+
+
+async def test_memory_compacts_to_low_water() -> None:
+    memory = ConversationMemory(MemorySpec(max_messages=4))
+
+    compaction = await memory.acompact(_conversation())
+    assert [m.content for m in compaction.messages] == ["thanks"]
+
+    # the following turns fit without another compaction
+    messages = [
+        *compaction.messages,
+        AIMessage(content="welcome"),
+        HumanMessage(content="bye"),
+    ]
+    compaction = await memory.acompact(messages)
+
+    assert compaction.messages == messages
+    assert compaction.dropped_messages == 0
+
+
+async def test_memory_keeps_latest_message_above_limit() -> None:
+    memory = ConversationMemory(MemorySpec(max_tokens=1), token_counter=lambda _: 100)
+
+    compaction = await memory.acompact(_conversation())
+
+    assert [m.content for m in compaction.messages] == ["thanks"]
+
+
+async def test_memory_pinned_messages() -> None:
+    messages = _conversation()
+    messages[1].additional_kwargs["pinned"] = True
+    memory = ConversationMemory(MemorySpec(max_messages=3, pinned=1))
+
+    compaction = await memory.acompact(messages)
+
+    assert [m.content for m in compaction.messages] == [
+        "task",
+        "first answer",
+        "thanks",
+    ]
+
+
+async def test_memory_summarizes_dropped_messages() -> None:
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content="user asked weather")]))
+    memory = ConversationMemory(MemorySpec(max_messages=2, summarize=True))
+
+    compaction = await memory.acompact(_conversation(), llm)
+
+    summary = compaction.messages[0]
+    assert summary.content == SUMMARY_PREFIX + "user asked weather"
+    assert summary.additional_kwargs["summary"] is True
+    assert [m.content for m in compaction.messages[1:]] == ["thanks"]
+
+
+async def test_memory_folds_previous_summary() -> None:
+    llm = Mock()
+    llm.ainvoke = AsyncMock(return_value=AIMessage(content="new summary"))
+    memory = ConversationMemory(MemorySpec(max_messages=3, summarize=True))
+    previous = HumanMessage(
+        content=SUMMARY_PREFIX + "old summary", additional_kwargs={"summary": True}
+    )
+    messages: list[LangChainMessage] = [
+        previous,
+        HumanMessage(content="question"),
+        AIMessage(content="answer"),
+        HumanMessage(content="next question"),
+    ]
+
+    compaction = await memory.acompact(messages, llm)
+
+    summarized = llm.ainvoke.call_args.args[0][1].content
+    assert "old summary" in summarized
+    assert "answer" in summarized
+    assert [m.content for m in compaction.messages] == [
+        SUMMARY_PREFIX + "new summary",
+        "next question",
+    ]
+
+
+async def test_memory_summarize_requires_llm() -> None:
+    memory = ConversationMemory(MemorySpec(max_messages=1, summarize=True))
+
+    with pytest.raises(LimanError, match="LLM is required"):
+        await memory.acompact(_conversation())
@@ -0,0 +1,40 @@
+from types import MappingProxyType
+
+from langchain_core.messages import SystemMessage
+
+from liman_core.nodes.llm_node.prompt import CompiledPrompt
+
+SCHEMAS = {
+    "a": {"type": "function", "function": {"name": "a"}},
+    "b": {"type": "function", "function": {"name": "b"}},
+}
+
+
+def _prompt() -> CompiledPrompt:
+    return CompiledPrompt(
+        system_message=SystemMessage(content="You are a helpful assistant."),
+        tools_jsonschema=tuple(SCHEMAS.values()),
+        tool_schemas=MappingProxyType(SCHEMAS),
+        tool_descriptions=MappingProxyType({"a": "Tool a", "b": "Tool b"}),
+    )
+
+
+def test_compiled_prompt_build_all_tools() -> None:
+    prompt = _prompt()
+
+    system_message, tools = prompt.build()
+
+    assert system_message is prompt.system_message
+    assert tools == list(SCHEMAS.values())
+
+
+def test_compiled_prompt_build_selected_tools_keeps_stable_prefix() -> None:
+    prompt = _prompt()
+
+    system_message, tools = prompt.build(["b"])
+
+    assert system_message.content == [
+        {"type": "text", "text": "You are a helpful assistant."},
+        {"type": "text", "text": "Tool b"},
+    ]
+    assert tools == [SCHEMAS["b"]]
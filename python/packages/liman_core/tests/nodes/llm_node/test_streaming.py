@@ -0,0 +1,51 @@
+from langchain_core.messages import AIMessageChunk
+
+from liman_core.nodes.llm_node.streaming import ToolCallChunkAccumulator
+
+
+def _chunk(*tool_call_chunks: dict[str, object]) -> AIMessageChunk:
+    return AIMessageChunk(content="", tool_call_chunks=list(tool_call_chunks))
+
+
+def test_accumulator_reports_tool_call_when_args_complete() -> None:
+    accumulator = ToolCallChunkAccumulator()
+
+    assert accumulator.add(_chunk({"name": "search", "id": "call_1", "index": 0})) == []
+    assert accumulator.add(_chunk({"args": '{"query": "li', "index": 0})) == []
+
+    completed = accumulator.add(_chunk({"args": 'man"}', "index": 0}))
+
+    assert completed == [
+        {
+            "name": "search",
+            "args": {"query": "liman"},
+            "id": "call_1",
+            "type": "tool_call",
+        }
+    ]
+
+
+def test_accumulator_reports_each_tool_call_once() -> None:
+    accumulator = ToolCallChunkAccumulator()
+
+    first = accumulator.add(
+        _chunk(
+            {"name": "a", "args": "{}", "id": "call_1", "index": 0},
+            {"name": "b", "args": '{"x": ', "id": "call_2", "index": 1},
+        )
+    )
+    second = accumulator.add(_chunk({"args": "1}", "index": 1}))
+    third = accumulator.add(_chunk({"args": "", "index": 0}))
+
+    assert [tool_call["id"] for tool_call in first] == ["call_1"]
+    assert [tool_call["id"] for tool_call in second] == ["call_2"]
+    assert third == []
+
+
+def test_accumulator_ignores_non_object_args() -> None:
+    accumulator = ToolCallChunkAccumulator()
+
+    assert (
+        accumulator.add(_chunk({"name": "a", "args": "[1]", "id": "1", "index": 0}))
+        == []
+    )
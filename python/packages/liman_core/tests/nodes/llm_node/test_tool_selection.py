@@ -0,0 +1,126 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from liman_core.errors import InvalidSpecError
+from liman_core.nodes.llm_node.node import LLMNode
+from liman_core.nodes.llm_node.schemas import ToolSelectionSpec
+from liman_core.nodes.llm_node.tool_selection import (
+    BM25Index,
+    ToolSelector,
+    get_turn_query,
+    tokenize,
+)
+from liman_core.nodes.tool_node.node import ToolNode
+from liman_core.registry import Registry
+
+TOOLS = {
+    "get_weather": "Get the current weather forecast for a city",
+    "send_email": "Send an email message to a recipient",
+    "search_flights": "Search for available flights between two cities",
+    "convert_currency": "Convert an amount of money into another currency",
+}
+
+
+def test_tokenize_splits_identifiers() -> None:
+    assert tokenize("getWeather send_email, Hello!") == [
+        "get",
+        "weather",
+        "send",
+        "email",
+        "hello",
+    ]
+
+
+def test_bm25_ranks_matching_documents() -> None:
+    index = BM25Index(list(TOOLS.values()))
+
+    scores = index.score("what is the weather in Paris?")
+
+    assert scores[0] > 0
+    assert scores[1:] == [0.0, 0.0, 0.0]
+
+
+def test_selector_returns_top_k_with_pinned_tools() -> None:
+    selector = ToolSelector(
+        ToolSelectionSpec(top_k=1, pinned=["send_email"]),
+        {name: f"{name}\n{desc}" for name, desc in TOOLS.items()},
+        dict.fromkeys(TOOLS, 10),
+    )
+
+    selection = selector.select("find flights from Paris to Rome")
+
+    assert selection.tools == ["send_email", "search_flights"]
+    assert selection.tokens_total == 40
+    assert selection.tokens_saved == 20
+
+
+def test_selector_falls_back_to_all_tools() -> None:
+    selector = ToolSelector(
+        ToolSelectionSpec(top_k=1), dict(TOOLS), dict.fromkeys(TOOLS, 10)
+    )
+
+    selection = selector.select("hello there")
+
+    assert selection.tools == list(TOOLS)
+    assert selection.tokens_saved == 0
+
+
+def test_get_turn_query_starts_from_last_human_message() -> None:
+    messages = [
+        HumanMessage("old question"),
+        AIMessage("old answer"),
+        HumanMessage("weather in Paris"),
+        AIMessage("", tool_calls=[{"name": "get_weather", "args": {}, "id": "call_1"}]),
+        ToolMessage("sunny", tool_call_id="call_1"),
+    ]
+
+    query, called = get_turn_query(messages)
+
+    assert query == "weather in Paris\n\nsunny"
+    assert called == ["get_weather"]
+
+
+def _create_node(registry: Registry, tool_selection: dict[str, object]) -> LLMNode:
+    for name, description in TOOLS.items():
+        ToolNode.from_dict(
+            {
+                "kind": "ToolNode",
+                "name": name,
+                "description": {"en": description},
+                "func": "builtins.print",
+            },
+            registry,
+        )
+    return LLMNode.from_dict(
+        {
+            "kind": "LLMNode",
+            "name": "assistant",
+            "prompts": {"system": {"en": "You are a helpful assistant."}},
+            "tools": list(TOOLS),
+            "tool_selection": tool_selection,
+        },
+        registry,
+    )
+
+
+def test_llmnode_sends_only_selected_tools(registry: Registry) -> None:
+    node = _create_node(registry, {"top_k": 1, "pinned": ["send_email"]})
+    node.compile()
+
+    system_message, tools = node._prepare_request(
+        "en", [HumanMessage("what's the weather in Paris?")]
+    )
+
+    assert [tool["function"]["name"] for tool in tools] == [
+        "get_weather",
+        "send_email",
+    ]
+    assert "Get the current weather" in system_message.text()
+    assert "Search for available flights" not in system_message.text()
+
+
+def test_llmnode_pinned_tool_must_be_declared(registry: Registry) -> None:
+    node = _create_node(registry, {"pinned": ["unknown"]})
+
+    with pytest.raises(InvalidSpecError, match="Pinned tool 'unknown'"):
+        node.compile()
@@ -0,0 +1,230 @@
+import asyncio
+from typing import Any
+from uuid import uuid4
+
+import pytest
+
+from liman_core.nodes.base.execution_context import ExecutionContext
+from liman_core.nodes.tool_node.cache import ToolResultCache
+from liman_core.nodes.tool_node.node import ToolNode
+from liman_core.nodes.tool_node.schemas import ToolCacheSpec, ToolCall
+from liman_core.registry import Registry
+
+calls: list[str] = []
+
+
+async def get_city(city: str, lang: str = "en") -> str:
+    calls.append(city)
+    await asyncio.sleep(0.01)
+    return f"{city}:{lang}"
+
+
+def failing_lookup(city: str) -> str:
+    calls.append(city)
+    raise ValueError(f"Unknown city {city}")
+
+
+@pytest.fixture(autouse=True)
+def reset_calls() -> None:
+    calls.clear()
+
+
+@pytest.fixture
+def tool_decl() -> dict[str, Any]:
+    return {
+        "kind": "ToolNode",
+        "name": "get_city",
+        "description": {"en": "Get city info"},
+        "arguments": [
+            {"name": "city", "type": "str"},
+            {"name": "lang", "type": "str", "optional": True},
+        ],
+        "cache": {"ttl": 60, "max_entries": 2, "scope": "global"},
+    }
+
+
+def create_node(decl: dict[str, Any], registry: Registry, func: Any) -> ToolNode:
+    node = ToolNode.from_dict(decl, registry)
+    node.set_func(func)
+    node.compile()
+    return node
+
+
+def tool_call(id_: str, **args: Any) -> ToolCall:
+    return ToolCall(name="get_city", args=args, id=id_)
+
+
+def execution_context(**kwargs: Any) -> ExecutionContext[Any]:
+    return ExecutionContext(None, **{"execution_id": uuid4(), **kwargs})
+
+
+def test_key_is_canonical() -> None:
+    cache = ToolResultCache(ToolCacheSpec(scope="global"))
+
+    assert cache.get_key({"a": 1, "b": {"c": 2, "d": 3}}) == cache.get_key(
+        {"b": {"d": 3, "c": 2}, "a": 1}
+    )
+    assert cache.get_key({"a": 1}) != cache.get_key({"a": 2})
+
+
+def test_key_uses_only_key_fields() -> None:
+    cache = ToolResultCache(ToolCacheSpec(key=["city"], scope="global"))
+
+    assert cache.get_key({"city": "Paris", "trace": 1}) == cache.get_key(
+        {"city": "Paris", "trace": 2}
+    )
+
+
+def test_key_scope() -> None:
+    root_execution_id = uuid4()
+    execution_cache = ToolResultCache(ToolCacheSpec(scope="execution"))
+    session_cache = ToolResultCache(ToolCacheSpec(scope="session"))
+    args = {"city": "Paris"}
+
+    # child executors of the same execution tree share entries
+    assert execution_cache.get_key(
+        args, execution_context(root_execution_id=root_execution_id)
+    ) == execution_cache.get_key(
+        args, execution_context(root_execution_id=root_execution_id)
+    )
+    assert execution_cache.get_key(args, execution_context()) != (
+        execution_cache.get_key(args, execution_context())
+    )
+
+    assert session_cache.get_key(
+        args, execution_context(session_id="s1")
+    ) == session_cache.get_key(args, execution_context(session_id="s1"))
+    assert session_cache.get_key(
+        args, execution_context(session_id="s1")
+    ) != session_cache.get_key(args, execution_context(session_id="s2"))
+
+
+async def test_invoke_reuses_cached_result(
+    tool_decl: dict[str, Any], registry: Registry
+) -> None:
+    node = create_node(tool_decl, registry, get_city)
+
+    first = await node.invoke(tool_call("call_1", city="Paris"))
+    second = await node.invoke(tool_call("call_2", city="Paris"))
+
+    assert calls == ["Paris"]
+    assert first.content == second.content == "Paris:en"
+    assert first.tool_call_id == "call_1"
+    assert second.tool_call_id == "call_2"
+    assert node.cache is not None
+    assert node.cache.hits == 1
+    assert node.cache.misses == 1
+    assert node.cache.hit_ratio == 0.5
+
+
+async def test_invoke_without_cache_spec(
+    tool_decl: dict[str, Any], registry: Registry
+) -> None:
+    del tool_decl["cache"]
+    node = create_node(tool_decl, registry, get_city)
+
+    await node.invoke(tool_call("call_1", city="Paris"))
+    await node.invoke(tool_call("call_2", city="Paris"))
+
+    assert node.cache is None
+    assert calls == ["Paris", "Paris"]
+
+
+async def test_concurrent_calls_share_execution(
+    tool_decl: dict[str, Any], registry: Registry
+) -> None:
+    node = create_node(tool_decl, registry, get_city)
+
+    results = await asyncio.gather(
+        *(node.invoke(tool_call(f"call_{i}", city="Paris")) for i in range(5))
+    )
+
+    assert calls == ["Paris"]
+    assert [r.content for r in results] == ["Paris:en"] * 5
+    assert [r.tool_call_id for r in results] == [f"call_{i}" for i in range(5)]
+    assert node.cache is not None
+    assert node.cache.hits == 4
+
+
+async def test_errors_are_not_cached(
+    tool_decl: dict[str, Any], registry: Registry
+) -> None:
+    tool_decl["arguments"] = [{"name": "city", "type": "str"}]
+    node = create_node(tool_decl, registry, failing_lookup)
+
+    first = await node.invoke(tool_call("call_1", city="Atlantis"))
+    second = await node.invoke(tool_call("call_2", city="Atlantis"))
+
+    assert first.content == second.content == "Unknown city Atlantis"
+    assert calls == ["Atlantis", "Atlantis"]
+    assert node.cache is not None
+    assert len(node.cache) == 0
+
+
+async def test_lru_eviction(tool_decl: dict[str, Any], registry: Registry) -> None:
+    node = create_node(tool_decl, registry, get_city)
+
+    await node.invoke(tool_call("call_1", city="Paris"))
+    await node.invoke(tool_call("call_2", city="Rome"))
+    await node.invoke(tool_call("call_3", city="Paris"))
+    await node.invoke(tool_call("call_4", city="Oslo"))
+    # Rome is the least recently used entry
+    await node.invoke(tool_call("call_5", city="Rome"))
+    await node.invoke(tool_call("call_6", city="Paris"))
+
+    assert calls == ["Paris", "Rome", "Oslo", "Rome", "Paris"]
+
+
+async def test_ttl_expiration(tool_decl: dict[str, Any], registry: Registry) -> None:
+    node = create_node(tool_decl, registry, get_city)
+    assert node.cache is not None
+    now = 100.0
+    node.cache.clock = lambda: now
+
+    await node.invoke(tool_call("call_1", city="Paris"))
+    now = 150.0
+    await node.invoke(tool_call("call_2", city="Paris"))
+    now = 161.0
+    await node.invoke(tool_call("call_3", city="Paris"))
+
+    assert calls == ["Paris", "Paris"]
+
+
+async def test_cancelled_caller_does_not_cancel_shared_call(
+    tool_decl: dict[str, Any], registry: Registry
+) -> None:
+    node = create_node(tool_decl, registry, get_city)
+
+    first = asyncio.create_task(node.invoke(tool_call("call_1", city="Paris")))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(node.invoke(tool_call("call_2", city="Paris")))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    result = await second
+
+    assert first.cancelled()
+    assert result.content == "Paris:en"
+    assert result.tool_call_id == "call_2"
+    assert calls == ["Paris"]
+
+
+async def test_execution_scope(tool_decl: dict[str, Any], registry: Registry) -> None:
+    tool_decl["cache"]["scope"] = "execution"
+    node = create_node(tool_decl, registry, get_city)
+    root_execution_id = uuid4()
+
+    await node.invoke(
+        tool_call("call_1", city="Paris"),
+        execution_context(root_execution_id=root_execution_id),
+    )
+    await node.invoke(
+        tool_call("call_2", city="Paris"),
+        execution_context(root_execution_id=root_execution_id),
+    )
+    await node.invoke(
+        tool_call("call_3", city="Paris"),
+        execution_context(root_execution_id=uuid4()),
+    )
+
+    assert calls == ["Paris", "Paris"]
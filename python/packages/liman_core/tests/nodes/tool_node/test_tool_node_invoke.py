@@ -1,4 +1,5 @@
 import asyncio
+import json
 from typing import Any
 
 import pytest
@@ -143,10 +144,94 @@ def test_invoke_with_missing_required_param(
         "type": "tool_call",
     }
 
-    with pytest.raises(ValueError, match="Required parameter is missing: 'location'"):
+    result = asyncio.run(node.invoke(ToolCall.model_validate(tool_call)))
+
+    assert result.status == "error"
+    assert isinstance(result.content, str)
+    assert json.loads(result.content)["details"] == [
+        {"argument": "location", "message": "Field required"}
+    ]
+
+
+def test_invoke_with_missing_function_param(
+    greeting_tool_decl: dict[str, Any], registry: Registry
+) -> None:
+    node = ToolNode.from_dict(greeting_tool_decl, registry)
+    node.set_func(sync_func_with_optional)
+
+    tool_call = {"name": "greeting_tool", "args": {}, "id": "call_error"}
+
+    with pytest.raises(ValueError, match="Required parameter is missing: 'name'"):
         asyncio.run(node.invoke(ToolCall.model_validate(tool_call)))
 
 
+def test_invoke_coerces_args(
+    tool_node_decl: dict[str, Any], registry: Registry
+) -> None:
+    node = ToolNode.from_dict(tool_node_decl, registry)
+    node.set_func(sync_test_func)
+
+    tool_call = {
+        "name": "weather_tool",
+        "args": {"location": "Moscow", "temperature": "25"},
+        "id": "call_123",
+    }
+
+    result = asyncio.run(node.invoke(ToolCall.model_validate(tool_call)))
+
+    assert result.content == "Weather in Moscow: 25°C"
+
+
+def test_invoke_coerces_numbers_to_str(
+    tool_node_decl: dict[str, Any], registry: Registry
+) -> None:
+    node = ToolNode.from_dict(tool_node_decl, registry)
+    node.set_func(sync_test_func)
+
+    tool_call = {
+        "name": "weather_tool",
+        "args": {"location": 123, "temperature": 25},
+        "id": "call_123",
+    }
+
+    result = asyncio.run(node.invoke(ToolCall.model_validate(tool_call)))
+
+    assert result.status == "success"
+    assert result.content == "Weather in 123: 25°C"
+
+
+def test_invoke_with_invalid_args_returns_error_message(
+    tool_node_decl: dict[str, Any], registry: Registry
+) -> None:
+    node = ToolNode.from_dict(tool_node_decl, registry)
+    calls: list[dict[str, Any]] = []
+    node.set_func(lambda **kwargs: calls.append(kwargs))
+
+    tool_call = {
+        "name": "weather_tool",
+        "args": {"location": ["Moscow"], "temperature": "warm"},
+        "id": "call_invalid",
+    }
+
+    result = asyncio.run(node.invoke(ToolCall.model_validate(tool_call)))
+
+    assert calls == []
+    assert result.status == "error"
+    assert result.tool_call_id == "call_invalid"
+    assert isinstance(result.content, str)
+    assert json.loads(result.content) == {
+        "error": "Invalid arguments of tool 'weather_tool'",
+        "details": [
+            {"argument": "location", "message": "Input should be a valid string"},
+            {
+                "argument": "temperature",
+                "message": "Input should be a valid integer, "
+                "unable to parse string as an integer",
+            },
+        ],
+    }
+
+
 def test_invoke_with_function_exception(
     tool_node_decl: dict[str, Any], registry: Registry
 ) -> None:
@@ -217,3 +302,33 @@ def test_invoke_with_optional_param_function_no_arg(
 
     result = asyncio.run(node.invoke(ToolCall.model_validate(tool_call)))
     assert result.content == "Hello, Bob!"
+
+
+async def slow_func(location: str) -> str:
+    await asyncio.sleep(1)
+    return f"Weather in {location}"
+
+
+@pytest.mark.asyncio
+async def test_invoke_timeout_returns_error_message(
+    tool_node_decl: dict[str, Any], registry: Registry
+) -> None:
+    node = ToolNode.from_dict({**tool_node_decl, "timeout": 0.01}, registry)
+    node.set_func(slow_func)
+    tool_call = ToolCall(
+        name="weather_tool", args={"location": "Moscow"}, id="call_123"
+    )
+
+    result = await node.invoke(tool_call)
+
+    assert isinstance(result, ToolMessage)
+    assert result.status == "error"
+    assert result.tool_call_id == "call_123"
+    assert result.content == "Tool 'weather_tool' timed out after 0.01 seconds"
+
+
+def test_invalid_timeout_raises_error(
+    tool_node_decl: dict[str, Any], registry: Registry
+) -> None:
+    with pytest.raises(ValidationError):
+        ToolNode.from_dict({**tool_node_decl, "timeout": 0}, registry)
@@ -0,0 +1,101 @@
+from typing import Any
+
+import pytest
+
+from liman_core.errors import InvalidSpecError
+from liman_core.nodes.tool_node.node import ToolNode
+from liman_core.nodes.tool_node.output import ToolOutputShaper
+from liman_core.nodes.tool_node.schemas import ToolCall, ToolOutputSpec
+from liman_core.registry import Registry
+
+USERS = {
+    "total": 3,
+    "items": [
+        {"id": 1, "name": "Ann", "address": {"city": "Paris", "zip": "75001"}},
+        {"id": 2, "name": "Bob", "address": {"city": "Rome", "zip": "00100"}},
+        {"id": 3, "name": "Eve", "address": {"city": "Oslo", "zip": "0150"}},
+    ],
+}
+
+
+def get_users() -> dict[str, Any]:
+    return USERS
+
+
+def shape(result: Any, **spec: Any) -> str:
+    return ToolOutputShaper(ToolOutputSpec(**spec)).shape(result).content
+
+
+def test_serializes_compact_json() -> None:
+    assert shape({"name": "Ann", "tags": ["a", "b"]}) == (
+        '{"name":"Ann","tags":["a","b"]}'
+    )
+
+
+def test_projects_fields() -> None:
+    content = shape(USERS, fields=["$.total", "items[*].name", "items[*].address.city"])
+
+    assert content == (
+        '{"total":3,"items":['
+        '{"name":"Ann","address":{"city":"Paris"}},'
+        '{"name":"Bob","address":{"city":"Rome"}},'
+        '{"name":"Eve","address":{"city":"Oslo"}}]}'
+    )
+
+
+def test_projects_list_index() -> None:
+    assert shape(USERS, fields=["items[1].id"]) == '{"items":[{"id":2}]}'
+
+
+def test_projects_json_string() -> None:
+    assert shape('{"a": 1, "b": 2}', fields=["a"]) == '{"a":1}'
+
+
+def test_truncates_arrays_with_count() -> None:
+    content = shape(USERS, fields=["items[*].id"], max_items=2)
+
+    assert content == '{"items":[{"id":1},{"id":2},"... 1 more of 3 items"]}'
+
+
+@pytest.mark.parametrize("limit", [{"max_chars": 60}, {"max_tokens": 15}])
+def test_truncates_text(limit: dict[str, int]) -> None:
+    content = shape("x" * 1000, **limit)
+
+    assert len(content) == 60
+    assert content.endswith("... [truncated, 1000 chars in total]")
+
+
+def test_reports_savings() -> None:
+    output = ToolOutputShaper(ToolOutputSpec(fields=["total"])).shape(USERS)
+
+    assert output.content == '{"total":3}'
+    assert output.original_chars == len(str(USERS))
+    assert output.bytes_saved == len(str(USERS)) - len(output.content)
+    assert output.tokens_saved > 0
+
+
+@pytest.mark.parametrize("path", ["$", "items[", "items[x]"])
+def test_invalid_field_path_raises_error(path: str) -> None:
+    with pytest.raises(InvalidSpecError):
+        ToolOutputShaper(ToolOutputSpec(fields=[path]))
+
+
+async def test_invoke_shapes_output(registry: Registry) -> None:
+    node = ToolNode.from_dict(
+        {
+            "kind": "ToolNode",
+            "name": "get_users",
+            "description": {"en": "Get users"},
+            "output": {"fields": ["items[*].name"], "max_items": 2},
+        },
+        registry,
+    )
+    node.set_func(get_users)
+    node.compile()
+
+    message = await node.invoke(ToolCall(name="get_users", args={}, id="call_1"))
+
+    assert (
+        message.content
+        == '{"items":[{"name":"Ann"},{"name":"Bob"},"... 1 more of 3 items"]}'
+    )
@@ -98,3 +98,39 @@ def test_print_specs_with_components(
     assert "name: comp2" in captured.out
     assert "name: comp3" in captured.out
     assert "---" in captured.out
+
+
+def test_add_lazy_builds_component_on_first_lookup(
+    registry: Registry, mock_component: MockComponent
+) -> None:
+    factory = Mock(return_value=mock_component)
+
+    registry.add_lazy("MockComponent", "test_component", factory)
+    factory.assert_not_called()
+
+    assert registry.lookup(MockComponent, "test_component") is mock_component
+    assert registry.lookup(MockComponent, "test_component") is mock_component
+    factory.assert_called_once()
+
+
+def test_add_lazy_duplicate_component_raises_error(
+    registry: Registry, mock_component: MockComponent
+) -> None:
+    registry.add_lazy("MockComponent", "test_component", Mock())
+
+    with pytest.raises(LimanError, match="already exists in the registry"):
+        registry.add(mock_component)
+    with pytest.raises(LimanError, match="already exists in the registry"):
+        registry.add_lazy("MockComponent", "test_component", Mock())
+
+
+def test_add_lazy_keeps_factory_when_it_fails(
+    registry: Registry, mock_component: MockComponent
+) -> None:
+    factory = Mock(side_effect=[ValueError("invalid spec"), mock_component])
+    registry.add_lazy("MockComponent", "test_component", factory)
+
+    with pytest.raises(ValueError, match="invalid spec"):
+        registry.lookup(MockComponent, "test_component")
+
+    assert registry.lookup(MockComponent, "test_component") is mock_component
@@ -1,4 +1,5 @@
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextvars import ContextVar
 from typing import Any, Protocol, TypeVar
 
 from opentelemetry.trace import Tracer
@@ -15,6 +16,23 @@ class TraceableObject(Protocol):
     kind: str | None
 
 
+class BatchUsage:
+    """
+    LLM usage accumulated while an agent batch runs
+    """
+
+    def __init__(self) -> None:
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cost = 0.0
+
+
+# usage of the agent batch the current task belongs to
+_batch_usage: ContextVar[BatchUsage | None] = ContextVar(
+    "liman_finops_batch_usage", default=None
+)
+
+
 def node_invoke(
     tracer: Tracer, metrics: Metrics
 ) -> Callable[[Callable[..., R], TraceableObject, Any, Any], R]:
@@ -124,32 +142,90 @@ def langchain_ainvoke(
                     )
                     and (usage := response_metadata.get("token_usage", None))
                 ):
-                    prompt_tokens = usage["prompt_tokens"]
-                    completion_tokens = usage["completion_tokens"]
-                    total_tokens = prompt_tokens + completion_tokens
-
-                    # Add token usage to span attributes
-                    attrs.update(
-                        {
-                            "llm.usage.prompt_tokens": str(prompt_tokens),
-                            "llm.usage.completion_tokens": str(completion_tokens),
-                            "llm.usage.total_tokens": str(total_tokens),
-                        }
+                    attrs = record_llm_usage(
+                        metrics,
+                        attrs,
+                        usage["prompt_tokens"],
+                        usage["completion_tokens"],
                     )
 
-                    # Calculate and add cost to span attributes
-                    if llm_tokens_cost := get_llm_cost(usage, attrs["model_name"]):
-                        attrs["llm.usage.cost_usd"] = f"{llm_tokens_cost:.6f}"
-                        metrics.llm_tokens_cost.add(llm_tokens_cost, attributes=attrs)
+                span.set_attributes(attrs)
+
+    return traced_method
 
-                    metrics.input_llm_tokens.add(prompt_tokens, attributes=attrs)
-                    metrics.output_llm_tokens.add(completion_tokens, attributes=attrs)
 
-                span.set_attributes(attrs)
+def langchain_astream(
+    tracer: Tracer, metrics: Metrics
+) -> Callable[
+    [Callable[..., AsyncIterator[R]], TraceableObject, Any, Any], AsyncIterator[R]
+]:
+    """
+    Wrapper for the LLM astream method to count tokens and cost of streamed
+    responses, the usage comes with the chunks, e.g. ChatOpenAI with
+    `stream_usage=True`.
+    """
+
+    async def traced_method(
+        wrapped: Callable[..., AsyncIterator[R]],
+        instance: TraceableObject,
+        args: Any,
+        kwargs: Any,
+    ) -> AsyncIterator[R]:
+        attrs = {
+            "name": instance.__class__.__name__,
+            "model_name": getattr(instance, "model_name", "unknown"),
+        }
+        input_tokens = output_tokens = 0
+        # not the current span, the generator is suspended between the chunks
+        span = tracer.start_span(
+            f"{instance.__class__.__name__}.{wrapped.__name__}", attributes=attrs
+        )
+        try:
+            async for chunk in wrapped(*args, **kwargs):
+                if usage_metadata := getattr(chunk, "usage_metadata", None):
+                    input_tokens += usage_metadata.get("input_tokens", 0)
+                    output_tokens += usage_metadata.get("output_tokens", 0)
+                yield chunk
+        finally:
+            if input_tokens or output_tokens:
+                attrs = record_llm_usage(metrics, attrs, input_tokens, output_tokens)
+            span.set_attributes(attrs)
+            span.end()
 
     return traced_method
 
 
+def record_llm_usage(
+    metrics: Metrics, _attrs: dict[str, str], prompt_tokens: int, completion_tokens: int
+) -> dict[str, str]:
+    """
+    Record tokens and cost of an LLM call, also in the agent batch it belongs to
+
+    Returns:
+        Attributes with the usage added
+    """
+    attrs = {
+        **_attrs,
+        "llm.usage.prompt_tokens": str(prompt_tokens),
+        "llm.usage.completion_tokens": str(completion_tokens),
+        "llm.usage.total_tokens": str(prompt_tokens + completion_tokens),
+    }
+
+    usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens}
+    if llm_tokens_cost := get_llm_cost(usage, attrs["model_name"]):
+        attrs["llm.usage.cost_usd"] = f"{llm_tokens_cost:.6f}"
+        metrics.llm_tokens_cost.add(llm_tokens_cost, attributes=attrs)
+
+    metrics.input_llm_tokens.add(prompt_tokens, attributes=attrs)
+    metrics.output_llm_tokens.add(completion_tokens, attributes=attrs)
+
+    if batch_usage := _batch_usage.get():
+        batch_usage.input_tokens += prompt_tokens
+        batch_usage.output_tokens += completion_tokens
+        batch_usage.cost += llm_tokens_cost or 0.0
+    return attrs
+
+
 def extend_langchain_attrs(_attrs: dict[str, str], result: Any) -> dict[str, str]:
     attrs = {**_attrs}
     if not result:
@@ -215,6 +291,363 @@ def actor_execute(
     return traced_method
 
 
+def agent_abatch(
+    tracer: Tracer, metrics: Metrics
+) -> Callable[
+    [Callable[..., Awaitable[Any]], TraceableObject, Any, Any], Awaitable[Any]
+]:
+    """
+    Wrapper for Agent abatch method to count items and fill in the batch stats
+    with the tokens and cost of the LLM calls made by the batch.
+    """
+
+    async def traced_method(
+        wrapped: Callable[..., Awaitable[Any]],
+        instance: TraceableObject,
+        args: Any,
+        kwargs: Any,
+    ) -> Any:
+        attrs = {"agent_name": str(getattr(instance, "name", "unknown"))}
+        usage = BatchUsage()
+        token = _batch_usage.set(usage)
+        try:
+            with tracer.start_as_current_span(
+                f"{instance.__class__.__name__}.{wrapped.__name__}",
+                attributes=attrs,
+                end_on_exit=True,
+            ) as span:
+                result = await wrapped(*args, **kwargs)
+                stats = result.stats._replace(
+                    input_tokens=usage.input_tokens,
+                    output_tokens=usage.output_tokens,
+                    cost=usage.cost,
+                )
+                span.set_attributes(
+                    {
+                        "batch.items": stats.items,
+                        "batch.failed": stats.failed,
+                        "batch.items_per_second": stats.items_per_second,
+                        "llm.usage.prompt_tokens": stats.input_tokens,
+                        "llm.usage.completion_tokens": stats.output_tokens,
+                        "llm.usage.cost_usd": f"{stats.cost:.6f}",
+                    }
+                )
+        finally:
+            _batch_usage.reset(token)
+
+        metrics.batch_items.add(
+            stats.succeeded, attributes={**attrs, "status": "succeeded"}
+        )
+        metrics.batch_items.add(stats.failed, attributes={**attrs, "status": "failed"})
+        metrics.batch_duration.record(stats.duration, attributes=attrs)
+        metrics.batch_cost.add(stats.cost, attributes=attrs)
+        return result._replace(stats=stats)
+
+    return traced_method
+
+
+def memory_acompact(
+    tracer: Tracer, metrics: Metrics
+) -> Callable[[Callable[..., Awaitable[R]], TraceableObject, Any, Any], Awaitable[R]]:
+    """
+    Wrapper for ConversationMemory acompact method to count saved tokens.
+    """
+
+    async def traced_method(
+        wrapped: Callable[..., Awaitable[R]],
+        instance: TraceableObject,
+        args: Any,
+        kwargs: Any,
+    ) -> R:
+        attrs = {
+            "node_name": str(getattr(instance, "name", None) or "unknown"),
+            "strategy": str(getattr(instance, "strategy", "unknown")),
+        }
+        with tracer.start_as_current_span(
+            f"{instance.__class__.__name__}.{wrapped.__name__}",
+            attributes=attrs,
+            end_on_exit=True,
+        ) as span:
+            result = await wrapped(*args, **kwargs)
+
+            dropped_messages = getattr(result, "dropped_messages", 0)
+            tokens_saved = getattr(result, "tokens_saved", 0)
+            span.set_attributes(
+                {
+                    "memory.dropped_messages": dropped_messages,
+                    "memory.tokens_saved": tokens_saved,
+                }
+            )
+            if dropped_messages:
+                metrics.memory_dropped_messages.add(dropped_messages, attributes=attrs)
+                metrics.memory_tokens_saved.add(tokens_saved, attributes=attrs)
+            return result
+
+    return traced_method
+
+
+def tool_selector_select(
+    tracer: Tracer, metrics: Metrics
+) -> Callable[[Callable[..., R], TraceableObject, Any, Any], R]:
+    """
+    Wrapper for ToolSelector select method to count omitted tools and saved tokens.
+    """
+
+    def traced_method(
+        wrapped: Callable[..., R],
+        instance: TraceableObject,
+        args: Any,
+        kwargs: Any,
+    ) -> R:
+        attrs = {"node_name": str(getattr(instance, "name", None) or "unknown")}
+        result = wrapped(*args, **kwargs)
+
+        tool_names = getattr(instance, "tool_names", [])
+        selected_tools = getattr(result, "tools", tool_names)
+        if omitted_tools := len(tool_names) - len(selected_tools):
+            metrics.tool_selection_omitted_tools.add(omitted_tools, attributes=attrs)
+            metrics.tool_selection_tokens_saved.add(
+                getattr(result, "tokens_saved", 0), attributes=attrs
+            )
+        return result
+
+    return traced_method
+
+
+def llm_cache_aget(
+    tracer: Tracer, metrics: Metrics
+) -> Callable[[Callable[..., Awaitable[R]], TraceableObject, Any, Any], Awaitable[R]]:
+    """
+    Wrapper for LLMCache aget method to count hits and saved tokens and cost.
+    """
+
+    async def traced_method(
+        wrapped: Callable[..., Awaitable[R]],
+        instance: TraceableObject,
+        args: Any,
+        kwargs: Any,
+    ) -> R:
+        attrs = {"cache": instance.__class__.__name__}
+        result = await wrapped(*args, **kwargs)
+        if result is None:
+            metrics.llm_cache_misses.add(1, attributes=attrs)
+            return result
+
+        response_metadata = getattr(result, "response_metadata", None) or {}
+        attrs["model_name"] = response_metadata.get("model_name", "unknown")
+        metrics.llm_cache_hits.add(1, attributes=attrs)
+
+        if usage_metadata := getattr(result, "usage_metadata", None):
+            usage = {
+                "prompt_tokens": usage_metadata.get("input_tokens", 0),
+                "completion_tokens": usage_metadata.get("output_tokens", 0),
+            }
+            metrics.llm_cache_tokens_saved.add(
+                usage["prompt_tokens"] + usage["completion_tokens"], attributes=attrs
+            )
+            if llm_tokens_cost := get_llm_cost(usage, attrs["model_name"]):
+                metrics.llm_cache_cost_saved.add(llm_tokens_cost, attributes=attrs)
+        return result
+
+    return traced_method
+
+
+def tool_cache_aget_or_call(
+    tracer: Tracer, metrics: Metrics
+) -> Callable[[Callable[..., Awaitable[R]], TraceableObject, Any, Any], Awaitable[R]]:
+    """
+    Wrapper for ToolResultCache aget_or_call method to count hits, misses
+    and calls shared with a concurrent identical execution.
+    """
+
+    async def traced_method(
+        wrapped: Callable[..., Awaitable[R]],
+        instance: TraceableObject,
+        args: Any,
+        kwargs: Any,
+    ) -> R:
+        attrs = {"node_name": str(getattr(instance, "name", None) or "unknown")}
+        result = await wrapped(*args, **kwargs)
+
+        status = getattr(result, "status", None)
+        if status == "hit":
+            metrics.tool_cache_hits.add(1, attributes=attrs)
+        elif status == "shared":
+            metrics.tool_cache_shared.add(1, attributes=attrs)
+        elif status == "miss":
+            metrics.tool_cache_misses.add(1, attributes=attrs)
+        return result
+
+    return traced_method
+
+
+def executor_dedupe_next_nodes(
+    tracer: Tracer, metrics: Metrics
+) -> Callable[[Callable[..., R], TraceableObject, Any, Any], R]:
+    """
+    Wrapper for Executor _dedupe_next_nodes method to count avoided tool calls.
+    """
+
+    def traced_method(
+        wrapped: Callable[..., R],
+        instance: TraceableObject,
+        args: Any,
+        kwargs: Any,
+    ) -> R:
+        result = wrapped(*args, **kwargs)
+        if duplicates := getattr(result, "duplicates", 0):
+            node_actor = getattr(instance, "node_actor", None)
+            node = getattr(node_actor, "node", None)
+            attrs = {"node_name": str(getattr(node, "name", None) or "unknown")}
+            metrics.tool_calls_deduplicated.add(duplicates, attributes=attrs)
+        return result
+
+    return traced_method
+
+
+def openapi_operation_backoff(
+    tracer: Tracer, metrics: Metrics
+) -> Callable[[Callable[..., Awaitable[R]], TraceableObject, Any, Any], Awaitable[R]]:
+    """
+    Wrapper for OpenAPIOperation _backoff method to count retried requests.
+    """
+
+    async def traced_method(
+        wrapped: Callable[..., Awaitable[R]],
+        instance: TraceableObject,
+        args: Any,
+        kwargs: Any,
+    ) -> R:
+        endpoint = getattr(instance, "endpoint", None)
+        attrs = {"operation_id": str(getattr(endpoint, "operation_id", "unknown"))}
+        metrics.openapi_retries.add(1, attributes=attrs)
+        return await wrapped(*args, **kwargs)
+
+    return traced_method
+
+
+def openapi_operation_send_cached(
+    tracer: Tracer, metrics: Metrics
+) -> Callable[[Callable[..., Awaitable[R]], TraceableObject, Any, Any], Awaitable[R]]:
+    """
+    Wrapper for OpenAPIOperation _send_cached method to count HTTP cache hits,
+    revalidations and misses.
+    """
+
+    async def traced_method(
+        wrapped: Callable[..., Awaitable[R]],
+        instance: TraceableObject,
+        args: Any,
+        kwargs: Any,
+    ) -> R:
+        endpoint = getattr(instance, "endpoint", None)
+        attrs = {"operation_id": str(getattr(endpoint, "operation_id", "unknown"))}
+        result = await wrapped(*args, **kwargs)
+
+        status = getattr(result, "status", None)
+        if status == "hit":
+            metrics.http_cache_hits.add(1, attributes=attrs)
+        elif status == "revalidated":
+            metrics.http_cache_revalidated.add(1, attributes=attrs)
+        elif status == "miss":
+            metrics.http_cache_misses.add(1, attributes=attrs)
+        return result
+
+    return traced_method
+
+
+def tool_output_shape(
+    tracer: Tracer, metrics: Metrics
+) -> Callable[[Callable[..., R], TraceableObject, Any, Any], R]:
+    """
+    Wrapper for ToolOutputShaper shape method to count bytes and tokens
+    of tool results which weren't sent to the LLM.
+    """
+
+    def traced_method(
+        wrapped: Callable[..., R],
+        instance: TraceableObject,
+        args: Any,
+        kwargs: Any,
+    ) -> R:
+        result = wrapped(*args, **kwargs)
+
+        attrs = {"node_name": str(getattr(instance, "name", None) or "unknown")}
+        bytes_saved = getattr(result, "bytes_saved", 0)
+        if bytes_saved:
+            metrics.tool_output_bytes_saved.add(bytes_saved, attributes=attrs)
+        tokens_saved = getattr(result, "tokens_saved", 0)
+        if tokens_saved:
+            metrics.tool_output_tokens_saved.add(tokens_saved, attributes=attrs)
+        return result
+
+    return traced_method
+
+
+def request_coalescer_arun(
+    tracer: Tracer, metrics: Metrics
+) -> Callable[[Callable[..., Awaitable[R]], TraceableObject, Any, Any], Awaitable[R]]:
+    """
+    Wrapper for RequestCoalescer arun method to count requests collapsed
+    into an identical one in flight.
+    """
+
+    async def traced_method(
+        wrapped: Callable[..., Awaitable[R]],
+        instance: TraceableObject,
+        args: Any,
+        kwargs: Any,
+    ) -> R:
+        result = await wrapped(*args, **kwargs)
+        if getattr(result, "shared", False):
+            metrics.openapi_requests_collapsed.add(1)
+        return result
+
+    return traced_method
+
+
+def circuit_breaker_allow(
+    tracer: Tracer, metrics: Metrics
+) -> Callable[[Callable[..., R], TraceableObject, Any, Any], R]:
+    """
+    Wrapper for CircuitBreaker allow method to count rejected requests.
+    """
+
+    def traced_method(
+        wrapped: Callable[..., R],
+        instance: TraceableObject,
+        args: Any,
+        kwargs: Any,
+    ) -> R:
+        result = wrapped(*args, **kwargs)
+        if not result:
+            attrs = {"host": str(getattr(instance, "host", "unknown"))}
+            metrics.openapi_circuit_rejected.add(1, attributes=attrs)
+        return result
+
+    return traced_method
+
+
+def circuit_breaker_open(
+    tracer: Tracer, metrics: Metrics
+) -> Callable[[Callable[..., R], TraceableObject, Any, Any], R]:
+    """
+    Wrapper for CircuitBreaker _open method to count opened circuits.
+    """
+
+    def traced_method(
+        wrapped: Callable[..., R],
+        instance: TraceableObject,
+        args: Any,
+        kwargs: Any,
+    ) -> R:
+        attrs = {"host": str(getattr(instance, "host", "unknown"))}
+        metrics.openapi_circuit_opened.add(1, attributes=attrs)
+        return wrapped(*args, **kwargs)
+
+    return traced_method
+
+
 def get_llm_cost(usage: Any, model_name: str) -> float | None:
     """
     Calculate the cost of LLM usage based on the model and token counts.
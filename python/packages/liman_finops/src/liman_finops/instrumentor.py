@@ -24,9 +24,22 @@ from wrapt import wrap_function_wrapper
 
 from liman_finops.decorators import (
     actor_execute,
+    agent_abatch,
+    circuit_breaker_allow,
+    circuit_breaker_open,
+    executor_dedupe_next_nodes,
     langchain_ainvoke,
+    langchain_astream,
+    llm_cache_aget,
+    memory_acompact,
     node_ainvoke,
     node_invoke,
+    openapi_operation_backoff,
+    openapi_operation_send_cached,
+    request_coalescer_arun,
+    tool_cache_aget_or_call,
+    tool_output_shape,
+    tool_selector_select,
 )
 from liman_finops.metrics import Metrics
 from liman_finops.version import __version__
@@ -91,6 +104,43 @@ class LimanInstrumentor(BaseInstrumentor):  # type: ignore
         "AsyncNodeActor.execute": ("liman_core.node_actor.actor", actor_execute),
         "NodeActor.execute": ("liman_core.node_actor", actor_execute),
         "ChatOpenAI.ainvoke": ("langchain_openai", langchain_ainvoke),
+        "ChatOpenAI.astream": ("langchain_openai", langchain_astream),
+        "ToolSelector.select": (
+            "liman_core.nodes.llm_node.tool_selection",
+            tool_selector_select,
+        ),
+        "LLMCache.aget": ("liman_core.nodes.llm_node.cache", llm_cache_aget),
+        "Agent.abatch": ("liman.agent", agent_abatch),
+        "Executor._dedupe_next_nodes": (
+            "liman.executor.base",
+            executor_dedupe_next_nodes,
+        ),
+        "ToolOutputShaper.shape": (
+            "liman_core.nodes.tool_node.output",
+            tool_output_shape,
+        ),
+        "ToolResultCache.aget_or_call": (
+            "liman_core.nodes.tool_node.cache",
+            tool_cache_aget_or_call,
+        ),
+        "ConversationMemory.acompact": (
+            "liman_core.nodes.llm_node.memory",
+            memory_acompact,
+        ),
+        "OpenAPIOperation._backoff": (
+            "liman_openapi.operation",
+            openapi_operation_backoff,
+        ),
+        "OpenAPIOperation._send_cached": (
+            "liman_openapi.operation",
+            openapi_operation_send_cached,
+        ),
+        "RequestCoalescer.arun": (
+            "liman_openapi.coalescing",
+            request_coalescer_arun,
+        ),
+        "CircuitBreaker.allow": ("liman_openapi.resilience", circuit_breaker_allow),
+        "CircuitBreaker._open": ("liman_openapi.resilience", circuit_breaker_open),
     }
 
     def _instrument(self, **kwargs: Any) -> None:
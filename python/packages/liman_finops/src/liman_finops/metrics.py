@@ -55,3 +55,124 @@ class Metrics:
             description="Count of NodeActor execution errors",
             unit="{error}",
         )
+        self.batch_items = self.meter.create_counter(
+            name="liman.finops.batch.items",
+            description="Count of inputs executed by agent batches",
+            unit="{item}",
+        )
+        self.batch_duration = self.meter.create_histogram(
+            name="liman.finops.batch.duration",
+            description="Wall time of agent batches",
+            unit="s",
+        )
+        self.batch_cost = self.meter.create_counter(
+            name="liman.finops.batch.cost",
+            description="Cost of LLM tokens used by agent batches",
+            unit="{currency}",
+        )
+        self.memory_dropped_messages = self.meter.create_counter(
+            name="liman.finops.memory.dropped_messages",
+            description="Count of messages dropped from LLM node memory",
+            unit="{message}",
+        )
+        self.memory_tokens_saved = self.meter.create_counter(
+            name="liman.finops.memory.tokens_saved",
+            description="Approximate count of prompt tokens saved by LLM node memory",
+            unit="{token}",
+        )
+        self.tool_selection_omitted_tools = self.meter.create_counter(
+            name="liman.finops.tool_selection.omitted_tools",
+            description="Count of tools omitted from LLM requests by tool selection",
+            unit="{tool}",
+        )
+        self.tool_selection_tokens_saved = self.meter.create_counter(
+            name="liman.finops.tool_selection.tokens_saved",
+            description="Approximate count of prompt tokens saved by tool selection",
+            unit="{token}",
+        )
+        self.llm_cache_hits = self.meter.create_counter(
+            name="liman.finops.llm_cache.hits",
+            description="Count of LLM responses served from the cache",
+            unit="{hit}",
+        )
+        self.llm_cache_misses = self.meter.create_counter(
+            name="liman.finops.llm_cache.misses",
+            description="Count of LLM requests missing the cache",
+            unit="{miss}",
+        )
+        self.llm_cache_tokens_saved = self.meter.create_counter(
+            name="liman.finops.llm_cache.tokens_saved",
+            description="Count of LLM tokens saved by the response cache",
+            unit="{token}",
+        )
+        self.llm_cache_cost_saved = self.meter.create_counter(
+            name="liman.finops.llm_cache.cost_saved",
+            description="Cost of LLM tokens saved by the response cache",
+            unit="{currency}",
+        )
+        self.tool_cache_hits = self.meter.create_counter(
+            name="liman.finops.tool_cache.hits",
+            description="Count of tool results served from the cache",
+            unit="{hit}",
+        )
+        self.tool_cache_misses = self.meter.create_counter(
+            name="liman.finops.tool_cache.misses",
+            description="Count of tool calls missing the cache",
+            unit="{miss}",
+        )
+        self.tool_cache_shared = self.meter.create_counter(
+            name="liman.finops.tool_cache.shared",
+            description="Count of tool calls sharing a concurrent identical execution",
+            unit="{call}",
+        )
+        self.tool_output_bytes_saved = self.meter.create_counter(
+            name="liman.finops.tool_output.bytes_saved",
+            description="Bytes of tool results not sent to the LLM by output shaping",
+            unit="By",
+        )
+        self.tool_output_tokens_saved = self.meter.create_counter(
+            name="liman.finops.tool_output.tokens_saved",
+            description="Approximate count of prompt tokens saved by tool output shaping",
+            unit="{token}",
+        )
+        self.tool_calls_deduplicated = self.meter.create_counter(
+            name="liman.finops.tool_calls.deduplicated",
+            description="Count of identical tool calls which weren't executed again",
+            unit="{call}",
+        )
+        self.openapi_retries = self.meter.create_counter(
+            name="liman.finops.openapi.retries",
+            description="Count of retried OpenAPI operation requests",
+            unit="{request}",
+        )
+        self.openapi_circuit_opened = self.meter.create_counter(
+            name="liman.finops.openapi.circuit_breaker.opened",
+            description="Count of OpenAPI host circuit breakers opened",
+            unit="{circuit}",
+        )
+        self.openapi_circuit_rejected = self.meter.create_counter(
+            name="liman.finops.openapi.circuit_breaker.rejected",
+            description="Count of OpenAPI requests rejected by an open circuit breaker",
+            unit="{request}",
+        )
+        self.openapi_requests_collapsed = self.meter.create_counter(
+            name="liman.finops.openapi.requests.collapsed",
+            description="Count of OpenAPI GET requests collapsed into "
+            "an identical request in flight",
+            unit="{request}",
+        )
+        self.http_cache_hits = self.meter.create_counter(
+            name="liman.finops.http_cache.hits",
+            description="Count of OpenAPI GET responses served from the HTTP cache",
+            unit="{hit}",
+        )
+        self.http_cache_revalidated = self.meter.create_counter(
+            name="liman.finops.http_cache.revalidated",
+            description="Count of cached OpenAPI GET responses revalidated with 304",
+            unit="{request}",
+        )
+        self.http_cache_misses = self.meter.create_counter(
+            name="liman.finops.http_cache.misses",
+            description="Count of OpenAPI GET requests missing the HTTP cache",
+            unit="{miss}",
+        )
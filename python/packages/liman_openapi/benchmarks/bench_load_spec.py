@@ -0,0 +1,123 @@
+"""
+Benchmark of loading a large OpenAPI spec into tool arguments.
+
+Measures parsing the endpoints, resolving the `$ref`s of the components with
+the shared memoized resolver, compared with a fresh resolver per component,
+and building the tool arguments of every endpoint.
+
+    python benchmarks/bench_load_spec.py [path/to/openapi.yaml]
+
+Without a path a spec with 400 operations and 300 components referencing
+each other, including recursive references, is generated.
+"""
+
+import gc
+import sys
+import time
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from jsonschema_path.typing import Schema
+
+from liman_openapi.load import load_openapi
+from liman_openapi.parse import parse_endpoints, parse_refs
+from liman_openapi.refs import COMPONENTS_SCHEMAS_PREFIX, RefResolver
+
+T = TypeVar("T")
+
+
+def create_spec(operations: int = 400, components: int = 300) -> Schema:
+    schemas: dict[str, Any] = {}
+    for i in range(components):
+        properties: dict[str, Any] = {
+            "id": {"type": "string"},
+            "name": {"type": "string", "description": f"Name of the item {i}"},
+            "count": {"type": "integer"},
+        }
+        # every component references a few later ones and the first one,
+        # so the graph is deep and has cycles
+        for j in (i + 1, i + 7, i + 31):
+            if j < components:
+                properties[f"ref_{j}"] = {"$ref": f"#/components/schemas/Item{j}"}
+        properties["root"] = {"$ref": "#/components/schemas/Item0"}
+        properties["children"] = {
+            "type": "array",
+            "items": {"$ref": f"#/components/schemas/Item{(i + 3) % components}"},
+        }
+        schemas[f"Item{i}"] = {"type": "object", "properties": properties}
+
+    paths: dict[str, Any] = {}
+    for i in range(operations):
+        paths[f"/items{i}/{{item_id}}"] = {
+            "put": {
+                "operationId": f"update_item_{i}",
+                "summary": f"Update item {i}",
+                "parameters": [
+                    {
+                        "name": "item_id",
+                        "in": "path",
+                        "required": True,
+                        "schema": {"type": "string"},
+                    },
+                    {"name": "dry_run", "in": "query", "schema": {"type": "boolean"}},
+                ],
+                "requestBody": {
+                    "required": True,
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "$ref": f"#/components/schemas/Item{i % components}"
+                            }
+                        }
+                    },
+                },
+                "responses": {"200": {"description": "Updated"}},
+            }
+        }
+
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Items API", "version": "1.0.0"},
+        "paths": paths,
+        "components": {"schemas": schemas},
+    }
+
+
+def resolve_per_component(spec: Schema) -> dict[str, Any]:
+    """
+    Resolution without sharing the memoized graph, kept for comparison
+    """
+    return {
+        name: RefResolver(spec).resolve(f"{COMPONENTS_SCHEMAS_PREFIX}{name}")
+        for name in spec.get("components", {}).get("schemas", {})
+    }
+
+
+def measure(name: str, func: Callable[[], T]) -> T:
+    gc.collect()
+    start = time.perf_counter()
+    result = func()
+    print(f"{name:<32} {(time.perf_counter() - start) * 1000:9.1f} ms")
+    return result
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        spec = measure("load and validate", lambda: load_openapi(sys.argv[1]))
+        content = spec.spec.content()
+    else:
+        content = create_spec()
+
+    endpoints = measure("parse endpoints", lambda: parse_endpoints(content))
+    measure("resolve refs per component", lambda: resolve_per_component(content))
+    refs = measure("resolve refs (memoized graph)", lambda: parse_refs(content))
+    arguments = measure(
+        "build tool arguments",
+        lambda: [endpoint.get_tool_arguments_spec(refs) for endpoint in endpoints],
+    )
+    print(f"{len(endpoints)} endpoints, {len(refs)} components, ", end="")
+    print(f"{sum(len(args or []) for args in arguments)} tool arguments")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Micro-benchmark of building requests for operations with many parameters.
+
+Compares the precompiled RequestTemplate with building the request
+from the endpoint on every call.
+
+    python benchmarks/bench_request_builder.py
+"""
+
+import timeit
+from functools import partial
+from typing import Any
+
+from liman_openapi.request_template import RequestParams, RequestTemplate
+from liman_openapi.schemas import Endpoint
+
+BASE_URL = "https://api.example.com/v1/"
+
+
+def create_endpoint(params_count: int) -> Endpoint:
+    path_params = [f"p{i}" for i in range(4)]
+    parameters = [
+        {"name": name, "in": "path", "required": True, "schema": {"type": "string"}}
+        for name in path_params
+    ]
+    for i in range(params_count):
+        parameters.append(
+            {
+                "name": f"q{i}",
+                "in": "query" if i % 3 else "header",
+                "required": i % 2 == 0,
+                "schema": {"type": "string"},
+            }
+        )
+    return Endpoint.model_validate(
+        {
+            "operationId": "search",
+            "summary": "Search",
+            "method": "POST",
+            "path": "/"
+            + "/".join(f"r{i}/{{{name}}}" for i, name in enumerate(path_params)),
+            "parameters": parameters,
+            "requestBody": {
+                "required": True,
+                "content": {"application/json": {"schema": {"type": "object"}}},
+            },
+            "responses": {"200": {"description": "OK"}},
+        }
+    )
+
+
+def build_per_call(endpoint: Endpoint, **kwargs: Any) -> RequestParams:
+    """
+    Request building before the templates, kept for comparison
+    """
+    path = endpoint.path
+    query_params: dict[str, Any] = {}
+    headers: dict[str, Any] = {}
+    json_data = None
+
+    for param in endpoint.parameters:
+        value = kwargs.get(param.name)
+        if value is None and param.required:
+            raise ValueError(f"Required parameter is missing: '{param.name}'")
+
+        if value is not None:
+            if param.in_ == "path":
+                path = path.replace(f"{{{param.name}}}", str(value))
+            elif param.in_ == "query":
+                query_params[param.name] = value
+            elif param.in_ == "header":
+                headers[param.name] = str(value)
+
+    if endpoint.request_body:
+        json_data = kwargs.get(endpoint.request_body.name)
+        if json_data and "application/json" in endpoint.request_body.content:
+            headers["Content-Type"] = "application/json"
+
+    url = f"{BASE_URL.rstrip('/')}{path}"
+    return RequestParams(url, query_params, headers, json_data)
+
+
+def main() -> None:
+    number = 20_000
+    for params_count in (10, 50, 200):
+        endpoint = create_endpoint(params_count)
+        kwargs: dict[str, Any] = {param.name: "value" for param in endpoint.parameters}
+        kwargs["__request_body__"] = {"query": "value"}
+        template = RequestTemplate(endpoint, BASE_URL)
+        assert template.build(kwargs) == build_per_call(endpoint, **kwargs)
+
+        per_call = timeit.timeit(
+            partial(build_per_call, endpoint, **kwargs), number=number
+        )
+        compiled = timeit.timeit(partial(template.build, kwargs), number=number)
+        print(
+            f"{params_count + 4:>4} params: "
+            f"per call {per_call / number * 1e6:7.2f} us, "
+            f"template {compiled / number * 1e6:7.2f} us, "
+            f"x{per_call / compiled:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,26 @@
+from liman_openapi.coalescing import RequestCoalescer
+from liman_openapi.http_cache import HTTPCache, InMemoryHTTPCache, SQLiteHTTPCache
 from liman_openapi.load import load_openapi
-from liman_openapi.tool_node import create_tool_nodes
+from liman_openapi.resilience import CircuitBreakers, CircuitOpenError, RetryPolicy
+from liman_openapi.response import ResponseLimits, ResponseTooLargeError
+from liman_openapi.spec_cache import OpenAPISpecCache
+from liman_openapi.tool_node import create_tool_nodes, register_tool_nodes
 
 # Don't update the version manually, it is set by the build system.
 __version__ = "0.1.0-a1"
 
-__all__ = ["load_openapi", "create_tool_nodes"]
+__all__ = [
+    "load_openapi",
+    "create_tool_nodes",
+    "register_tool_nodes",
+    "CircuitBreakers",
+    "CircuitOpenError",
+    "HTTPCache",
+    "OpenAPISpecCache",
+    "RequestCoalescer",
+    "ResponseLimits",
+    "ResponseTooLargeError",
+    "InMemoryHTTPCache",
+    "SQLiteHTTPCache",
+    "RetryPolicy",
+]
@@ -0,0 +1,65 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import NamedTuple
+
+
+class CoalescedResult(NamedTuple):
+    """
+    Result of a coalesced request
+    """
+
+    value: object
+    # the result of a concurrent identical request was awaited
+    shared: bool
+
+
+class RequestCoalescer:
+    """
+    Single-flight of concurrent identical requests.
+
+    The first request with a key runs in its own task, identical requests
+    made while it's in flight await it and share its parsed response, which
+    must be treated as read-only. Cancelling one caller doesn't cancel the
+    request for the others. Failures are propagated to every caller.
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.collapsed = 0
+
+        self._in_flight: dict[str, asyncio.Task[object]] = {}
+
+    async def arun(
+        self, key: str, call: Callable[[], Awaitable[object]]
+    ) -> CoalescedResult:
+        """
+        Run the request or await the identical one in flight
+
+        Args:
+            key: Request key, identical requests have the same key
+            call: Coroutine function sending the request
+
+        Returns:
+            CoalescedResult with the parsed response
+        """
+        if (in_flight := self._in_flight.get(key)) is not None:
+            self.collapsed += 1
+            return CoalescedResult(await asyncio.shield(in_flight), True)
+
+        self.requests += 1
+        task = asyncio.create_task(self._call(key, call))
+        task.add_done_callback(_retrieve_exception)
+        self._in_flight[key] = task
+        return CoalescedResult(await asyncio.shield(task), False)
+
+    async def _call(self, key: str, call: Callable[[], Awaitable[object]]) -> object:
+        try:
+            return await call()
+        finally:
+            del self._in_flight[key]
+
+
+def _retrieve_exception(task: asyncio.Task[object]) -> None:
+    # the loop logs unretrieved exceptions when every caller was cancelled
+    if not task.cancelled():
+        task.exception()
@@ -0,0 +1,437 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Literal, NamedTuple
+
+import httpx
+
+# bump to invalidate stored entries when the key or payload format changes
+CACHE_KEY_VERSION = 1
+
+HTTPCacheStatus = Literal["hit", "revalidated", "miss"]
+
+# content is stored decoded, its transfer headers don't apply anymore
+_SKIPPED_HEADERS = frozenset(
+    {"content-encoding", "content-length", "transfer-encoding"}
+)
+
+
+class HTTPCacheEntry(NamedTuple):
+    """
+    Cached response of a GET request
+    """
+
+    stored_at: float
+    # seconds the response is fresh for, 0 means it's revalidated on every use
+    max_age: float
+    status_code: int
+    headers: dict[str, str]
+    content: bytes
+
+    @property
+    def size(self) -> int:
+        return len(self.content) + sum(
+            len(name) + len(value) for name, value in self.headers.items()
+        )
+
+    @property
+    def etag(self) -> str | None:
+        return self.headers.get("etag")
+
+    @property
+    def last_modified(self) -> str | None:
+        return self.headers.get("last-modified")
+
+    def is_fresh(self, now: float) -> bool:
+        return now - self.stored_at < self.max_age
+
+    def to_response(self) -> httpx.Response:
+        return httpx.Response(
+            self.status_code, headers=self.headers, content=self.content
+        )
+
+
+class HTTPCacheResult(NamedTuple):
+    """
+    Response of a request sent through the HTTP cache
+    """
+
+    response: httpx.Response
+    # "revalidated" means the server confirmed the cached response with 304
+    status: HTTPCacheStatus
+
+
+def get_http_cache_key(
+    url: str, params: Mapping[str, Any] | None, headers: Mapping[str, Any]
+) -> str:
+    """
+    Build the key of a GET request.
+
+    Request headers are a part of the key, so responses varying on
+    the authorization or other header parameters are never mixed up.
+
+    Args:
+        url: Request URL without the query string
+        params: Query parameters
+        headers: Request headers
+
+    Returns:
+        Hex digest identifying the request
+    """
+    payload = {
+        "version": CACHE_KEY_VERSION,
+        "url": url,
+        "params": params or {},
+        "headers": {name.lower(): value for name, value in headers.items()},
+    }
+    data = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+class HTTPCache(ABC):
+    """
+    Private HTTP cache of GET responses.
+
+    Freshness follows `Cache-Control` and `Expires` of the responses, stale
+    entries with an `ETag` or `Last-Modified` are revalidated with a conditional
+    request. `no-store` responses are never stored.
+    """
+
+    def __init__(self, *, clock: Callable[[], float] = time.time) -> None:
+        self.clock = clock
+
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.revalidated + self.misses
+        return (self.hits + self.revalidated) / total if total else 0.0
+
+    async def aget(self, key: str) -> HTTPCacheEntry | None:
+        """
+        Get the cached response, fresh or stale
+
+        Args:
+            key: Request key, see `get_http_cache_key`
+        """
+        return await self._aread(key)
+
+    async def astore(
+        self, key: str, response: httpx.Response, ttl: float | None = None
+    ) -> HTTPCacheEntry | None:
+        """
+        Store the response if it's cacheable
+
+        Args:
+            key: Request key, see `get_http_cache_key`
+            response: Response of the GET request
+            ttl: Freshness lifetime in seconds overriding the response headers
+
+        Returns:
+            Stored entry or None if the response isn't cacheable
+        """
+        if response.status_code != 200:
+            return None
+
+        now = self.clock()
+        max_age = get_max_age(response.headers, now)
+        if max_age is None:
+            return None
+        if ttl is not None:
+            max_age = ttl
+        if max_age <= 0 and not (
+            "etag" in response.headers or "last-modified" in response.headers
+        ):
+            return None
+
+        entry = HTTPCacheEntry(
+            stored_at=now,
+            max_age=max_age,
+            status_code=response.status_code,
+            headers=_get_stored_headers(response.headers),
+            content=response.content,
+        )
+        await self._awrite(key, entry)
+        return entry
+
+    async def arefresh(
+        self,
+        key: str,
+        entry: HTTPCacheEntry,
+        not_modified: httpx.Response,
+        ttl: float | None = None,
+    ) -> HTTPCacheEntry:
+        """
+        Refresh the stale entry confirmed by a 304 Not Modified response
+
+        Args:
+            key: Request key, see `get_http_cache_key`
+            entry: Stale entry which was revalidated
+            not_modified: 304 response with the updated headers
+            ttl: Freshness lifetime in seconds overriding the response headers
+
+        Returns:
+            Refreshed entry
+        """
+        now = self.clock()
+        headers = {**entry.headers, **_get_stored_headers(not_modified.headers)}
+        max_age = ttl if ttl is not None else get_max_age(headers, now)
+        entry = entry._replace(stored_at=now, max_age=max_age or 0.0, headers=headers)
+        await self._awrite(key, entry)
+        return entry
+
+    async def adelete(self, key: str) -> None:
+        await self._adelete(key)
+
+    @abstractmethod
+    async def _aread(self, key: str) -> HTTPCacheEntry | None:
+        """
+        Read the entry
+        """
+
+    @abstractmethod
+    async def _awrite(self, key: str, entry: HTTPCacheEntry) -> None:
+        """
+        Write the entry
+        """
+
+    @abstractmethod
+    async def _adelete(self, key: str) -> None:
+        """
+        Delete the entry
+        """
+
+
+class InMemoryHTTPCache(HTTPCache):
+    """
+    In-memory LRU cache of HTTP responses bounded by the total size in bytes
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 32 * 1024 * 1024,
+        *,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        super().__init__(clock=clock)
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[str, HTTPCacheEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def _aread(self, key: str) -> HTTPCacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def _awrite(self, key: str, entry: HTTPCacheEntry) -> None:
+        await self._adelete(key)
+        if entry.size > self.max_bytes:
+            return
+
+        self._entries[key] = entry
+        self.size += entry.size
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+
+    async def _adelete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+
+class SQLiteHTTPCache(HTTPCache):
+    """
+    Persistent cache of HTTP responses stored in a SQLite database,
+    survives process restarts and can be shared between processes.
+
+    The least recently used entries are evicted above `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int = 256 * 1024 * 1024,
+        *,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        super().__init__(clock=clock)
+        self.max_bytes = max_bytes
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS http_cache ("
+                "key TEXT PRIMARY KEY, stored_at REAL NOT NULL, max_age REAL NOT NULL, "
+                "status_code INTEGER NOT NULL, headers TEXT NOT NULL, "
+                "content BLOB NOT NULL, size INTEGER NOT NULL, used_at REAL NOT NULL"
+                ")"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS http_cache_used_at ON http_cache (used_at)"
+            )
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            row = conn.execute("SELECT COUNT(*) FROM http_cache").fetchone()
+        return int(row[0])
+
+    async def _aread(self, key: str) -> HTTPCacheEntry | None:
+        return await asyncio.to_thread(self._read, key)
+
+    async def _awrite(self, key: str, entry: HTTPCacheEntry) -> None:
+        await asyncio.to_thread(self._write, key, entry)
+
+    async def _adelete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _read(self, key: str) -> HTTPCacheEntry | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT stored_at, max_age, status_code, headers, content "
+                "FROM http_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE http_cache SET used_at = ? WHERE key = ?", (self.clock(), key)
+            )
+        return HTTPCacheEntry(row[0], row[1], row[2], json.loads(row[3]), row[4])
+
+    def _write(self, key: str, entry: HTTPCacheEntry) -> None:
+        if entry.size > self.max_bytes:
+            self._delete(key)
+            return
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO http_cache "
+                "(key, stored_at, max_age, status_code, headers, content, size, used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.stored_at,
+                    entry.max_age,
+                    entry.status_code,
+                    json.dumps(entry.headers),
+                    entry.content,
+                    entry.size,
+                    self.clock(),
+                ),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """
+        Delete the least recently used entries above `max_bytes`
+        """
+        conn.execute(
+            "DELETE FROM http_cache WHERE key IN ("
+            "SELECT key FROM ("
+            "SELECT key, SUM(size) OVER (ORDER BY used_at DESC, key) AS total "
+            "FROM http_cache"
+            ") WHERE total > ?"
+            ")",
+            (self.max_bytes,),
+        )
+
+    def _delete(self, key: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM http_cache WHERE key = ?", (key,))
+
+
+def get_max_age(headers: Mapping[str, str], now: float) -> float | None:
+    """
+    Get the freshness lifetime of the response
+
+    Args:
+        headers: Response headers
+        now: Current time as a UNIX timestamp
+
+    Returns:
+        Lifetime in seconds, 0 if the response must be revalidated
+        or None if it must not be stored
+    """
+    headers = {name.lower(): value for name, value in headers.items()}
+    directives = _parse_cache_control(headers.get("cache-control", ""))
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+
+    age = _parse_seconds(headers.get("age")) or 0.0
+    if (max_age := _parse_seconds(directives.get("max-age"))) is not None:
+        return max(max_age - age, 0.0)
+
+    if "expires" in headers:
+        expires_at = _parse_http_date(headers["expires"])
+        date = _parse_http_date(headers.get("date")) or now
+        if expires_at is None:
+            return 0.0
+        return max(expires_at - date - age, 0.0)
+
+    return 0.0
+
+
+def _get_stored_headers(headers: Mapping[str, str]) -> dict[str, str]:
+    return {
+        name.lower(): value
+        for name, value in headers.items()
+        if name.lower() not in _SKIPPED_HEADERS
+    }
+
+
+def _parse_cache_control(value: str) -> dict[str, str | None]:
+    directives: dict[str, str | None] = {}
+    for directive in value.split(","):
+        name, _, arg = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else None
+    return directives
+
+
+def _parse_seconds(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+def _parse_http_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date.timestamp()
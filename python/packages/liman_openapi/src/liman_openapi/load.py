@@ -1,7 +1,7 @@
 import json
 from collections.abc import Hashable, Mapping
 from functools import singledispatch
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
 from urllib.request import urlopen
 
 from jsonschema_path.typing import Schema
@@ -12,16 +12,22 @@ from ruamel.yaml import YAML
 
 from liman_openapi.utils import is_url
 
+if TYPE_CHECKING:
+    from liman_openapi.spec_cache import OpenAPISpecCache
+
 
 @singledispatch
-def load_openapi(_: Any) -> OpenAPI:
+def load_openapi(_: Any, cache: "OpenAPISpecCache | None" = None) -> OpenAPI:
     raise NotImplementedError(
         "load_openapi() is not implemented for this type of input."
     )
 
 
 @load_openapi.register(str)
-def _(url_or_path: str) -> OpenAPI:
+def _(url_or_path: str, cache: "OpenAPISpecCache | None" = None) -> OpenAPI:
+    if cache is not None:
+        return cache.load(url_or_path)
+
     if is_url(url_or_path):
         schema = _read_from_url(url_or_path)
     else:
@@ -32,7 +38,7 @@ def _(url_or_path: str) -> OpenAPI:
 
 
 @load_openapi.register(dict)
-def _(input_dict: dict[str, Any]) -> OpenAPI:
+def _(input_dict: dict[str, Any], cache: "OpenAPISpecCache | None" = None) -> OpenAPI:
     schema = cast(Schema, input_dict)
     validate(schema)
     return OpenAPI.from_dict(schema)
@@ -45,10 +51,17 @@ def _read_from_url(url: str) -> Mapping[Hashable, Any]:
     with urlopen(url) as response:
         content = response.read().decode("utf-8")
 
+    return parse_content(content, url)
+
+
+def parse_content(content: str, source: str) -> Mapping[Hashable, Any]:
+    """
+    Parse OpenAPI spec content as json or yaml.
+    """
     try:
         data = json.loads(content)
         if not isinstance(data, dict):
-            raise ValueError(f"Cannot parse OpenAPI spec as json from URL: {url}")
+            raise ValueError(f"Cannot parse OpenAPI spec as json from: {source}")
         return data
     except Exception:
         ...
@@ -56,7 +69,7 @@ def _read_from_url(url: str) -> Mapping[Hashable, Any]:
     yaml = YAML(typ="safe")
     data = yaml.load(content)
     if not data:
-        raise ValueError(f"Failed to parse OpenAPI spec from URL: {url}")
+        raise ValueError(f"Failed to parse OpenAPI spec from: {source}")
     if not isinstance(data, dict):
-        raise ValueError(f"Failed to parse OpenAPI spec from URL: {url}")
+        raise ValueError(f"Failed to parse OpenAPI spec from: {source}")
     return data
@@ -1,19 +1,24 @@
+import asyncio
 import inspect
-from typing import Any, NamedTuple
+from functools import partial
+from typing import Any
 
 import httpx
 
+from liman_openapi.coalescing import RequestCoalescer
+from liman_openapi.http_cache import HTTPCache, HTTPCacheResult, get_http_cache_key
+from liman_openapi.request_template import RequestParams, RequestTemplate, encode_json
+from liman_openapi.resilience import CircuitBreakers, CircuitOpenError, RetryPolicy
+from liman_openapi.response import (
+    ResponseLimits,
+    ResponseTooLargeError,
+    aread_response,
+    aspool_response,
+)
 from liman_openapi.schemas import Endpoint, Ref
 from liman_openapi.schemas.security import SecurityScheme
 
 
-class RequestParams(NamedTuple):
-    url: str
-    query_params: dict[str, Any]
-    headers: dict[str, Any]
-    json_data: Any | None
-
-
 class OpenAPIOperation:
     def __init__(
         self,
@@ -22,11 +27,26 @@ class OpenAPIOperation:
         security_schemes: list[SecurityScheme] | None = None,
         *,
         base_url: str | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breakers: CircuitBreakers | None = None,
+        http_cache: HTTPCache | None = None,
+        cache_ttl: float | None = None,
+        coalescer: RequestCoalescer | None = None,
+        response_limits: ResponseLimits | None = None,
     ) -> None:
         self.endpoint = endpoint
         self.refs = refs
         self.security_schemes = security_schemes
         self.base_url = base_url
+        self.retry_policy = retry_policy
+        self.circuit_breakers = circuit_breakers
+        self.http_cache = http_cache
+        # seconds, forced freshness of GET responses overriding their headers
+        self.cache_ttl = cache_ttl
+        # collapses concurrent identical GET requests into one
+        self.coalescer = coalescer
+        self.response_limits = response_limits or ResponseLimits()
+        self._template: RequestTemplate | None = None
 
         self.__signature__ = self._create_signature()
 
@@ -69,22 +89,183 @@ class OpenAPIOperation:
         url, query_params, headers, json_data = self._build_url_and_params(**kwargs)
 
         params = query_params if query_params else None
+        if self.coalescer is not None and method.upper() == "GET":
+            # the key covers the header parameters, so different auth is never shared
+            key = get_http_cache_key(url, params, headers)
+            result = await self.coalescer.arun(
+                key, partial(self._fetch, method, url, params, headers, None)
+            )
+            if result.shared and not isinstance(
+                result.value, bytes | str | dict | list
+            ):
+                # a spooled body is a file handle owned by the first caller,
+                # it can't be shared, so the request is sent again
+                return await self._fetch(method, url, params, headers, None)
+            return result.value
+
+        return await self._fetch(method, url, params, headers, json_data)
+
+    async def _fetch(
+        self,
+        method: str,
+        url: str,
+        params: dict[str, Any] | None,
+        headers: dict[str, Any],
+        json_data: Any | None,
+    ) -> object:
         try:
             async with httpx.AsyncClient() as client:
-                response = await client.request(
-                    method, url, params=params, headers=headers, json=json_data
+                if self.http_cache is not None and method.upper() == "GET":
+                    result = await self._send_cached(
+                        client, self.http_cache, url, params=params, headers=headers
+                    )
+                    return self._parse_response(result.response)
+
+                body: dict[str, Any] = {"json": json_data}
+                if json_data is not None and (content := encode_json(json_data)):
+                    body = {"content": content}
+                    headers.setdefault("Content-Type", "application/json")
+                response = await self._send(
+                    client, method, url, params=params, headers=headers, **body
                 )
-                response.raise_for_status()
-                return self._parse_response(response)
+                return await self._aparse_response(response)
         except httpx.HTTPStatusError as e:
             raise RuntimeError(
                 f"HTTP error occurred: {e.response.status_code} {e.response.text}"
             ) from e
         except httpx.RequestError as e:
             raise RuntimeError(f"Request error occurred: {e}") from e
+        except (CircuitOpenError, ResponseTooLargeError):
+            raise
         except Exception as e:
             raise RuntimeError(f"Unexpected error occurred: {e}") from e
 
+    async def _send(
+        self, client: httpx.AsyncClient, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        """
+        Send the request, retrying transient failures of idempotent methods
+        according to the retry policy. Server errors and transport errors
+        are recorded by the circuit breaker of the host.
+
+        The response body is streamed, it's read by the caller.
+        """
+        retry_policy = self.retry_policy
+        max_attempts = (
+            retry_policy.max_attempts
+            if retry_policy and retry_policy.is_retryable_method(method)
+            else 1
+        )
+        breaker = self.circuit_breakers.get(url) if self.circuit_breakers else None
+
+        attempt = 0
+        while True:
+            if breaker and not breaker.allow():
+                raise CircuitOpenError(
+                    f"Circuit breaker is open for {breaker.host}, request is not sent"
+                )
+
+            attempt += 1
+            try:
+                response = await client.send(
+                    client.build_request(method, url, **kwargs), stream=True
+                )
+                if response.is_error:
+                    # the body is only needed for the error message
+                    response = await aread_response(
+                        response, self.response_limits.max_bytes, truncate=True
+                    )
+                    response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                status_code = e.response.status_code
+                if breaker:
+                    if status_code >= 500:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                if (
+                    retry_policy is None
+                    or attempt >= max_attempts
+                    or status_code not in retry_policy.retry_statuses
+                ):
+                    raise
+                await self._backoff(attempt, e.response)
+            except httpx.TransportError:
+                if breaker:
+                    breaker.record_failure()
+                if retry_policy is None or attempt >= max_attempts:
+                    raise
+                await self._backoff(attempt)
+            except BaseException:
+                # e.g. the request is cancelled, it isn't a failure of the host
+                if breaker:
+                    breaker.release()
+                raise
+            else:
+                if breaker:
+                    breaker.record_success()
+                return response
+
+    async def _send_cached(
+        self,
+        client: httpx.AsyncClient,
+        cache: HTTPCache,
+        url: str,
+        *,
+        params: dict[str, Any] | None,
+        headers: dict[str, Any],
+    ) -> HTTPCacheResult:
+        """
+        Send the GET request through the HTTP cache. A fresh cached response
+        is returned without a request, a stale one is revalidated
+        with `If-None-Match` / `If-Modified-Since`.
+        """
+        key = get_http_cache_key(url, params, headers)
+        entry = await cache.aget(key)
+        if entry is not None and entry.is_fresh(cache.clock()):
+            cache.hits += 1
+            return HTTPCacheResult(entry.to_response(), "hit")
+
+        request_headers = dict(headers)
+        if entry is not None and entry.etag:
+            request_headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified:
+            request_headers["If-Modified-Since"] = entry.last_modified
+
+        response = await self._send(
+            client, "GET", url, params=params, headers=request_headers, json=None
+        )
+        response = await aread_response(response, self.response_limits.max_bytes)
+        if entry is not None and response.status_code == 304:
+            cache.revalidated += 1
+            entry = await cache.arefresh(key, entry, response, ttl=self.cache_ttl)
+            return HTTPCacheResult(entry.to_response(), "revalidated")
+
+        cache.misses += 1
+        await cache.astore(key, response, ttl=self.cache_ttl)
+        return HTTPCacheResult(response, "miss")
+
+    async def _backoff(
+        self, attempt: int, response: httpx.Response | None = None
+    ) -> None:
+        assert self.retry_policy is not None
+        await asyncio.sleep(self.retry_policy.get_delay(attempt, response))
+
+    async def _aparse_response(self, response: httpx.Response) -> object:
+        """
+        Read the streamed response within the response limits and parse it.
+        Large binary bodies are spooled to a temporary file.
+        """
+        content_type = response.headers.get("content-type", "").lower()
+        if (
+            content_type.startswith("image/")
+            or content_type == "application/octet-stream"
+        ):
+            return await aspool_response(response, self.response_limits)
+
+        response = await aread_response(response, self.response_limits.max_bytes)
+        return self._parse_response(response)
+
     def _parse_response(self, response: httpx.Response) -> object:
         content_type = response.headers.get("content-type", "").lower()
 
@@ -103,33 +284,7 @@ class OpenAPIOperation:
         )
 
     def _build_url_and_params(self, **kwargs: Any) -> RequestParams:
-        path = self.endpoint.path
-        query_params: dict[str, Any] = {}
-        headers: dict[str, Any] = {}
-        json_data = None
-
-        for param in self.endpoint.parameters:
-            value = kwargs.get(param.name)
-            if value is None and param.required:
-                raise ValueError(f"Required parameter is missing: '{param.name}'")
-
-            if value is not None:
-                if param.in_ == "path":
-                    path = path.replace(f"{{{param.name}}}", str(value))
-                elif param.in_ == "query":
-                    query_params[param.name] = value
-                elif param.in_ == "header":
-                    headers[param.name] = str(value)
-
-        if self.endpoint.request_body:
-            json_data = kwargs.get(self.endpoint.request_body.name)
-            if json_data is None and self.endpoint.request_body.required:
-                raise ValueError(
-                    f"Required request body is missing: '{self.endpoint.request_body.name}'"
-                )
-
-            if json_data and "application/json" in self.endpoint.request_body.content:
-                headers["Content-Type"] = "application/json"
-
-        url = f"{self.base_url.rstrip('/')}{path}" if self.base_url else path
-        return RequestParams(url, query_params, headers, json_data)
+        # compiled on the first call, lazily registered operations don't pay for it
+        if self._template is None:
+            self._template = RequestTemplate(self.endpoint, self.base_url)
+        return self._template.build(kwargs)
@@ -2,6 +2,7 @@ import logging
 
 from jsonschema_path.typing import Schema
 
+from liman_openapi.refs import COMPONENTS_SCHEMAS_PREFIX, RefResolver
 from liman_openapi.schemas import Endpoint, Ref
 from liman_openapi.schemas.security import (
     ApiKeySecurityScheme,
@@ -15,14 +16,19 @@ logger = logging.getLogger(__name__)
 def parse_refs(schema: Schema) -> dict[str, Ref]:
     """
     Parses components from an OpenAPI schema.
+
+    Nested and chained `$ref`s of the components are resolved,
+    recursive references are kept unexpanded.
     """
     schemas = schema.get("components", {"schemas": {}}).get("schemas", {})
+    resolver = RefResolver(schema)
     components = {}
-    for name, schema in schemas.items():
+    for name in schemas:
+        ref = f"{COMPONENTS_SCHEMAS_PREFIX}{name.replace('~', '~0').replace('/', '~1')}"
         components[name] = Ref.model_validate(
             {
                 "name": name,
-                **schema,
+                **resolver.resolve(ref),
             }
         )
     return components
@@ -56,9 +62,14 @@ def parse_endpoints(schema: Schema) -> list[Endpoint]:
     endpoints = []
     for path, methods in paths.items():
         for method, details in methods.items():
-            endpoints.append(
-                Endpoint.model_validate(
-                    {**details, "method": method.upper(), "path": path},
-                )
-            )
+            endpoints.append(parse_endpoint(path, method, details))
     return endpoints
+
+
+def parse_endpoint(path: str, method: str, details: Schema) -> Endpoint:
+    """
+    Parses a single operation of an OpenAPI schema path.
+    """
+    return Endpoint.model_validate(
+        {**details, "method": method.upper(), "path": path},
+    )
@@ -0,0 +1,151 @@
+from typing import Any
+
+from jsonschema_path.typing import Schema
+
+COMPONENTS_SCHEMAS_PREFIX = "#/components/schemas/"
+
+
+class RefResolver:
+    """
+    Resolves local `$ref`s of an OpenAPI spec into a graph of schemas.
+
+    Every referenced schema becomes a single memoized node, references to it
+    are replaced by the node itself, so shared schemas are resolved once and
+    recursive ones become cycles of the graph instead of infinite expansions.
+    Nodes are filled iteratively, deep reference chains don't hit the
+    recursion limit. `allOf` of object schemas is merged. Sibling keywords
+    of `$ref` are ignored, as in OpenAPI 3.0.
+    """
+
+    def __init__(self, schema: Schema) -> None:
+        self.schema = schema
+        self._nodes: dict[str, dict[str, Any]] = {}
+        # nodes waiting to be filled with their resolved target
+        self._pending: list[tuple[dict[str, Any], dict[str, Any]]] = []
+        self._all_of: list[dict[str, Any]] = []
+
+    def resolve(self, ref: str) -> dict[str, Any]:
+        """
+        Get the node of the schema the reference points to
+
+        Args:
+            ref: Local reference, e.g. `#/components/schemas/User`
+
+        Raises:
+            KeyError: If the reference doesn't point to a schema of the spec
+        """
+        node = self._get_node(ref)
+        self._fill_pending()
+        return node
+
+    def resolve_schema(self, schema: Any) -> Any:
+        """
+        Resolve the references nested in the inline schema
+        """
+        resolved = self._resolve_value(schema)
+        self._fill_pending()
+        return resolved
+
+    def _get_node(self, ref: str) -> dict[str, Any]:
+        if (node := self._nodes.get(ref)) is not None:
+            return node
+
+        target = self._get_target(ref)
+        if isinstance(target, dict) and isinstance(target.get("$ref"), str):
+            # an alias shares the node of its target, the placeholder
+            # breaks cycles of aliases
+            self._nodes[ref] = {}
+            node = self._get_node(target["$ref"])
+        else:
+            node = {}
+            if isinstance(target, dict):
+                self._pending.append((node, target))
+        self._nodes[ref] = node
+        return node
+
+    def _fill_pending(self) -> None:
+        while self._pending:
+            node, target = self._pending.pop()
+            self._resolve_dict(target, node)
+
+        # merged items of nested allOf are needed first
+        merged = True
+        while merged:
+            merged = False
+            for schema in self._all_of:
+                merged = _merge_all_of(schema) or merged
+        self._all_of = [schema for schema in self._all_of if "allOf" in schema]
+
+    def _resolve_value(self, value: Any) -> Any:
+        if isinstance(value, list):
+            return [self._resolve_value(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+
+        if isinstance(ref := value.get("$ref"), str):
+            return self._get_node(ref)
+
+        return self._resolve_dict(value, {})
+
+    def _resolve_dict(
+        self, value: dict[str, Any], resolved: dict[str, Any]
+    ) -> dict[str, Any]:
+        for key, item in value.items():
+            resolved[key] = self._resolve_value(item)
+        if isinstance(resolved.get("allOf"), list):
+            self._all_of.append(resolved)
+        return resolved
+
+    def _get_target(self, ref: str) -> Any:
+        if not ref.startswith("#"):
+            raise KeyError(f"Only local references are supported: '{ref}'")
+
+        target: Any = self.schema
+        for part in ref[1:].split("/")[1:]:
+            part = part.replace("~1", "/").replace("~0", "~")
+            if isinstance(target, list) and part.isdigit():
+                target = target[int(part)]
+            elif isinstance(target, dict) and part in target:
+                target = target[part]
+            else:
+                raise KeyError(f"Reference can't be resolved: '{ref}'")
+        return target
+
+
+def get_component_name(ref: str) -> str:
+    """
+    Get the name of the `components.schemas` entry the reference points to
+    """
+    name = ref.removeprefix(COMPONENTS_SCHEMAS_PREFIX)
+    return name.replace("~1", "/").replace("~0", "~")
+
+
+def _merge_all_of(schema: dict[str, Any]) -> bool:
+    """
+    Merge `allOf` object schemas into the schema in place
+
+    Returns:
+        Whether the schema was merged, it isn't while some items aren't objects
+        with properties or have unmerged `allOf` themselves
+    """
+    items = schema.get("allOf")
+    if not isinstance(items, list) or not all(
+        isinstance(item, dict) and "properties" in item and "allOf" not in item
+        for item in items
+    ):
+        return False
+
+    properties = dict(schema.get("properties", {}))
+    required = list(schema.get("required", []))
+    for item in items:
+        properties.update(item["properties"])
+        required.extend(
+            name for name in item.get("required", []) if name not in required
+        )
+
+    del schema["allOf"]
+    schema.setdefault("type", "object")
+    schema["properties"] = properties
+    if required:
+        schema["required"] = required
+    return True
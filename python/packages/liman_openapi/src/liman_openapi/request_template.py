@@ -0,0 +1,132 @@
+import re
+from collections.abc import Callable, Mapping
+from typing import Any, NamedTuple
+
+from liman_openapi.schemas import Endpoint
+
+_dumps_json: Callable[[Any], bytes] | None
+try:
+    from orjson import dumps as _dumps_json
+except ImportError:
+    _dumps_json = None
+
+_PATH_PARAM_RE = re.compile(r"\{([^{}]+)\}")
+
+
+class RequestParams(NamedTuple):
+    url: str
+    query_params: dict[str, Any]
+    headers: dict[str, Any]
+    json_data: Any | None
+
+
+class RequestTemplate:
+    """
+    Request of an OpenAPI operation compiled once.
+
+    The path is pre-split into literal parts and parameter slots, parameters
+    are partitioned by location and static headers are precomputed, so building
+    a request only fills the slots with the call arguments.
+    """
+
+    def __init__(self, endpoint: Endpoint, base_url: str | None = None) -> None:
+        self.url_prefix = base_url.rstrip("/") if base_url else ""
+
+        # parts of the path, odd indexes are parameter slots with the placeholder
+        self.path_parts = _PATH_PARAM_RE.split(endpoint.path)
+        path_slots: dict[str, list[int]] = {}
+        for index in range(1, len(self.path_parts), 2):
+            name = self.path_parts[index]
+            path_slots.setdefault(name, []).append(index)
+            self.path_parts[index] = f"{{{name}}}"
+
+        path_params: list[tuple[str, tuple[int, ...]]] = []
+        query_params: list[str] = []
+        header_params: list[str] = []
+        required: list[str] = []
+        for param in endpoint.parameters:
+            if param.required:
+                required.append(param.name)
+            if param.in_ == "path":
+                path_params.append((param.name, tuple(path_slots.get(param.name, ()))))
+            elif param.in_ == "query":
+                query_params.append(param.name)
+            elif param.in_ == "header":
+                header_params.append(param.name)
+
+        self.path_params = tuple(path_params)
+        self.query_params = tuple(query_params)
+        self.header_params = tuple(header_params)
+        self.required_params = tuple(required)
+
+        request_body = endpoint.request_body
+        self.body_name = request_body.name if request_body else None
+        self.body_required = bool(request_body and request_body.required)
+        self.body_headers: Mapping[str, str] = (
+            {"Content-Type": "application/json"}
+            if request_body and "application/json" in request_body.content
+            else {}
+        )
+
+    def build(self, kwargs: Mapping[str, Any]) -> RequestParams:
+        """
+        Build the request of the operation call
+
+        Args:
+            kwargs: Arguments of the operation call
+
+        Returns:
+            RequestParams with the URL, query params, headers and JSON body
+        """
+        for name in self.required_params:
+            if kwargs.get(name) is None:
+                raise ValueError(f"Required parameter is missing: '{name}'")
+
+        path_parts = self.path_parts
+        if self.path_params:
+            path_parts = path_parts.copy()
+            for name, slots in self.path_params:
+                value = kwargs.get(name)
+                if value is not None:
+                    for index in slots:
+                        path_parts[index] = str(value)
+
+        query_params = {
+            name: value
+            for name in self.query_params
+            if (value := kwargs.get(name)) is not None
+        }
+        headers: dict[str, Any] = {
+            name: str(value)
+            for name in self.header_params
+            if (value := kwargs.get(name)) is not None
+        }
+
+        json_data = None
+        if self.body_name is not None:
+            json_data = kwargs.get(self.body_name)
+            if json_data is None and self.body_required:
+                raise ValueError(
+                    f"Required request body is missing: '{self.body_name}'"
+                )
+            if json_data:
+                headers.update(self.body_headers)
+
+        return RequestParams(
+            f"{self.url_prefix}{''.join(path_parts)}", query_params, headers, json_data
+        )
+
+
+def encode_json(data: Any) -> bytes | None:
+    """
+    Encode the request body with orjson if it's installed
+
+    Returns:
+        Encoded body or None if it should be encoded by httpx
+    """
+    if _dumps_json is None:
+        return None
+    try:
+        return _dumps_json(data)
+    except TypeError:
+        return None
@@ -0,0 +1,187 @@
+import random
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Literal
+from urllib.parse import urlparse
+
+import httpx
+from pydantic import BaseModel, Field
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised without sending a request while the circuit of the host is open
+    """
+
+
+class RetryPolicy(BaseModel):
+    """
+    Retry policy of OpenAPI operations.
+
+    Only idempotent methods are retried, on transport errors and `retry_statuses`.
+    The delay is a full-jittered exponential backoff unless the response
+    has a `Retry-After` header.
+    """
+
+    max_attempts: int = Field(default=3, ge=1)
+    # seconds, the delay before the retry N is random in [0, backoff_base * 2 ** N)
+    backoff_base: float = Field(default=0.5, ge=0)
+    backoff_max: float = Field(default=10.0, ge=0)
+    # seconds, a longer Retry-After is capped to it
+    max_retry_after: float = Field(default=30.0, ge=0)
+    retry_statuses: frozenset[int] = frozenset({429, 502, 503, 504})
+    methods: frozenset[str] = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+    def is_retryable_method(self, method: str) -> bool:
+        return method.upper() in self.methods
+
+    def get_delay(self, attempt: int, response: httpx.Response | None = None) -> float:
+        """
+        Get the delay before the next attempt
+
+        Args:
+            attempt: Number of the failed attempt, starting from 1
+            response: Response of the failed attempt if any
+
+        Returns:
+            Delay in seconds
+        """
+        if response is not None:
+            retry_after = _parse_retry_after(response.headers.get("retry-after"))
+            if retry_after is not None:
+                return min(retry_after, self.max_retry_after)
+
+        backoff = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, backoff)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of a single host.
+
+    The circuit opens after `failure_threshold` consecutive failures and rejects
+    requests for `recovery_timeout` seconds. Then a single probe request is let
+    through, its success closes the circuit and its failure opens it again.
+    A probe without an outcome, e.g. cancelled, is released, and a probe
+    lasting longer than `recovery_timeout` is replaced by a new one, so the
+    circuit never stays half open.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        *,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.clock = clock
+
+        self.state: CircuitState = "closed"
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+
+        # time after which a probe request is let through
+        self._probe_after = 0.0
+
+    def allow(self) -> bool:
+        """
+        Check whether a request can be sent to the host
+        """
+        if self.state == "closed":
+            return True
+
+        if self.clock() >= self._probe_after:
+            self.state = "half_open"
+            self._probe_after = self.clock() + self.recovery_timeout
+            return True
+
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+
+    def release(self) -> None:
+        """
+        Release the probe which ended without an outcome,
+        the next request is let through as a new probe
+        """
+        if self.state == "half_open":
+            self.state = "open"
+            self._probe_after = self.clock()
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        self.state = "open"
+        self.opened += 1
+        self._probe_after = self.clock() + self.recovery_timeout
+
+
+class CircuitBreakers:
+    """
+    Circuit breakers of the hosts, shared by the operations of an OpenAPI spec
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.clock = clock
+
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def __getitem__(self, host: str) -> CircuitBreaker:
+        return self._breakers[host]
+
+    def get(self, url: str) -> CircuitBreaker:
+        """
+        Get or create the circuit breaker of the URL host
+        """
+        host = urlparse(url).netloc
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                host,
+                failure_threshold=self.failure_threshold,
+                recovery_timeout=self.recovery_timeout,
+                clock=self.clock,
+            )
+            self._breakers[host] = breaker
+        return breaker
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        ...
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
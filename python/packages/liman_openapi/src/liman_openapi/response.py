@@ -0,0 +1,137 @@
+from contextlib import ExitStack
+from tempfile import SpooledTemporaryFile
+from typing import IO
+
+import httpx
+from pydantic import BaseModel, Field
+
+# content is decoded while it's read, its transfer headers don't apply anymore
+_SKIPPED_HEADERS = frozenset(
+    {"content-encoding", "content-length", "transfer-encoding"}
+)
+
+
+class ResponseTooLargeError(RuntimeError):
+    """
+    Raised when the response body exceeds the limit, the rest isn't read
+    """
+
+
+class ResponseLimits(BaseModel):
+    """
+    Size limits of OpenAPI operation responses.
+
+    Bodies are streamed and the read stops as soon as a limit is exceeded,
+    so an oversized response never ends up in memory. Binary responses larger
+    than `spool_bytes` are spooled to a temporary file and returned as a file
+    handle instead of bytes.
+    """
+
+    # bytes, limit of JSON and text bodies read into memory
+    max_bytes: int = Field(default=16 * 1024 * 1024, gt=0)
+    # bytes, binary bodies above it are spooled to a temporary file
+    spool_bytes: int = Field(default=1024 * 1024, gt=0)
+    # bytes, limit of spooled binary bodies
+    max_file_bytes: int = Field(default=1024 * 1024 * 1024, gt=0)
+
+
+async def aread_response(
+    response: httpx.Response, max_bytes: int, *, truncate: bool = False
+) -> httpx.Response:
+    """
+    Read the streamed response body up to the limit and close the stream
+
+    Args:
+        response: Streamed response
+        max_bytes: Limit of the decoded body
+        truncate: Drop the body above the limit instead of raising
+
+    Returns:
+        Response with the body read
+
+    Raises:
+        ResponseTooLargeError: If the body exceeds the limit
+    """
+    chunks: list[bytes] = []
+    size = 0
+    try:
+        _check_content_length(response, max_bytes, truncate=truncate)
+        async for chunk in response.aiter_bytes():
+            size += len(chunk)
+            if size > max_bytes:
+                if not truncate:
+                    raise ResponseTooLargeError(
+                        f"Response is larger than {max_bytes} bytes"
+                    )
+                chunks.append(chunk[: len(chunk) - size + max_bytes])
+                break
+            chunks.append(chunk)
+    finally:
+        await response.aclose()
+
+    return httpx.Response(
+        response.status_code,
+        headers=[
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name.lower() not in _SKIPPED_HEADERS
+        ],
+        content=b"".join(chunks),
+        request=response.request,
+    )
+
+
+async def aspool_response(
+    response: httpx.Response, limits: ResponseLimits
+) -> bytes | IO[bytes]:
+    """
+    Read the streamed binary response body and close the stream
+
+    Args:
+        response: Streamed response
+        limits: Response limits
+
+    Returns:
+        Body bytes or, above `spool_bytes`, a handle of the temporary file
+        rewound to the start, the caller is responsible for closing it
+
+    Raises:
+        ResponseTooLargeError: If the body exceeds `max_file_bytes`
+    """
+    with ExitStack() as stack:
+        file = stack.enter_context(SpooledTemporaryFile(max_size=limits.spool_bytes))
+        size = 0
+        try:
+            _check_content_length(response, limits.max_file_bytes)
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+                if size > limits.max_file_bytes:
+                    raise ResponseTooLargeError(
+                        f"Response is larger than {limits.max_file_bytes} bytes"
+                    )
+                file.write(chunk)
+        finally:
+            await response.aclose()
+
+        file.seek(0)
+        if size <= limits.spool_bytes:
+            return file.read()
+        # the file is kept open for the caller
+        stack.pop_all()
+        return file
+
+
+def _check_content_length(
+    response: httpx.Response, max_bytes: int, *, truncate: bool = False
+) -> None:
+    # compressed bodies are checked while they're decoded
+    if truncate or "content-encoding" in response.headers:
+        return
+    try:
+        content_length = int(response.headers.get("content-length", 0))
+    except ValueError:
+        return
+    if content_length > max_bytes:
+        raise ResponseTooLargeError(
+            f"Response is larger than {max_bytes} bytes: {content_length} bytes"
+        )
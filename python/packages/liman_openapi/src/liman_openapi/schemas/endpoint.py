@@ -4,6 +4,7 @@ from typing import Annotated, Any
 
 from pydantic import BaseModel, Field, model_validator
 
+from liman_openapi.refs import get_component_name
 from liman_openapi.schemas.parameter import Parameter
 from liman_openapi.schemas.ref import Ref
 from liman_openapi.schemas.request import RequestBody, RequestBodySchema
@@ -16,6 +17,7 @@ class Endpoint(BaseModel):
     summary: str
     description: str | None = None
     method: str
+    tags: list[str] = []
     parameters: list[Parameter] = []
     request_body: Annotated[
         RequestBody | None, Field(alias="requestBody", default=None)
@@ -35,24 +37,22 @@ class Endpoint(BaseModel):
     def get_tool_arguments_spec(
         self, refs: dict[str, Ref] | None = None
     ) -> list[dict[str, Any]] | None:
-        arguments = []
+        arguments = [param.get_tool_argument_spec() for param in self.parameters]
 
-        for param in self.parameters:
-            arguments.append(param.get_tool_argument_spec())
-            if self.has_json_request_body and refs:
-                ref_obj = self._get_request_body_ref_object(refs)
-                assert self.request_body is not None
-                arguments.append(
-                    {
-                        "name": ref_obj.name,
-                        "type": "object",
-                        "optional": self.request_body.required,
-                        "properties": [
-                            property_.get_tool_parameter_spec()
-                            for property_ in ref_obj.properties.values()
-                        ],
-                    }
-                )
+        if self.has_json_request_body and refs:
+            ref_obj = self._get_request_body_ref_object(refs)
+            assert self.request_body is not None
+            arguments.append(
+                {
+                    "name": ref_obj.name,
+                    "type": "object",
+                    "optional": not self.request_body.required,
+                    "properties": [
+                        property_.get_tool_parameter_spec()
+                        for property_ in ref_obj.properties.values()
+                    ],
+                }
+            )
 
         return arguments if arguments else None
 
@@ -77,5 +77,4 @@ class Endpoint(BaseModel):
         if not isinstance(schema, RequestBodySchema):
             raise ValueError("Request body schema doesnt have $ref")
 
-        ref_name = schema.ref.split("/")[-1]
-        return refs[ref_name]
+        return refs[get_component_name(schema.ref)]
@@ -22,6 +22,10 @@ class Property(BaseModel):
     def parse(cls, values: dict[str, Any]) -> dict[str, Any]:
         keys = ["anyOf", "allOf", "oneOf"]
 
+        # object schemas list their required properties
+        if not isinstance(values.get("required", False), bool):
+            values = {key: value for key, value in values.items() if key != "required"}
+
         for key in keys:
             if value := values.get(key):
                 types, is_optional = cls._compose_type(value)
@@ -39,10 +43,12 @@ class Property(BaseModel):
         types = []
         is_optional = False
         for item in items:
-            if item["type"] == "null":
+            type_ = item.get("type")
+            if type_ == "null":
                 is_optional = True
                 continue
-            types.append(item["type"])
+            if type_ is not None:
+                types.append(type_)
         return types, is_optional
 
     def get_tool_parameter_spec(self) -> dict[str, Any]:
@@ -0,0 +1,191 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, NamedTuple
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+from weakref import WeakKeyDictionary
+
+from jsonschema_path.typing import Schema
+from openapi_core import Config, OpenAPI
+from openapi_spec_validator.shortcuts import validate
+
+from liman_openapi.load import parse_content
+from liman_openapi.parse import parse_endpoints, parse_refs, parse_security_schemes
+from liman_openapi.schemas import Endpoint, Ref
+from liman_openapi.schemas.security import SecurityScheme
+from liman_openapi.utils import is_url
+
+logger = logging.getLogger(__name__)
+
+# bump to invalidate stored entries when the payload format changes
+CACHE_VERSION = 2
+
+# parsed specs of the OpenAPI objects loaded through the cache
+_parsed_specs: "WeakKeyDictionary[OpenAPI, ParsedSpec]" = WeakKeyDictionary()
+
+
+class ParsedSpec(NamedTuple):
+    """
+    Validated OpenAPI spec with its parsed components
+    """
+
+    schema: Schema
+    endpoints: list[Endpoint]
+    refs: dict[str, Ref]
+    security_schemes: list[SecurityScheme]
+
+
+def get_parsed_spec(openapi_spec: OpenAPI) -> ParsedSpec | None:
+    """
+    Get the parsed spec of the OpenAPI object loaded through OpenAPISpecCache
+    """
+    try:
+        return _parsed_specs.get(openapi_spec)
+    except TypeError:
+        return None
+
+
+class OpenAPISpecCache:
+    """
+    On-disk cache of validated OpenAPI specs.
+
+    Entries are addressed by the digest of the spec content and store the
+    validated schema with its parsed endpoints, refs and security schemes,
+    so an unchanged spec is neither validated nor parsed again. Specs
+    from URLs are revalidated with `If-None-Match` / `If-Modified-Since`.
+
+    Entries are pickled, the cache directory must be trusted.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, url_or_path: str) -> OpenAPI:
+        """
+        Load the OpenAPI spec from a URL or a file path
+
+        Args:
+            url_or_path: URL or file path of the spec
+
+        Returns:
+            OpenAPI object, its parsed spec is available with `get_parsed_spec`
+        """
+        if is_url(url_or_path):
+            parsed = self._load_url(url_or_path)
+        else:
+            parsed = self._load_content(
+                Path(url_or_path).read_bytes(), source=url_or_path
+            )
+
+        # the spec is validated already
+        openapi = OpenAPI.from_dict(
+            parsed.schema, config=Config(spec_validator_cls=None)
+        )
+        _parsed_specs[openapi] = parsed
+        return openapi
+
+    def _load_url(self, url: str) -> ParsedSpec:
+        meta_path = self.path / f"url-{_get_digest(url.encode())}.json"
+        meta = _read_json(meta_path)
+
+        headers = {}
+        if meta and meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta and meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            with urlopen(Request(url, headers=headers)) as response:
+                content = response.read()
+                etag = response.headers.get("etag")
+                last_modified = response.headers.get("last-modified")
+        except HTTPError as e:
+            if e.code != 304 or not meta:
+                raise
+            parsed = self._read_entry(meta["digest"])
+            if parsed is not None:
+                self.hits += 1
+                return parsed
+
+            # the entry is gone, fetch the spec unconditionally
+            meta_path.unlink(missing_ok=True)
+            return self._load_url(url)
+
+        digest = _get_digest(content)
+        _write_atomic(
+            meta_path,
+            json.dumps(
+                {"etag": etag, "last_modified": last_modified, "digest": digest}
+            ).encode(),
+        )
+        return self._load_content(content, source=url, digest=digest)
+
+    def _load_content(
+        self, content: bytes, *, source: str, digest: str | None = None
+    ) -> ParsedSpec:
+        digest = digest or _get_digest(content)
+        parsed = self._read_entry(digest)
+        if parsed is not None:
+            self.hits += 1
+            return parsed
+
+        self.misses += 1
+        schema = parse_content(content.decode("utf-8"), source)
+        validate(schema)
+        parsed = ParsedSpec(
+            schema=schema,
+            endpoints=parse_endpoints(schema),
+            refs=parse_refs(schema),
+            security_schemes=parse_security_schemes(schema),
+        )
+        _write_atomic(self._get_entry_path(digest), pickle.dumps(parsed))
+        return parsed
+
+    def _read_entry(self, digest: str) -> ParsedSpec | None:
+        try:
+            data = self._get_entry_path(digest).read_bytes()
+        except FileNotFoundError:
+            return None
+
+        try:
+            parsed = pickle.loads(data)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            # written by an incompatible version or corrupted
+            logger.warning(f"Failed to read cached OpenAPI spec {digest}: {e}")
+            return None
+        return parsed if isinstance(parsed, ParsedSpec) else None
+
+    def _get_entry_path(self, digest: str) -> Path:
+        return self.path / f"spec-{digest}.v{CACHE_VERSION}.pickle"
+
+
+def _get_digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def _read_json(path: Path) -> dict[str, Any] | None:
+    try:
+        data = json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
@@ -1,12 +1,28 @@
 import logging
+from collections.abc import Callable, Sequence
+from fnmatch import fnmatchcase
+from functools import cache, partial
 from typing import TypeVar
 
+from jsonschema_path.typing import Schema
 from liman_core.nodes.tool_node.node import ToolNode
 from liman_core.registry import Registry
 from openapi_core import OpenAPI
 
+from liman_openapi.coalescing import RequestCoalescer
+from liman_openapi.http_cache import HTTPCache
 from liman_openapi.operation import OpenAPIOperation
-from liman_openapi.parse import parse_endpoints, parse_refs, parse_security_schemes
+from liman_openapi.parse import (
+    parse_endpoint,
+    parse_endpoints,
+    parse_refs,
+    parse_security_schemes,
+)
+from liman_openapi.resilience import CircuitBreakers, RetryPolicy
+from liman_openapi.response import ResponseLimits
+from liman_openapi.schemas import Endpoint, Ref
+from liman_openapi.schemas.security import SecurityScheme
+from liman_openapi.spec_cache import get_parsed_spec
 
 logger = logging.getLogger(__name__)
 
@@ -16,22 +32,191 @@ def create_tool_nodes(
     registry: Registry,
     prefix: str = "OpenAPI",
     base_url: str | None = None,
+    *,
+    operation_ids: Sequence[str] | None = None,
+    tags: Sequence[str] | None = None,
+    retry_policy: RetryPolicy | None = None,
+    circuit_breakers: CircuitBreakers | None = None,
+    http_cache: HTTPCache | None = None,
+    cache_ttls: dict[str, float] | None = None,
+    coalescer: RequestCoalescer | None = None,
+    response_limits: ResponseLimits | None = None,
 ) -> list[ToolNode]:
     """
     Generate ToolNode instances based on OpenAPI endpoints.
 
     Args:
         openapi_spec (dict): The OpenAPI specification.
+        operation_ids (Sequence[str] | None): Glob patterns of the operation ids
+            to create tools for, all operations if not set.
+        tags (Sequence[str] | None): Tags of the operations to create tools for,
+            all operations if not set.
+        retry_policy (RetryPolicy | None): Retry policy of the operations,
+            the default policy is used if not set.
+        circuit_breakers (CircuitBreakers | None): Circuit breakers shared by
+            the operations, new ones with default thresholds are created if not set.
+        http_cache (HTTPCache | None): Cache of GET responses, responses
+            aren't cached if not set.
+        cache_ttls (dict[str, float] | None): Forced cache TTLs in seconds
+            by operation id, for endpoints without cache headers.
+        coalescer (RequestCoalescer | None): Collapses concurrent identical
+            GET requests into one, requests aren't coalesced if not set.
+        response_limits (ResponseLimits | None): Size limits of the responses,
+            the default limits are used if not set.
 
     Returns:
         List[ToolNode]: A list of ToolNode instances.
     """
-    nodes = []
     spec_content = openapi_spec.spec.content()
-    endpoints = parse_endpoints(spec_content)
-    refs = parse_refs(spec_content)
-    security_schemes = parse_security_schemes(spec_content)
+    if (parsed := get_parsed_spec(openapi_spec)) is not None:
+        endpoints, refs, security_schemes = (
+            parsed.endpoints,
+            parsed.refs,
+            parsed.security_schemes,
+        )
+    else:
+        endpoints = parse_endpoints(spec_content)
+        refs = parse_refs(spec_content)
+        security_schemes = parse_security_schemes(spec_content)
+    create_operation = _get_operation_factory(
+        spec_content,
+        base_url,
+        retry_policy,
+        circuit_breakers,
+        http_cache,
+        coalescer,
+        response_limits,
+    )
+
+    return [
+        _create_tool_node(
+            endpoint,
+            registry,
+            prefix,
+            refs,
+            security_schemes,
+            partial(
+                create_operation,
+                cache_ttl=(cache_ttls or {}).get(endpoint.operation_id),
+            ),
+        )
+        for endpoint in endpoints
+        if _is_selected(endpoint.operation_id, endpoint.tags, operation_ids, tags)
+    ]
+
+
+def register_tool_nodes(
+    openapi_spec: OpenAPI,
+    registry: Registry,
+    prefix: str = "OpenAPI",
+    base_url: str | None = None,
+    *,
+    operation_ids: Sequence[str] | None = None,
+    tags: Sequence[str] | None = None,
+    retry_policy: RetryPolicy | None = None,
+    circuit_breakers: CircuitBreakers | None = None,
+    http_cache: HTTPCache | None = None,
+    cache_ttls: dict[str, float] | None = None,
+    coalescer: RequestCoalescer | None = None,
+    response_limits: ResponseLimits | None = None,
+) -> list[str]:
+    """
+    Register ToolNodes of OpenAPI endpoints lazily. The ToolNode and its operation
+    are built on the first registry lookup, e.g. when an LLMNode using the tool
+    is compiled, so large specs are registered without validating every endpoint.
+
+    Args are the same as for `create_tool_nodes`.
+
+    Returns:
+        list[str]: Names of the registered ToolNodes.
+    """
+    spec_content = openapi_spec.spec.content()
+    parsed = get_parsed_spec(openapi_spec)
+    create_operation = _get_operation_factory(
+        spec_content,
+        base_url,
+        retry_policy,
+        circuit_breakers,
+        http_cache,
+        coalescer,
+        response_limits,
+    )
 
+    @cache
+    def get_components() -> tuple[dict[str, Ref], list[SecurityScheme]]:
+        if parsed is not None:
+            return parsed.refs, parsed.security_schemes
+        return parse_refs(spec_content), parse_security_schemes(spec_content)
+
+    @cache
+    def get_parsed_endpoints() -> dict[tuple[str, str], Endpoint]:
+        assert parsed is not None
+        return {(e.path, e.method): e for e in parsed.endpoints}
+
+    def materialize(path: str, method: str, details: Schema) -> ToolNode:
+        if parsed is not None:
+            endpoint = get_parsed_endpoints()[path, method.upper()]
+        else:
+            endpoint = parse_endpoint(path, method, details)
+        refs, security_schemes = get_components()
+        cache_ttl = (cache_ttls or {}).get(endpoint.operation_id)
+        return _create_tool_node(
+            endpoint,
+            registry,
+            prefix,
+            refs,
+            security_schemes,
+            partial(create_operation, cache_ttl=cache_ttl),
+        )
+
+    names = []
+    for path, methods in spec_content.get("paths", {}).items():
+        for method, details in methods.items():
+            operation_id = details.get("operationId")
+            operation_tags = details.get("tags") or []
+            if not _is_selected(operation_id, operation_tags, operation_ids, tags):
+                continue
+
+            name = f"{prefix}__{operation_id}"
+            registry.add_lazy(
+                "ToolNode", name, partial(materialize, path, method, details)
+            )
+            names.append(name)
+
+    return names
+
+
+def _create_tool_node(
+    endpoint: Endpoint,
+    registry: Registry,
+    prefix: str,
+    refs: dict[str, Ref],
+    security_schemes: list[SecurityScheme],
+    create_operation: Callable[..., OpenAPIOperation],
+) -> ToolNode:
+    name = f"{prefix}__{endpoint.operation_id}"
+    decl = {
+        "kind": "ToolNode",
+        "name": name,
+        "description": endpoint.description or endpoint.summary,
+        "arguments": endpoint.get_tool_arguments_spec(refs),
+    }
+
+    node = ToolNode.from_dict(decl, registry)
+    impl_func = create_operation(endpoint, refs, security_schemes)
+    node.set_func(impl_func)
+    return node
+
+
+def _get_operation_factory(
+    spec_content: Schema,
+    base_url: str | None,
+    retry_policy: RetryPolicy | None,
+    circuit_breakers: CircuitBreakers | None,
+    http_cache: HTTPCache | None,
+    coalescer: RequestCoalescer | None,
+    response_limits: ResponseLimits | None,
+) -> Callable[..., OpenAPIOperation]:
     if not base_url:
         servers = spec_content.get("servers", [])
         if servers:
@@ -44,23 +229,30 @@ def create_tool_nodes(
             "or pass a base_url argument."
         )
 
-    for endpoint in endpoints:
-        name = f"{prefix}__{endpoint.operation_id}"
-        decl = {
-            "kind": "ToolNode",
-            "name": name,
-            "description": endpoint.description or endpoint.summary,
-            "arguments": endpoint.get_tool_arguments_spec(refs),
-        }
-
-        node = ToolNode.from_dict(decl, registry)
-        impl_func = OpenAPIOperation(
-            endpoint, refs, security_schemes, base_url=base_url
-        )
-        node.set_func(impl_func)
-        nodes.append(node)
+    return partial(
+        OpenAPIOperation,
+        base_url=base_url,
+        retry_policy=retry_policy or RetryPolicy(),
+        circuit_breakers=(
+            circuit_breakers if circuit_breakers is not None else CircuitBreakers()
+        ),
+        http_cache=http_cache,
+        coalescer=coalescer,
+        response_limits=response_limits,
+    )
+
 
-    return nodes
+def _is_selected(
+    operation_id: str | None,
+    operation_tags: Sequence[str],
+    operation_ids: Sequence[str] | None,
+    tags: Sequence[str] | None,
+) -> bool:
+    if operation_ids is not None and not any(
+        fnmatchcase(operation_id or "", pattern) for pattern in operation_ids
+    ):
+        return False
+    return tags is None or any(tag in operation_tags for tag in tags)
 
 
 R = TypeVar("R")
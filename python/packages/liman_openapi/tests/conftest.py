@@ -1,7 +1,83 @@
+import json
+import threading
+from collections.abc import Generator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
 import pytest
 from jsonschema_path.typing import Schema
 
 
+class FaultServer:
+    """
+    Local HTTP server replying with the scripted responses, in order.
+    The last response is repeated when the script is exhausted.
+    """
+
+    def __init__(self) -> None:
+        self.responses: list[tuple[int, dict[str, str], Any]] = [(200, {}, {})]
+        self.requests: list[tuple[str, str, dict[str, str]]] = []
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._create_handler())
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def reply(self, *responses: tuple[int, dict[str, str], Any]) -> None:
+        self.responses = list(responses)
+
+    def start(self) -> None:
+        threading.Thread(
+            target=self._server.serve_forever, args=(0.01,), daemon=True
+        ).start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _next_response(self) -> tuple[int, dict[str, str], Any]:
+        if len(self.responses) > 1:
+            return self.responses.pop(0)
+        return self.responses[0]
+
+    def _create_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                self._reply()
+
+            def do_POST(self) -> None:
+                self.rfile.read(int(self.headers.get("content-length", 0)))
+                self._reply()
+
+            def _reply(self) -> None:
+                server.requests.append((self.command, self.path, dict(self.headers)))
+                status, headers, body = server._next_response()
+                data = json.dumps(body).encode() if body is not None else b""
+                self.send_response(status)
+                if body is not None:
+                    self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any) -> None: ...
+
+        return Handler
+
+
+@pytest.fixture
+def fault_server() -> Generator[FaultServer, None, None]:
+    server = FaultServer()
+    server.start()
+    yield server
+    server.stop()
+
+
 @pytest.fixture
 def simple_openapi_schema() -> Schema:
     return {
@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+from liman_openapi.coalescing import RequestCoalescer
+from liman_openapi.operation import OpenAPIOperation
+from liman_openapi.schemas import Endpoint
+from tests.conftest import FaultServer
+
+
+def create_operation(
+    server: FaultServer, coalescer: RequestCoalescer, method: str = "GET"
+) -> OpenAPIOperation:
+    endpoint = Endpoint.model_validate(
+        {
+            "operationId": "get_user",
+            "summary": "Get user by ID",
+            "method": method,
+            "path": "/users/{user_id}",
+            "parameters": [
+                {
+                    "name": "user_id",
+                    "in": "path",
+                    "required": True,
+                    "schema": {"type": "string"},
+                },
+                {
+                    "name": "api_key",
+                    "in": "header",
+                    "required": False,
+                    "schema": {"type": "string"},
+                },
+            ],
+            "responses": {"200": {"description": "User found"}},
+        }
+    )
+    return OpenAPIOperation(endpoint, base_url=server.url, coalescer=coalescer)
+
+
+def json_response(data: object) -> tuple[int, dict[str, str], object]:
+    return 200, {}, data
+
+
+async def test_concurrent_identical_requests_are_collapsed(
+    fault_server: FaultServer,
+) -> None:
+    fault_server.reply(json_response({"id": "1"}))
+    coalescer = RequestCoalescer()
+    operation = create_operation(fault_server, coalescer)
+
+    results = await asyncio.gather(*(operation(user_id="1") for _ in range(5)))
+
+    assert results == [{"id": "1"}] * 5
+    assert results[0] is results[4]
+    assert len(fault_server.requests) == 1
+    assert (coalescer.requests, coalescer.collapsed) == (1, 4)
+
+
+async def test_different_auth_identities_are_not_collapsed(
+    fault_server: FaultServer,
+) -> None:
+    fault_server.reply(json_response({"id": "1"}), json_response({"id": "1"}))
+    coalescer = RequestCoalescer()
+    operation = create_operation(fault_server, coalescer)
+
+    await asyncio.gather(
+        operation(user_id="1", api_key="alice"),
+        operation(user_id="1", api_key="bob"),
+    )
+
+    assert len(fault_server.requests) == 2
+    assert coalescer.collapsed == 0
+
+
+async def test_sequential_requests_are_sent(fault_server: FaultServer) -> None:
+    fault_server.reply(json_response({"id": "1"}), json_response({"id": "1"}))
+    coalescer = RequestCoalescer()
+    operation = create_operation(fault_server, coalescer)
+
+    await operation(user_id="1")
+    await operation(user_id="1")
+
+    assert len(fault_server.requests) == 2
+    assert coalescer.collapsed == 0
+
+
+async def test_non_get_requests_are_not_collapsed(fault_server: FaultServer) -> None:
+    fault_server.reply(json_response({"id": "1"}), json_response({"id": "1"}))
+    coalescer = RequestCoalescer()
+    operation = create_operation(fault_server, coalescer, method="POST")
+
+    await asyncio.gather(operation(user_id="1"), operation(user_id="1"))
+
+    assert len(fault_server.requests) == 2
+    assert coalescer.requests == 0
+
+
+async def test_failure_is_shared() -> None:
+    coalescer = RequestCoalescer()
+    calls = 0
+
+    async def call() -> object:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        raise RuntimeError("HTTP error occurred: 503")
+
+    results = await asyncio.gather(
+        coalescer.arun("key", call), coalescer.arun("key", call), return_exceptions=True
+    )
+
+    assert calls == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+async def test_cancelled_caller_does_not_cancel_request() -> None:
+    coalescer = RequestCoalescer()
+    release = asyncio.Event()
+
+    async def call() -> object:
+        await release.wait()
+        return "result"
+
+    first = asyncio.create_task(coalescer.arun("key", call))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(coalescer.arun("key", call))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert await second == ("result", True)
+    assert coalescer._in_flight == {}
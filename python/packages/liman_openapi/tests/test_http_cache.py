@@ -0,0 +1,204 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import httpx
+import pytest
+
+from liman_openapi.http_cache import (
+    HTTPCache,
+    HTTPCacheEntry,
+    InMemoryHTTPCache,
+    SQLiteHTTPCache,
+    get_max_age,
+)
+from liman_openapi.operation import OpenAPIOperation
+from liman_openapi.schemas import Endpoint
+from tests.conftest import FaultServer
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def create_operation(
+    server: FaultServer,
+    cache: HTTPCache,
+    method: str = "GET",
+    cache_ttl: float | None = None,
+) -> OpenAPIOperation:
+    endpoint = Endpoint.model_validate(
+        {
+            "operationId": "get_user",
+            "summary": "Get user by ID",
+            "method": method,
+            "path": "/users/{user_id}",
+            "parameters": [
+                {
+                    "name": "user_id",
+                    "in": "path",
+                    "required": True,
+                    "schema": {"type": "string"},
+                }
+            ],
+            "responses": {"200": {"description": "User found"}},
+        }
+    )
+    return OpenAPIOperation(
+        endpoint, base_url=server.url, http_cache=cache, cache_ttl=cache_ttl
+    )
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        ({"Cache-Control": "max-age=60"}, 60.0),
+        ({"Cache-Control": "public, max-age=60", "Age": "15"}, 45.0),
+        ({"Cache-Control": "no-cache, max-age=60"}, 0.0),
+        ({"Cache-Control": "no-store"}, None),
+        (
+            {
+                "Date": "Wed, 21 Oct 2015 07:28:00 GMT",
+                "Expires": "Wed, 21 Oct 2015 07:30:00 GMT",
+            },
+            120.0,
+        ),
+        ({}, 0.0),
+    ],
+)
+def test_get_max_age(headers: dict[str, str], expected: float | None) -> None:
+    assert get_max_age(headers, 0.0) == expected
+
+
+async def test_fresh_response_is_served_from_cache(
+    fault_server: FaultServer,
+) -> None:
+    clock = Clock()
+    cache = InMemoryHTTPCache(clock=clock)
+    fault_server.reply((200, {"Cache-Control": "max-age=60"}, {"id": "1"}))
+    operation = create_operation(fault_server, cache)
+
+    assert await operation(user_id="1") == {"id": "1"}
+    assert await operation(user_id="1") == {"id": "1"}
+    await operation(user_id="2")
+
+    assert len(fault_server.requests) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    clock.now += 61
+    await operation(user_id="1")
+
+    assert len(fault_server.requests) == 3
+
+
+async def test_stale_response_is_revalidated(fault_server: FaultServer) -> None:
+    clock = Clock()
+    cache = InMemoryHTTPCache(clock=clock)
+    fault_server.reply(
+        (200, {"Cache-Control": "no-cache", "ETag": '"v1"'}, {"id": "1"}),
+        (304, {"ETag": '"v1"', "Cache-Control": "max-age=30"}, None),
+    )
+    operation = create_operation(fault_server, cache)
+
+    assert await operation(user_id="1") == {"id": "1"}
+    assert await operation(user_id="1") == {"id": "1"}
+    assert await operation(user_id="1") == {"id": "1"}
+
+    assert len(fault_server.requests) == 2
+    assert fault_server.requests[1][2]["If-None-Match"] == '"v1"'
+    assert (cache.hits, cache.revalidated, cache.misses) == (1, 1, 1)
+
+
+async def test_last_modified_is_revalidated(fault_server: FaultServer) -> None:
+    last_modified = "Wed, 21 Oct 2015 07:28:00 GMT"
+    cache = InMemoryHTTPCache()
+    fault_server.reply(
+        (200, {"Last-Modified": last_modified}, {"id": "1"}),
+        (200, {}, {"id": "2"}),
+    )
+    operation = create_operation(fault_server, cache)
+
+    await operation(user_id="1")
+    assert await operation(user_id="1") == {"id": "2"}
+
+    assert fault_server.requests[1][2]["If-Modified-Since"] == last_modified
+
+
+async def test_uncacheable_responses_are_not_stored(
+    fault_server: FaultServer,
+) -> None:
+    cache = InMemoryHTTPCache()
+    fault_server.reply(
+        (200, {"Cache-Control": "no-store"}, {"id": "1"}), (200, {}, {"id": "1"})
+    )
+    operation = create_operation(fault_server, cache)
+
+    await operation(user_id="1")
+    await operation(user_id="2")
+
+    assert len(cache) == 0
+
+
+async def test_cache_ttl_overrides_response_headers(
+    fault_server: FaultServer,
+) -> None:
+    cache = InMemoryHTTPCache()
+    fault_server.reply((200, {}, {"id": "1"}))
+    operation = create_operation(fault_server, cache, cache_ttl=60)
+
+    await operation(user_id="1")
+    await operation(user_id="1")
+
+    assert len(fault_server.requests) == 1
+
+
+async def test_non_get_requests_are_not_cached(fault_server: FaultServer) -> None:
+    cache = InMemoryHTTPCache()
+    fault_server.reply((200, {"Cache-Control": "max-age=60"}, {"id": "1"}))
+    operation = create_operation(fault_server, cache, method="POST")
+
+    await operation(user_id="1")
+    await operation(user_id="1")
+
+    assert len(fault_server.requests) == 2
+    assert len(cache) == 0
+
+
+def _entry(size: int) -> HTTPCacheEntry:
+    return HTTPCacheEntry(0.0, 60.0, 200, {}, b"x" * size)
+
+
+async def test_in_memory_cache_is_bounded_in_bytes() -> None:
+    cache = InMemoryHTTPCache(max_bytes=250)
+
+    for key in ("a", "b", "c"):
+        await cache._awrite(key, _entry(100))
+    await cache._awrite("huge", _entry(300))
+
+    assert list(cache._entries) == ["b", "c"]
+    assert cache.size == 200
+
+
+async def test_sqlite_cache_persists_and_is_bounded_in_bytes() -> None:
+    clock = Clock()
+    with TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "http_cache.sqlite"
+        cache = SQLiteHTTPCache(path, max_bytes=250, clock=clock)
+        response = httpx.Response(
+            200, headers={"Cache-Control": "max-age=60"}, json={"id": "1"}
+        )
+        entry = await cache.astore("a", response)
+        assert entry is not None
+        for key in ("b", "c"):
+            clock.now += 1
+            await cache._awrite(key, _entry(100))
+
+        assert await SQLiteHTTPCache(path).aget("a") is None
+        assert len(cache) == 2
+
+        clock.now += 1
+        await cache._awrite("a", entry)
+        assert await SQLiteHTTPCache(path).aget("a") == entry
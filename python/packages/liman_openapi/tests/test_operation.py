@@ -287,18 +287,20 @@ async def test_request_success(
     mock_client = AsyncMock()
     mock_client_class.return_value.__aenter__.return_value = mock_client
 
-    mock_response = Mock(spec=httpx.Response)
-    mock_response.headers = {"content-type": "application/json"}
-    mock_response.json.return_value = {"id": "123"}
-    mock_client.request.return_value = mock_response
+    request = httpx.Request("GET", "https://api.example.com/users/123")
+    mock_client.build_request = Mock(return_value=request)
+    mock_client.send.return_value = httpx.Response(
+        200, json={"id": "123"}, request=request
+    )
 
     operation = OpenAPIOperation(simple_endpoint, base_url="https://api.example.com")
     result = await operation._request(user_id="123")
 
     assert result == {"id": "123"}
-    mock_client.request.assert_called_once_with(
+    mock_client.build_request.assert_called_once_with(
         "GET", "https://api.example.com/users/123", params=None, headers={}, json=None
     )
+    mock_client.send.assert_called_once_with(request, stream=True)
 
 
 @patch("liman_openapi.operation.httpx.AsyncClient")
@@ -316,7 +318,8 @@ async def test_request_http_error(
     http_error = httpx.HTTPStatusError(
         "Not found", request=Mock(), response=mock_response
     )
-    mock_client.request.side_effect = http_error
+    mock_client.build_request = Mock()
+    mock_client.send.side_effect = http_error
 
     operation = OpenAPIOperation(simple_endpoint)
 
@@ -343,7 +346,7 @@ async def test_request_error(
     mock_client_class.return_value.__aenter__.return_value = mock_client
 
     request_error = httpx.RequestError("Connection failed")
-    mock_client.request.side_effect = request_error
+    mock_client.send.side_effect = request_error
 
     operation = OpenAPIOperation(simple_endpoint)
 
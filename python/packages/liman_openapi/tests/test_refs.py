@@ -0,0 +1,152 @@
+import pytest
+from jsonschema_path.typing import Schema
+
+from liman_openapi.parse import parse_endpoints, parse_refs
+from liman_openapi.refs import RefResolver
+
+
+def ref(name: str) -> Schema:
+    return {"$ref": f"#/components/schemas/{name}"}
+
+
+@pytest.fixture
+def spec() -> Schema:
+    return {
+        "openapi": "3.0.0",
+        "paths": {
+            "/users": {
+                "post": {
+                    "operationId": "create_user",
+                    "summary": "Create user",
+                    "parameters": [
+                        {"name": "org", "in": "query", "schema": {"type": "string"}},
+                        {
+                            "name": "dry_run",
+                            "in": "query",
+                            "schema": {"type": "boolean"},
+                        },
+                    ],
+                    "requestBody": {
+                        "required": True,
+                        "content": {"application/json": {"schema": ref("UserCreate")}},
+                    },
+                    "responses": {"201": {"description": "Created"}},
+                }
+            },
+            "/teams": {
+                "post": {
+                    "operationId": "create_team",
+                    "summary": "Create team",
+                    "requestBody": {
+                        "content": {"application/json": {"schema": ref("Team")}},
+                    },
+                    "responses": {"201": {"description": "Created"}},
+                }
+            },
+        },
+        "components": {
+            "schemas": {
+                "UserCreate": ref("User"),
+                "User": {
+                    "type": "object",
+                    "required": ["name"],
+                    "properties": {
+                        "name": {"type": "string"},
+                        "address": ref("Address"),
+                        "manager": ref("User"),
+                    },
+                },
+                "Address": {
+                    "type": "object",
+                    "properties": {"city": {"type": "string"}},
+                },
+                "Team": {
+                    "allOf": [
+                        {"type": "object", "properties": {"id": {"type": "integer"}}},
+                        {
+                            "type": "object",
+                            "required": ["members"],
+                            "properties": {
+                                "members": {"type": "array", "items": ref("User")}
+                            },
+                        },
+                    ]
+                },
+            }
+        },
+    }
+
+
+def test_resolve_nested_ref(spec: Schema) -> None:
+    user = RefResolver(spec).resolve("#/components/schemas/User")
+
+    assert user["properties"]["address"] == {
+        "type": "object",
+        "properties": {"city": {"type": "string"}},
+    }
+
+
+def test_resolve_chained_ref(spec: Schema) -> None:
+    resolver = RefResolver(spec)
+
+    assert resolver.resolve("#/components/schemas/UserCreate") is resolver.resolve(
+        "#/components/schemas/User"
+    )
+
+
+def test_resolve_recursive_ref(spec: Schema) -> None:
+    user = RefResolver(spec).resolve("#/components/schemas/User")
+
+    assert user["properties"]["manager"] is user
+
+
+def test_resolve_all_of(spec: Schema) -> None:
+    team = RefResolver(spec).resolve("#/components/schemas/Team")
+
+    assert team["type"] == "object"
+    assert list(team["properties"]) == ["id", "members"]
+    assert team["required"] == ["members"]
+    assert team["properties"]["members"]["items"]["properties"]["name"] == {
+        "type": "string"
+    }
+
+
+def test_resolve_deep_ref_chain() -> None:
+    schemas = {
+        f"Item{i}": {"type": "object", "properties": {"next": ref(f"Item{i + 1}")}}
+        for i in range(5000)
+    }
+    schemas["Item5000"] = {"type": "string"}
+
+    item = RefResolver({"components": {"schemas": schemas}}).resolve(
+        "#/components/schemas/Item0"
+    )
+
+    for _ in range(5000):
+        item = item["properties"]["next"]
+    assert item == {"type": "string"}
+
+
+def test_resolve_missing_ref(spec: Schema) -> None:
+    with pytest.raises(KeyError, match="Missing"):
+        RefResolver(spec).resolve("#/components/schemas/Missing")
+
+
+def test_request_body_argument_is_added_once(spec: Schema) -> None:
+    refs = parse_refs(spec)
+    endpoints = {e.operation_id: e for e in parse_endpoints(spec)}
+
+    create_user = endpoints["create_user"].get_tool_arguments_spec(refs)
+    create_team = endpoints["create_team"].get_tool_arguments_spec(refs)
+
+    assert create_user is not None
+    assert [arg["name"] for arg in create_user] == ["org", "dry_run", "UserCreate"]
+    assert create_user[2]["optional"] is False
+    assert create_user[2]["properties"] == [
+        {"type": "string", "name": "name"},
+        {"type": "object", "name": "address"},
+        {"type": "object", "name": "manager"},
+    ]
+    assert create_team is not None
+    assert [arg["name"] for arg in create_team] == ["Team"]
+    assert create_team[0]["optional"] is True
@@ -0,0 +1,88 @@
+import json
+from typing import Any
+
+import pytest
+
+from liman_openapi.operation import OpenAPIOperation
+from liman_openapi.request_template import RequestTemplate, encode_json
+from liman_openapi.schemas import Endpoint
+from tests.conftest import FaultServer
+
+
+def create_endpoint(
+    path: str, parameters: list[dict[str, Any]], body: bool = False
+) -> Endpoint:
+    data: dict[str, Any] = {
+        "operationId": "operation",
+        "summary": "Operation",
+        "method": "POST" if body else "GET",
+        "path": path,
+        "parameters": [{"schema": {"type": "string"}, **p} for p in parameters],
+        "responses": {"200": {"description": "OK"}},
+    }
+    if body:
+        data["requestBody"] = {
+            "required": False,
+            "content": {"application/json": {"schema": {"type": "object"}}},
+        }
+    return Endpoint.model_validate(data)
+
+
+def test_build_fills_repeated_and_missing_path_slots() -> None:
+    endpoint = create_endpoint(
+        "/orgs/{org}/users/{user}/orgs/{org}",
+        [
+            {"name": "org", "in": "path", "required": True},
+            {"name": "user", "in": "path"},
+        ],
+    )
+    template = RequestTemplate(endpoint, "https://api.example.com/")
+
+    assert template.build({"org": "acme", "user": 1}).url == (
+        "https://api.example.com/orgs/acme/users/1/orgs/acme"
+    )
+    assert template.build({"org": "acme"}).url == (
+        "https://api.example.com/orgs/acme/users/{user}/orgs/acme"
+    )
+
+
+def test_build_partitions_params_by_location() -> None:
+    endpoint = create_endpoint(
+        "/search",
+        [
+            {"name": "q", "in": "query", "required": True},
+            {"name": "limit", "in": "query"},
+            {"name": "X-Trace", "in": "header"},
+            {"name": "session", "in": "cookie"},
+        ],
+        body=True,
+    )
+    template = RequestTemplate(endpoint)
+
+    url, query_params, headers, json_data = template.build(
+        {"q": "cats", "X-Trace": 42, "session": "s", "__request_body__": {"a": 1}}
+    )
+
+    assert url == "/search"
+    assert query_params == {"q": "cats"}
+    assert headers == {"X-Trace": "42", "Content-Type": "application/json"}
+    assert json_data == {"a": 1}
+
+    with pytest.raises(ValueError, match="Required parameter is missing: 'q'"):
+        template.build({})
+
+
+def test_encode_json_falls_back_for_unsupported_data() -> None:
+    assert json.loads(encode_json({"a": [1, "b"]}) or b"") == {"a": [1, "b"]}
+    assert encode_json({1: "non-str key"}) is None
+
+
+async def test_request_sends_encoded_body(fault_server: FaultServer) -> None:
+    endpoint = create_endpoint("/items", [], body=True)
+    operation = OpenAPIOperation(endpoint, base_url=fault_server.url)
+
+    await operation(__request_body__={"name": "item"})
+
+    method, path, headers = fault_server.requests[0]
+    assert (method, path) == ("POST", "/items")
+    assert headers["Content-Type"] == "application/json"
@@ -0,0 +1,228 @@
+import asyncio
+
+import httpx
+import pytest
+
+from liman_openapi.operation import OpenAPIOperation
+from liman_openapi.resilience import (
+    CircuitBreaker,
+    CircuitBreakers,
+    CircuitOpenError,
+    RetryPolicy,
+)
+from liman_openapi.schemas import Endpoint
+from tests.conftest import FaultServer
+
+FAST_RETRY = RetryPolicy(max_attempts=3, backoff_base=0.001)
+
+
+def create_endpoint(method: str = "GET") -> Endpoint:
+    return Endpoint.model_validate(
+        {
+            "operationId": "get_user",
+            "summary": "Get user by ID",
+            "method": method,
+            "path": "/users/{user_id}",
+            "parameters": [
+                {
+                    "name": "user_id",
+                    "in": "path",
+                    "required": True,
+                    "schema": {"type": "string"},
+                }
+            ],
+            "responses": {"200": {"description": "User found"}},
+        }
+    )
+
+
+def create_operation(
+    server: FaultServer,
+    method: str = "GET",
+    retry_policy: RetryPolicy | None = FAST_RETRY,
+    circuit_breakers: CircuitBreakers | None = None,
+) -> OpenAPIOperation:
+    return OpenAPIOperation(
+        create_endpoint(method),
+        base_url=server.url,
+        retry_policy=retry_policy,
+        circuit_breakers=circuit_breakers,
+    )
+
+
+async def test_retries_transient_errors(fault_server: FaultServer) -> None:
+    fault_server.reply((503, {}, {}), (502, {}, {}), (200, {}, {"id": "1"}))
+    operation = create_operation(fault_server)
+
+    result = await operation(user_id="1")
+
+    assert result == {"id": "1"}
+    assert len(fault_server.requests) == 3
+
+
+async def test_gives_up_after_max_attempts(fault_server: FaultServer) -> None:
+    fault_server.reply((503, {}, {"error": "down"}))
+    operation = create_operation(fault_server)
+
+    with pytest.raises(RuntimeError, match="HTTP error occurred: 503"):
+        await operation(user_id="1")
+
+    assert len(fault_server.requests) == 3
+
+
+async def test_does_not_retry_client_errors(fault_server: FaultServer) -> None:
+    fault_server.reply((404, {}, {"error": "not found"}))
+    operation = create_operation(fault_server)
+
+    with pytest.raises(RuntimeError, match="HTTP error occurred: 404"):
+        await operation(user_id="1")
+
+    assert len(fault_server.requests) == 1
+
+
+async def test_does_not_retry_non_idempotent_methods(
+    fault_server: FaultServer,
+) -> None:
+    fault_server.reply((503, {}, {}), (200, {}, {"id": "1"}))
+    operation = create_operation(fault_server, method="POST")
+
+    with pytest.raises(RuntimeError, match="HTTP error occurred: 503"):
+        await operation(user_id="1")
+
+    assert len(fault_server.requests) == 1
+
+
+async def test_retries_connection_errors() -> None:
+    operation = OpenAPIOperation(
+        create_endpoint(), base_url="http://127.0.0.1:1", retry_policy=FAST_RETRY
+    )
+    breakers = CircuitBreakers()
+    operation.circuit_breakers = breakers
+
+    with pytest.raises(RuntimeError, match="Request error occurred"):
+        await operation(user_id="1")
+
+    assert breakers["127.0.0.1:1"].failures == 3
+
+
+def test_get_delay_uses_jittered_backoff() -> None:
+    policy = RetryPolicy(backoff_base=1.0, backoff_max=3.0)
+
+    assert 0 <= policy.get_delay(1) <= 1.0
+    assert 0 <= policy.get_delay(2) <= 2.0
+    assert 0 <= policy.get_delay(5) <= 3.0
+
+
+@pytest.mark.parametrize(
+    ("retry_after", "expected"),
+    [("2", 2.0), ("120", 30.0), ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0)],
+)
+def test_get_delay_honors_retry_after(retry_after: str, expected: float) -> None:
+    response = httpx.Response(503, headers={"Retry-After": retry_after})
+
+    assert RetryPolicy().get_delay(1, response) == expected
+
+
+def get_state(breaker: CircuitBreaker) -> str:
+    # re-read, the state changes behind the narrowed literal
+    return breaker.state
+
+
+def test_circuit_breaker_opens_and_recovers() -> None:
+    now = 0.0
+    breaker = CircuitBreaker(
+        "api.example.com", failure_threshold=2, recovery_timeout=10, clock=lambda: now
+    )
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert get_state(breaker) == "open"
+    assert not breaker.allow()
+    assert breaker.rejected == 1
+
+    now = 10.0
+    assert breaker.allow()
+    assert get_state(breaker) == "half_open"
+    assert not breaker.allow()
+
+    breaker.record_failure()
+    assert get_state(breaker) == "open"
+    assert breaker.opened == 2
+
+    now = 20.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert get_state(breaker) == "closed"
+    assert breaker.failures == 0
+
+
+def test_circuit_breaker_replaces_stale_probe() -> None:
+    now = 0.0
+    breaker = CircuitBreaker(
+        "api.example.com", failure_threshold=1, recovery_timeout=10, clock=lambda: now
+    )
+    breaker.record_failure()
+
+    now = 10.0
+    assert breaker.allow()
+    now = 15.0
+    assert not breaker.allow()
+    # the probe never reported its outcome
+    now = 20.0
+    assert breaker.allow()
+    assert get_state(breaker) == "half_open"
+
+
+async def test_cancelled_probe_releases_circuit() -> None:
+    now = 0.0
+    breakers = CircuitBreakers(
+        failure_threshold=1, recovery_timeout=10, clock=lambda: now
+    )
+    operation = OpenAPIOperation(
+        create_endpoint(),
+        base_url="http://api.example.com",
+        circuit_breakers=breakers,
+    )
+    breaker = breakers.get("http://api.example.com")
+    breaker.record_failure()
+    sent = asyncio.Event()
+
+    async def _handle(request: httpx.Request) -> httpx.Response:
+        sent.set()
+        await asyncio.sleep(10)
+        return httpx.Response(200, json={})
+
+    now = 10.0
+    async with httpx.AsyncClient(transport=httpx.MockTransport(_handle)) as client:
+        probe = asyncio.create_task(
+            operation._send(client, "GET", "http://api.example.com/users/1")
+        )
+        await sent.wait()
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+    assert get_state(breaker) == "open"
+    assert breaker.allow()
+    assert get_state(breaker) == "half_open"
+
+
+async def test_open_circuit_fails_fast(fault_server: FaultServer) -> None:
+    fault_server.reply((500, {}, {}))
+    breakers = CircuitBreakers(failure_threshold=2)
+    operation = create_operation(
+        fault_server, retry_policy=None, circuit_breakers=breakers
+    )
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="HTTP error occurred: 500"):
+            await operation(user_id="1")
+    with pytest.raises(CircuitOpenError):
+        await operation(user_id="1")
+
+    assert len(fault_server.requests) == 2
+    (breaker,) = breakers._breakers.values()
+    assert breaker.opened == 1
+    assert breaker.rejected == 1
@@ -0,0 +1,188 @@
+import asyncio
+import threading
+import tracemalloc
+from collections.abc import Generator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import IO, Any, cast
+
+import pytest
+
+from liman_openapi.coalescing import RequestCoalescer
+from liman_openapi.operation import OpenAPIOperation
+from liman_openapi.response import ResponseLimits, ResponseTooLargeError
+from liman_openapi.schemas import Endpoint
+
+MB = 1024 * 1024
+CHUNK = b"x" * (64 * 1024)
+
+
+class StreamServer:
+    """
+    Local HTTP server streaming a generated body of the given size
+    """
+
+    def __init__(self) -> None:
+        self.size = 0
+        self.content_type = "application/json"
+        self.content_length = True
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._create_handler())
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def start(self) -> None:
+        threading.Thread(
+            target=self._server.serve_forever, args=(0.01,), daemon=True
+        ).start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _create_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                self.send_response(200)
+                self.send_header("content-type", server.content_type)
+                if server.content_length:
+                    self.send_header("content-length", str(server.size))
+                self.end_headers()
+                try:
+                    for offset in range(0, server.size, len(CHUNK)):
+                        self.wfile.write(CHUNK[: server.size - offset])
+                except (BrokenPipeError, ConnectionResetError):
+                    ...
+
+            def log_message(self, format: str, *args: Any) -> None: ...
+
+        return Handler
+
+
+@pytest.fixture
+def stream_server() -> Generator[StreamServer, None, None]:
+    server = StreamServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+def create_operation(
+    server: StreamServer,
+    limits: ResponseLimits | None = None,
+    coalescer: RequestCoalescer | None = None,
+) -> OpenAPIOperation:
+    endpoint = Endpoint.model_validate(
+        {
+            "operationId": "download",
+            "summary": "Download file",
+            "method": "GET",
+            "path": "/download",
+            "responses": {"200": {"description": "Download"}},
+        }
+    )
+    return OpenAPIOperation(
+        endpoint, base_url=server.url, response_limits=limits, coalescer=coalescer
+    )
+
+
+@pytest.mark.parametrize("content_length", [True, False])
+async def test_large_json_response_is_rejected(
+    stream_server: StreamServer, content_length: bool
+) -> None:
+    stream_server.size = 500 * MB
+    stream_server.content_length = content_length
+    operation = create_operation(stream_server, ResponseLimits(max_bytes=MB))
+
+    tracemalloc.start()
+    try:
+        with pytest.raises(ResponseTooLargeError):
+            await operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < 16 * MB
+
+
+async def test_large_binary_response_is_spooled_to_file(
+    stream_server: StreamServer,
+) -> None:
+    stream_server.size = 500 * MB
+    stream_server.content_type = "application/octet-stream"
+    stream_server.content_length = False
+    operation = create_operation(stream_server)
+
+    tracemalloc.start()
+    try:
+        result = await operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert not isinstance(result, bytes)
+    with cast(IO[bytes], result) as file:
+        assert file.read(4) == b"xxxx"
+        assert file.seek(0, 2) == 500 * MB
+    assert peak < 16 * MB
+
+
+async def test_small_binary_response_is_returned_as_bytes(
+    stream_server: StreamServer,
+) -> None:
+    stream_server.size = 1024
+    stream_server.content_type = "image/png"
+
+    result = await create_operation(stream_server)()
+
+    assert result == b"x" * 1024
+
+
+async def test_binary_response_above_file_limit_is_rejected(
+    stream_server: StreamServer,
+) -> None:
+    stream_server.size = 4 * MB
+    stream_server.content_type = "application/octet-stream"
+    stream_server.content_length = False
+    limits = ResponseLimits(spool_bytes=MB, max_file_bytes=2 * MB)
+
+    with pytest.raises(ResponseTooLargeError):
+        await create_operation(stream_server, limits)()
+
+
+async def test_spooled_response_is_not_shared_by_coalesced_requests(
+    stream_server: StreamServer,
+) -> None:
+    stream_server.size = 5000
+    stream_server.content_type = "application/octet-stream"
+    coalescer = RequestCoalescer()
+    operation = create_operation(
+        stream_server, ResponseLimits(spool_bytes=1000), coalescer
+    )
+
+    first, second = await asyncio.gather(operation(), operation())
+
+    assert coalescer.collapsed == 1
+    assert first is not second
+    with cast(IO[bytes], first) as file:
+        assert len(file.read()) == 5000
+    with cast(IO[bytes], second) as file:
+        assert len(file.read()) == 5000
+
+
+async def test_small_binary_response_is_shared_by_coalesced_requests(
+    stream_server: StreamServer,
+) -> None:
+    stream_server.size = 500
+    stream_server.content_type = "application/octet-stream"
+    coalescer = RequestCoalescer()
+    operation = create_operation(
+        stream_server, ResponseLimits(spool_bytes=1000), coalescer
+    )
+
+    first, second = await asyncio.gather(operation(), operation())
+
+    assert first == second == b"x" * 500
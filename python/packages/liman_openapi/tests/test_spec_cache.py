@@ -0,0 +1,90 @@
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from jsonschema_path.typing import Schema
+from liman_core.registry import Registry
+from openapi_spec_validator.shortcuts import validate
+
+from liman_openapi import OpenAPISpecCache, create_tool_nodes, load_openapi
+from liman_openapi.spec_cache import get_parsed_spec
+from tests.conftest import FaultServer
+
+
+@pytest.fixture
+def spec_file(tmp_path: Path, simple_openapi_schema: Schema) -> Path:
+    path = tmp_path / "openapi.json"
+    path.write_text(json.dumps(simple_openapi_schema))
+    return path
+
+
+def test_load_file_validates_once(tmp_path: Path, spec_file: Path) -> None:
+    cache = OpenAPISpecCache(tmp_path / "cache")
+
+    with patch("liman_openapi.spec_cache.validate", wraps=validate) as mock_validate:
+        first = load_openapi(str(spec_file), cache=cache)
+        second = OpenAPISpecCache(tmp_path / "cache").load(str(spec_file))
+
+    mock_validate.assert_called_once()
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert first.spec.contents() == second.spec.contents()
+
+    parsed = get_parsed_spec(second)
+    assert parsed is not None
+    assert [e.operation_id for e in parsed.endpoints] == ["get_user"]
+
+
+def test_changed_file_is_validated_again(tmp_path: Path, spec_file: Path) -> None:
+    cache = OpenAPISpecCache(tmp_path / "cache")
+    cache.load(str(spec_file))
+
+    spec = json.loads(spec_file.read_text())
+    spec["info"]["title"] = "Changed API"
+    spec_file.write_text(json.dumps(spec))
+    openapi = cache.load(str(spec_file))
+
+    assert openapi.spec.contents()["info"]["title"] == "Changed API"
+    assert cache.misses == 2
+
+
+def test_corrupted_entry_is_ignored(tmp_path: Path, spec_file: Path) -> None:
+    cache = OpenAPISpecCache(tmp_path / "cache")
+    cache.load(str(spec_file))
+    for entry in (tmp_path / "cache").glob("spec-*"):
+        entry.write_bytes(b"corrupted")
+
+    cache.load(str(spec_file))
+
+    assert cache.misses == 2
+
+
+def test_url_is_revalidated_with_etag(
+    tmp_path: Path, fault_server: FaultServer, simple_openapi_schema: Schema
+) -> None:
+    fault_server.reply(
+        (200, {"ETag": '"v1"'}, simple_openapi_schema), (304, {"ETag": '"v1"'}, None)
+    )
+    url = f"{fault_server.url}/openapi.json"
+
+    OpenAPISpecCache(tmp_path).load(url)
+    cache = OpenAPISpecCache(tmp_path)
+    with patch("liman_openapi.spec_cache.validate") as mock_validate:
+        openapi = cache.load(url)
+
+    mock_validate.assert_not_called()
+    assert cache.hits == 1
+    assert fault_server.requests[1][2]["If-None-Match"] == '"v1"'
+    assert openapi.spec.contents() == simple_openapi_schema
+
+
+def test_create_tool_nodes_uses_parsed_spec(tmp_path: Path, spec_file: Path) -> None:
+    openapi = OpenAPISpecCache(tmp_path).load(str(spec_file))
+
+    with patch("liman_openapi.tool_node.parse_endpoints") as mock_parse_endpoints:
+        nodes = create_tool_nodes(
+            openapi, Registry(), base_url="https://api.example.com"
+        )
+
+    mock_parse_endpoints.assert_not_called()
+    assert [node.name for node in nodes] == ["OpenAPI__get_user"]
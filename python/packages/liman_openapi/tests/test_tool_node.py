@@ -8,7 +8,7 @@ from liman_core.registry import Registry
 
 from liman_openapi.operation import OpenAPIOperation
 from liman_openapi.schemas import Endpoint
-from liman_openapi.tool_node import create_tool_nodes
+from liman_openapi.tool_node import create_tool_nodes, register_tool_nodes
 
 
 @pytest.fixture
@@ -322,3 +322,76 @@ def test_create_tool_nodes_no_parameters(registry: Registry) -> None:
             registry,
         )
         assert len(nodes) == 1
+
+
+@pytest.fixture
+def tagged_openapi_schema() -> Schema:
+    def operation(operation_id: str, tags: list[str]) -> dict[str, Any]:
+        return {
+            "operationId": operation_id,
+            "summary": operation_id,
+            "tags": tags,
+            "responses": {"200": {"description": "OK"}},
+        }
+
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Test API", "version": "1.0.0"},
+        "servers": [{"url": "https://api.example.com"}],
+        "paths": {
+            "/users": {
+                "get": operation("list_users", ["users"]),
+                "post": operation("create_user", ["users", "admin"]),
+            },
+            "/orders": {"get": operation("list_orders", ["orders"])},
+        },
+    }
+
+
+@pytest.mark.parametrize(
+    ("operation_ids", "tags", "expected"),
+    [
+        (None, None, ["list_users", "create_user", "list_orders"]),
+        (["list_*"], None, ["list_users", "list_orders"]),
+        (None, ["admin", "orders"], ["create_user", "list_orders"]),
+        (["list_*"], ["users"], ["list_users"]),
+    ],
+)
+def test_create_tool_nodes_filters_operations(
+    tagged_openapi_schema: Schema,
+    registry: Registry,
+    operation_ids: list[str] | None,
+    tags: list[str] | None,
+    expected: list[str],
+) -> None:
+    mock_openapi = Mock()
+    mock_openapi.spec.content.return_value = tagged_openapi_schema
+
+    nodes = create_tool_nodes(
+        mock_openapi, registry, operation_ids=operation_ids, tags=tags
+    )
+
+    assert [node.name for node in nodes] == [f"OpenAPI__{id_}" for id_ in expected]
+
+
+def test_register_tool_nodes_materializes_on_lookup(
+    tagged_openapi_schema: Schema, registry: Registry
+) -> None:
+    mock_openapi = Mock()
+    mock_openapi.spec.content.return_value = tagged_openapi_schema
+
+    with patch(
+        "liman_openapi.tool_node.ToolNode.from_dict", wraps=ToolNode.from_dict
+    ) as mock_from_dict:
+        names = register_tool_nodes(mock_openapi, registry, tags=["users"])
+
+        assert names == ["OpenAPI__list_users", "OpenAPI__create_user"]
+        mock_from_dict.assert_not_called()
+
+        node = registry.lookup(ToolNode, "OpenAPI__create_user")
+        assert registry.lookup(ToolNode, "OpenAPI__create_user") is node
+
+    mock_from_dict.assert_called_once()
+    assert isinstance(node.func, OpenAPIOperation)
+    assert node.func.endpoint.operation_id == "create_user"
+    assert node.func.base_url == "https://api.example.com"